@@ -1,4 +1,3 @@
-from playwright.sync_api import sync_playwright
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import os
@@ -10,39 +9,67 @@ MAIN_PAGE = f"{BASE_URL}/pest-alert"
 # ----------------------------
 # Step 1: Launch Playwright and get page content
 # ----------------------------
-with sync_playwright() as p:
-    browser = p.chromium.launch(headless=True)
-    page = browser.new_page()
-    page.goto(MAIN_PAGE)
-    page.wait_for_timeout(5000)  # wait 5 seconds to load content
+def fetch_main_page(browser=None):
+    # A long-running caller passes its own (already launched) browser
+    if browser is not None:
+        page = browser.new_page()
+        try:
+            page.goto(MAIN_PAGE)
+            page.wait_for_timeout(5000)  # wait 5 seconds to load content
+            return page.content()
+        finally:
+            page.close()
 
-    html_content = page.content()
-    browser.close()
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        html_content = fetch_main_page(browser)
+        browser.close()
+    return html_content
 
 # ----------------------------
 # Step 2: Extract all pest alert links
 # ----------------------------
-soup = BeautifulSoup(html_content, "html.parser")
-
-links = []
-for div in soup.find_all("div", class_="views-field views-field-title"):
-    span_tag = div.find("span", class_="field-content")
-    if span_tag:
-        a_tag = span_tag.find("a")
-        if a_tag and a_tag.get("href"):
-            full_url = urljoin(BASE_URL, a_tag["href"])
-            links.append(full_url)
-
-print(f"Extracted {len(links)} links from main page.")
+def extract_alert_links(html_content):
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    links = []
+    for div in soup.find_all("div", class_="views-field views-field-title"):
+        span_tag = div.find("span", class_="field-content")
+        if span_tag:
+            a_tag = span_tag.find("a")
+            if a_tag and a_tag.get("href"):
+                full_url = urljoin(BASE_URL, a_tag["href"])
+                links.append(full_url)
+    return links
 
 # ----------------------------
 # Step 3: Function to scrape header and image from each URL
 # ----------------------------
-def scrape_pest_info(urls):
-    results = []
+def parse_pest_page(html_content, url):
+    soup = BeautifulSoup(html_content, "html.parser")
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+    # Extract header
+    header_span = soup.select_one("h1.page-header span")
+    title = header_span.text.strip() if header_span else None
+
+    # Extract image src
+    img_tag = soup.select_one(
+        "div.field.field--name-field-pest-picture div.field--item img"
+    )
+    img_src = urljoin(BASE_URL, img_tag["src"]) if img_tag and img_tag.get("src") else None
+
+    return {
+        "url": url,
+        "title": title,
+        "image_src": img_src
+    }
+
+
+def scrape_pest_info(urls, browser=None):
+    if browser is not None:
+        results = []
         page = browser.new_page()
 
         for url in urls:
@@ -53,35 +80,21 @@ def scrape_pest_info(urls):
                 results.append({"url": url, "title": None, "image_src": None})
                 continue
 
-            soup = BeautifulSoup(page.content(), "html.parser")
-
-            # Extract header
-            header_span = soup.select_one("h1.page-header span")
-            title = header_span.text.strip() if header_span else None
+            results.append(parse_pest_page(page.content(), url))
 
-            # Extract image src
-            img_tag = soup.select_one(
-                "div.field.field--name-field-pest-picture div.field--item img"
-            )
-            img_src = urljoin(BASE_URL, img_tag["src"]) if img_tag and img_tag.get("src") else None
+        page.close()
+        return results
 
-            results.append({
-                "url": url,
-                "title": title,
-                "image_src": img_src
-            })
+    from playwright.sync_api import sync_playwright
 
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        results = scrape_pest_info(urls, browser)
         browser.close()
 
     return results
 
 
-
-
-
-
-data = scrape_pest_info(links)
-
 # ----------------------------
 # Step 4: Function to download images
 # ----------------------------
@@ -119,13 +132,19 @@ def download_images(data, folder="pest_alert_images"):
             print(f"No valid image for {title}")
 
 
-# ----------------------------
-# Step 5: Download images
-# ----------------------------
-download_images(data, folder="pest_alert_images")
+if __name__ == "__main__":
+    links = extract_alert_links(fetch_main_page())
+    print(f"Extracted {len(links)} links from main page.")
 
-# ----------------------------
-# Step 6: Print results
-# ---------------------------- 
-for item in data:
-    print(item) 
\ No newline at end of file
+    data = scrape_pest_info(links)
+
+    # ----------------------------
+    # Step 5: Download images
+    # ----------------------------
+    download_images(data, folder="pest_alert_images")
+
+    # ----------------------------
+    # Step 6: Print results
+    # ----------------------------
+    for item in data:
+        print(item)
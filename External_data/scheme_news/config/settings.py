@@ -9,8 +9,15 @@ class Config:
     VERSION = "1.0.0"
     
     # Scraping Settings
-    DEFAULT_DELAY = 2  # seconds between requests
+    DEFAULT_DELAY = 2  # initial seconds between requests to a host (adapted per host, utils/rate_control.py)
+    MIN_DELAY = 0.25
+    MAX_DELAY = 60
+    RATE_STATE_FILE = "output2/rate_state.json"
     MAX_CONCURRENT_REQUESTS = 5
+    PER_HOST_CONCURRENCY = 2  # crawl frontier: requests in flight per host
+    MAX_ARTICLES_PER_SOURCE = 10
+    PARSE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # processes parsing fetched pages (utils/fetch_parse.py)
+    PAGE_QUEUE_SIZE = 8  # fetched pages waiting for a parse worker before fetching blocks
     REQUEST_TIMEOUT = 30
     RETRY_ATTEMPTS = 3
     
@@ -18,6 +25,40 @@ class Config:
     OUTPUT_DIR = "output"
     LOGS_DIR = "logs"
     
+    # Logging (utils/logger.py): shared queue-based handlers, JSON lines in LOGS_DIR;
+    # lines tagged extra={'sample': ...} are kept 1 in LOG_SAMPLE_RATE
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_SAMPLE_RATE = 10
+    
+    # Near-duplicate news detection (MinHash/LSH, utils/dedup.py): dropped within each scrape;
+    # the saved index keeps classifier scores so news.py does not classify a story seen before
+    DEDUP_INDEX_FILE = "output2/lsh_index.json"
+    DEDUP_THRESHOLD = 0.8
+    
+    # Relevance filter (utils/relevance.py): minimum weighted keyword score for an article;
+    # a source can override it with "min_relevance_score" in config/sources.py
+    MIN_RELEVANCE_SCORE = 1.0
+    
+    # TF-IDF keywords (utils/keywords.py); document frequencies persist across runs
+    KEYWORD_STATE_FILE = "output2/keyword_df.json"
+    KEYWORDS_PER_ARTICLE = 8
+    
+    # Per-stage timings and per-URL spans of each run (utils/metrics.py)
+    METRICS_FILE = "output2/metrics.json"
+    METRICS_PROM_FILE = "output2/metrics.prom"
+    
+    # Append-only history of every published article and scheme (utils/archive.py)
+    ARCHIVE_DIR = "output2/archive"
+    SEARCH_INDEX_FILE = "output2/archive/search_index.npz"  # BM25 index over the archive (utils/search.py)
+    
+    # Sentence embeddings of archived records for similarity search (utils/embeddings.py)
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    EMBEDDING_INDEX_FILE = "output2/archive/embeddings.npz"
+    EMBEDDING_BATCH_SIZE = 32
+    
+    # news.txt / schemes.txt reports next to the NDJSON records (not needed by news.py / scheme.py)
+    WRITE_TEXT_REPORTS = os.getenv("WRITE_TEXT_REPORTS", "0") == "1"
+    
     # Kerala Districts
     KERALA_DISTRICTS = [
         "Thiruvananthapuram", "Kollam", "Pathanamthitta", "Alappuzha",
@@ -45,7 +86,7 @@ class Config:
         "innovation", "sustainable", "bio", "natural", "rural", "village",
         
         # Malayalam keywords (in English script for detection)
-        "കൃഷി", "കർഷകൻ", "കർഷകർ", "നെല്ല്", "നെല്ലുകൃഷി", "തേങ്ങ", "റബ്ബർ",
+        "കൃഷി", "കർഷക", "കർഷകൻ", "കർഷകർ", "നെല്ല്", "നെല്ലുകൃഷി", "തേങ്ങ", "റബ്ബർ",
         "കാപ്പി", "ചായ", "ഇഞ്ചി", "ഏലം", "കുരുമുളക്", "വാഴ", "പച്ചക്കറി",
         "മഴ", "വരൾച്ച", "വെള്ളപ്പൊക്കം", "കാലാവസ്ഥ", "വിള", "വിത്ത്", "വളം",
         "പശു", "പാൽ", "മുട്ട", "കോഴി", "മത്സ്യം", "തോട്ടം", "പൂന്തോട്ടം",
@@ -16,7 +16,8 @@ ALL_SOURCES = {
         },
         "category": "business_agriculture",
         "language": "english",
-        "scrape_method": "requests_bs4"
+        "scrape_method": "requests_bs4",
+        "refresh_interval": 4 * 3600  # seconds between scheduler.py refreshes
     },
     
     "times_of_india_agriculture": {
@@ -32,7 +33,8 @@ ALL_SOURCES = {
         },
         "category": "news_agriculture",
         "language": "english",
-        "scrape_method": "requests_bs4"
+        "scrape_method": "requests_bs4",
+        "refresh_interval": 4 * 3600
     },
     
     "testbook_agriculture_schemes": {
@@ -48,10 +50,13 @@ ALL_SOURCES = {
         },
         "category": "government_schemes",
         "language": "english",
-        "scrape_method": "testbook_extractor"
+        "scrape_method": "testbook_extractor",
+        "min_relevance_score": 0,
+        "refresh_interval": 24 * 3600
     }
 }
 
-# NO KEYWORD FILTERING
+# Extra relevance weighting (utils/relevance.py): Kerala terms count double,
+# reject terms subtract; both empty = only Config.AGRICULTURE_KEYWORDS apply
 KERALA_AGRICULTURE_KEYWORDS = []
 REJECT_KEYWORDS = []
@@ -6,16 +6,18 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from scrapers.base_scraper import BaseScraper
-from datetime import datetime
+from utils.article import Article
+from utils.metrics import traced
 import re
 
 class FixedMathrubhumiScraper(BaseScraper):
     def __init__(self, source_config):
         super().__init__(source_config)
     
-    def extract_individual_article_urls(self, soup):
-        """Extract individual article URLs from listing page"""
-        article_urls = []
+    @traced
+    def extract_individual_article_urls(self, soup, frontier=None):
+        """Queue individual article URLs from listing page, best-ranked first"""
+        frontier = frontier or self.new_frontier()
         
         # Look for agriculture article links - these are the specific patterns used by Mathrubhumi
         selectors = [
@@ -29,21 +31,15 @@ class FixedMathrubhumiScraper(BaseScraper):
             'a[href*="farming"]'
         ]
         
-        for selector in selectors:
-            links = soup.select(selector)
-            for link in links:
-                href = link.get('href')
-                if href:
-                    if href.startswith('/'):
-                        full_url = "https://www.mathrubhumi.com" + href
-                    else:
-                        full_url = href
-                    
-                    if full_url not in article_urls:
-                        article_urls.append(full_url)
-        
-        return article_urls
+        # One select call for all patterns; the frontier canonicalizes and dedupes with a set
+        for link in soup.select(', '.join(selectors)):
+            href = link.get('href')
+            if href:
+                frontier.push(href, link.get_text(" ", strip=True), base_url="https://www.mathrubhumi.com/")
+        
+        return frontier.pending()
 
+    @traced
     def extract_full_article(self, article_url):
         """Extract full content from individual article page"""
         print(f"🔍 Extracting full content from: {article_url}")
@@ -103,6 +99,18 @@ class FixedMathrubhumiScraper(BaseScraper):
             'url': article_url
         }
 
+    def build_article(self, url, meta):
+        """Full article record for one queued URL, or None if the content is too short"""
+        article_data = self.extract_full_article(url)
+        if article_data and len(article_data['content']) > 100:
+            print(f"✅ SUCCESS: {article_data['title'][:60]}...")
+            print(f"   Content length: {len(article_data['content'])} characters")
+            return Article.from_source(self.source_config, article_data['url'],
+                                       article_data['title'], article_data['content'])
+        
+        print(f"❌ FAILED: Insufficient content for {url}")
+        return None
+
     def scrape_articles(self):
         """Main scraping method"""
         articles = []
@@ -118,39 +126,15 @@ class FixedMathrubhumiScraper(BaseScraper):
         soup = self.parse_html(html)
         
         # Extract individual article URLs
-        article_urls = self.extract_individual_article_urls(soup)
+        frontier = self.new_frontier()
+        article_urls = self.extract_individual_article_urls(soup, frontier)
         print(f"📋 Found {len(article_urls)} individual article URLs")
         
-        # Extract full content from each article
-        for i, url in enumerate(article_urls[:10]):  # Limit to 10 articles
-            print(f"\n📰 Processing article {i+1}/{min(10, len(article_urls))}")
-            
-            article_data = self.extract_full_article(url)
-            if article_data and len(article_data['content']) > 100:
-                full_article = {
-                    'url': article_data['url'],
-                    'source': self.source_config['name'],
-                    'category': self.source_config['category'],
-                    'language': self.source_config['language'],
-                    'scraped_at': datetime.now().isoformat(),
-                    'title': article_data['title'],
-                    'content': article_data['content'],
-                    'date': '',
-                    'author': '',
-                    'images': [],
-                    'keywords': self.extract_keywords(article_data['title'] + " " + article_data['content'])
-                }
-                
-                articles.append(full_article)
-                print(f"✅ SUCCESS: {article_data['title'][:60]}...")
-                print(f"   Content length: {len(article_data['content'])} characters")
-            else:
-                print(f"❌ FAILED: Insufficient content")
-            
-            # Rate limiting
-            self.rate_limit()
+        # Extract full content from the best-ranked articles with concurrent, host-polite workers
+        articles = self.crawl(frontier, self.build_article, limit=10)  # Limit to 10 articles
         
-        return articles
+        # Relevance filter, then keywords for all articles in one TF-IDF pass
+        return self.assign_keywords(self.filter_relevant(articles))
 
 # Test the fixed scraper
 if __name__ == "__main__":
@@ -177,8 +161,8 @@ if __name__ == "__main__":
         # Show sample
         sample = articles[0]
         print(f"\n📖 SAMPLE FULL ARTICLE:")
-        print(f"Title: {sample['title']}")
-        print(f"Content length: {len(sample['content'])} characters")
-        print(f"Content preview: {sample['content'][:300]}...")
+        print(f"Title: {sample.title}")
+        print(f"Content length: {len(sample.content)} characters")
+        print(f"Content preview: {sample.content[:300]}...")
     else:
         print("❌ No articles extracted")
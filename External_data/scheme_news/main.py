@@ -1,13 +1,18 @@
 """
 Kerala Agriculture News Scraper - Main Execution File
 AGRICULTURE & WEATHER CONTENT ONLY
+
+One CLI for the scheme_news entry points. Only argparse and the source
+configuration are imported at startup; each subcommand imports what it needs
+(requests/BeautifulSoup/NumPy for scraping, transformers for classification)
+when it runs, so --help and `list` return immediately.
+Startup time is measured by tests/benchmark_startup.py.
 """
 
 import sys
 import os
 import argparse
 from datetime import datetime
-import logging
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -16,7 +21,7 @@ def run_single_scraper(source_name):
     """Run a single scraper by source name"""
     from config.sources import ALL_SOURCES
     from utils.file_manager import FileManager
-    from multi_source_scraper import AgricultureOnlyScraper
+    from multi_source_scraper import SimpleConsolidatedScraper
     
     if source_name not in ALL_SOURCES:
         print(f"❌ Error: Source '{source_name}' not found in configuration")
@@ -32,7 +37,7 @@ def run_single_scraper(source_name):
     print(f"🔗 URLs: {', '.join(source_config['news_urls'])}")
     
     try:
-        scraper = AgricultureOnlyScraper(source_config)
+        scraper = SimpleConsolidatedScraper(source_config)
         
         print("🚀 Starting to scrape agriculture content...")
         articles = scraper.run()
@@ -47,9 +52,9 @@ def run_single_scraper(source_name):
             if articles:
                 sample_article = articles[0]
                 print(f"\n🌾 Sample Agriculture Article:")
-                print(f"Title: {sample_article.get('title', 'No title')}")
-                print(f"Keywords: {', '.join(sample_article.get('keywords', [])[:5])}")
-                print(f"Content: {sample_article.get('content', 'No content')[:200]}...")
+                print(f"Title: {sample_article.title}")
+                print(f"Keywords: {', '.join(sample_article.keywords[:5])}")
+                print(f"Content: {sample_article.content[:200]}...")
         else:
             print("❌ No agriculture-related content found")
         
@@ -74,8 +79,8 @@ def test_agriculture_scraper():
         
         print(f"\n🌾 Agriculture Article Titles Found:")
         for i, article in enumerate(articles[:3], 1):
-            title = article.get('title', 'No title')
-            keywords = ', '.join(article.get('keywords', [])[:3])
+            title = article.title
+            keywords = ', '.join(article.keywords[:3])
             print(f"   {i}. {title}")
             print(f"      Keywords: {keywords}")
     else:
@@ -104,54 +109,159 @@ def list_agriculture_sources():
             print(f"      Name: {source_name}")
             print(f"      Language: {language}")
 
-def main():
-    """Main function with argument parsing"""
+def setup_output_directories():
+    """Setup output directories"""
+    os.makedirs('output/daily', exist_ok=True)
+    os.makedirs('output/weekly', exist_ok=True) 
+    os.makedirs('output/monthly', exist_ok=True)
+    os.makedirs('output/consolidated', exist_ok=True)
+    os.makedirs('logs', exist_ok=True)
+
+def print_banner():
+    print("🌾 KERALA AGRICULTURE & WEATHER NEWS SCRAPER 🌾")
+    print("🔒 STRICT AGRICULTURE/WEATHER FILTERING ENABLED")
+    print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+def command_list(args):
+    list_agriculture_sources()
+
+def command_scrape(args):
+    setup_output_directories()
+    print_banner()
+    if args.source:
+        run_single_scraper(args.source)
+    else:
+        from multi_source_scraper import main as scrape_all_sources
+        scrape_all_sources()
+
+def command_test(args):
+    setup_output_directories()
+    print_banner()
+    test_agriculture_scraper()
+
+def command_classify(args):
+    from news import classify_news
+    classify_news()
+
+def command_schemes(args):
+    from scheme import export_schemes
+    schemes = export_schemes()
+    print(f"✅ Exported {len(schemes)} schemes")
+
+def command_archive(args):
+    from utils.archive import get_archive
+    archive = get_archive()
+    if args.id:
+        article = archive.get(args.id)
+        print(article.to_json() if article else f"❌ No archived record {args.id}")
+        return
+    if not (args.since or args.until or args.kind):
+        for name, value in archive.stats().items():
+            print(f"   {name}: {value}")
+        return
+    for article in archive.range(args.since, args.until, kind=args.kind, limit=args.limit):
+        print(article.to_json() if args.ndjson else f"{article.scraped_at_iso[:16]}  [{article.source}] {article.title[:80]}")
+
+def command_search(args):
+    from datetime import datetime
+    from utils.search import get_search_index
+    hits = get_search_index().search(args.query, limit=args.limit, kind=args.kind)
+    if not hits:
+        print(f"❌ No matches for {args.query!r}")
+    for hit in hits:
+        print(f"{hit.score:6.2f}  {datetime.fromtimestamp(hit.scraped_at).isoformat()[:10]}  [{hit.kind}] {hit.title[:80]}  ({hit.key})")
+
+def command_similar(args):
+    from datetime import datetime
+    from utils.embeddings import get_embedding_index, get_encoder
+    index = get_embedding_index()
+    if args.id:
+        hits = index.similar(args.id, limit=args.limit, kind=args.kind) if args.id in index.rows else []
+    else:
+        hits = index.search(args.query or "", get_encoder(), limit=args.limit, kind=args.kind)
+    if not hits:
+        print(f"❌ No similar records for {args.id or args.query!r}")
+    for hit in hits:
+        print(f"{hit.score:6.3f}  {datetime.fromtimestamp(hit.scraped_at).isoformat()[:10]}  [{hit.kind}] {hit.title[:80]}  ({hit.key})")
+
+def build_parser():
     parser = argparse.ArgumentParser(
         description='Kerala Agriculture & Weather News Scraper - AGRICULTURE CONTENT ONLY',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  python main.py --test                              # Test agriculture scraper
-  python main.py --agriculture                       # Scrape ALL agriculture sources
-  python main.py --source mathrubhumi_agriculture    # Run specific source
-  python main.py --list                              # List agriculture sources
+  python main.py list                                # List agriculture sources
+  python main.py scrape                              # Scrape ALL agriculture sources
+  python main.py scrape --source testbook_agriculture_schemes   # Run specific source
+  python main.py classify                            # Keep harmful news (news.py)
+  python main.py schemes                             # Export schemes (scheme.py)
+  python main.py test                                # Test agriculture scraper
+  python main.py archive                             # Archive statistics
+  python main.py archive --since 2025-09-01 --kind news    # Archived news since a date
+  python main.py search "coconut subsidy" --kind schemes   # Full-text search of the archive
+  python main.py similar "crop insurance" --kind schemes   # Semantic search (embeddings)
+
+Older flags still work: --list, --agriculture, --source NAME, --test
         """
     )
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
     
-    parser.add_argument('--agriculture', action='store_true', help='Scrape ALL agriculture sources')
-    parser.add_argument('--source', type=str, help='Run specific agriculture source')
-    parser.add_argument('--test', action='store_true', help='Test agriculture scraper')
-    parser.add_argument('--list', action='store_true', help='List all agriculture sources')
-    
-    args = parser.parse_args()
+    subparsers.add_parser('list', help='List all agriculture sources').set_defaults(handler=command_list)
+    scrape_parser = subparsers.add_parser('scrape', help='Scrape all agriculture sources, or one with --source')
+    scrape_parser.add_argument('--source', type=str, help='Run specific agriculture source')
+    scrape_parser.set_defaults(handler=command_scrape)
+    subparsers.add_parser('test', help='Test agriculture scraper').set_defaults(handler=command_test)
+    subparsers.add_parser('classify', help='Classify scraped news and keep harmful articles').set_defaults(handler=command_classify)
+    subparsers.add_parser('schemes', help='Export scraped schemes to schemes.json').set_defaults(handler=command_schemes)
+    archive_parser = subparsers.add_parser('archive', help='Read the history of scraped articles and schemes')
+    archive_parser.add_argument('--since', help='first date (YYYY-MM-DD[THH:MM])')
+    archive_parser.add_argument('--until', help='end date, exclusive')
+    archive_parser.add_argument('--kind', choices=['news', 'schemes'])
+    archive_parser.add_argument('--id', help='one record by its article key')
+    archive_parser.add_argument('--limit', type=int)
+    archive_parser.add_argument('--ndjson', action='store_true', help='print full records')
+    archive_parser.set_defaults(handler=command_archive)
+    search_parser = subparsers.add_parser('search', help='Full-text search of archived articles and schemes')
+    search_parser.add_argument('query', help='words to look for (English or Malayalam)')
+    search_parser.add_argument('--kind', choices=['news', 'schemes'])
+    search_parser.add_argument('--limit', type=int, default=10)
+    search_parser.set_defaults(handler=command_search)
+    similar_parser = subparsers.add_parser('similar', help='Archived records closest in meaning to a text or a record')
+    similar_parser.add_argument('query', nargs='?', help='free text (English or Malayalam)')
+    similar_parser.add_argument('--id', help='find records similar to this article key instead')
+    similar_parser.add_argument('--kind', choices=['news', 'schemes'])
+    similar_parser.add_argument('--limit', type=int, default=10)
+    similar_parser.set_defaults(handler=command_similar)
     
-    # Setup output directories
-    os.makedirs('output/daily', exist_ok=True)
-    os.makedirs('output/weekly', exist_ok=True) 
-    os.makedirs('output/monthly', exist_ok=True)
-    os.makedirs('output/consolidated', exist_ok=True)
-    os.makedirs('logs', exist_ok=True)
+    parser.add_argument('--agriculture', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--source', type=str, dest='legacy_source', help=argparse.SUPPRESS)
+    parser.add_argument('--test', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--list', action='store_true', help=argparse.SUPPRESS)
+    return parser
+
+def main(argv=None):
+    """Main function with argument parsing"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
     
-    print("🌾 KERALA AGRICULTURE & WEATHER NEWS SCRAPER 🌾")
-    print("🔒 STRICT AGRICULTURE/WEATHER FILTERING ENABLED")
-    print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
+    if getattr(args, 'handler', None):
+        return args.handler(args)
     
+    # Older flag style
     if args.list:
-        list_agriculture_sources()
+        command_list(args)
     elif args.test:
-        test_agriculture_scraper()
-    elif args.source:
-        run_single_scraper(args.source)
-    elif args.agriculture:
-        from multi_source_scraper import scrape_agriculture_only
-        scrape_agriculture_only()
+        command_test(args)
+    elif args.legacy_source or args.agriculture:
+        args.source = args.legacy_source
+        command_scrape(args)
     else:
-        print("Please specify an option. Use --help for usage information.")
+        print("Please specify a command. Use --help for usage information.")
         print("\n🌾 Quick start commands:")
-        print("   python main.py --test         # Test agriculture scraper")
-        print("   python main.py --agriculture  # Scrape ALL agriculture sources")
-        print("   python main.py --list         # Show agriculture sources")
+        print("   python main.py test         # Test agriculture scraper")
+        print("   python main.py scrape       # Scrape ALL agriculture sources")
+        print("   python main.py list         # Show agriculture sources")
 
 if __name__ == "__main__":
     main()
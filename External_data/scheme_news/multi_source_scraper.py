@@ -4,21 +4,45 @@ Agriculture Scraper - Create output2 and delete output folder after consolidatio
 - Times of India Agriculture News  
 - Testbook Agriculture Schemes
 
-Output: news.txt and schemes.txt in output2 folder, then delete output folder
+Output: news.ndjson and schemes.ndjson in output2 folder (plus news.txt and
+schemes.txt when Config.WRITE_TEXT_REPORTS is set), then delete output folder
 """
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from config.settings import config
 from config.sources import ALL_SOURCES
 from scrapers.base_scraper import BaseScraper
-from utils.file_manager import FileManager
+from utils.file_manager import FileManager, RecordWriter, NEWS_RECORDS_FILE, SCHEMES_RECORDS_FILE
+from utils.fetch_parse import FetchParsePipeline
+from utils.archive import get_archive
+from utils.search import get_search_index
+from utils.article import Article
+from utils.dedup import NearDuplicateIndex
+from utils.keywords import assign_keywords, get_keyword_engine
+from utils.rate_control import get_rate_controller
+from utils.metrics import get_metrics
 from datetime import datetime
 import time
 
 class SimpleConsolidatedScraper(BaseScraper):
     """Scraper that creates simple consolidated files"""
     
+    def page_articles(self, news_url, html):
+        """Parse one fetched page into relevant articles (CPU only, runs in the parse pool in main())"""
+        soup = self.parse_html(html)
+        
+        # Extract using site-specific methods
+        extracted_content = self.extract_synopsis_articles(soup, news_url)
+        
+        articles = [
+            Article.from_source(self.source_config, news_url, content_data['title'], content_data['content'])
+            for content_data in extracted_content
+        ]
+        
+        return self.filter_relevant(articles)
+    
     def scrape_articles(self):
         """Scrape using site-specific methods"""
         articles = []
@@ -31,31 +55,53 @@ class SimpleConsolidatedScraper(BaseScraper):
                 if not html:
                     continue
                 
-                soup = self.parse_html(html)
-                
-                # Extract using site-specific methods
-                extracted_content = self.extract_synopsis_articles(soup, news_url)
-                
-                for content_data in extracted_content:
-                    article = {
-                        'url': news_url,
-                        'source': self.source_config['name'],
-                        'category': self.source_config['category'],
-                        'language': self.source_config['language'],
-                        'scraped_at': datetime.now().isoformat(),
-                        'title': content_data['title'],
-                        'content': content_data['content'],
-                        'keywords': self.extract_keywords(content_data['title'] + " " + content_data['content'])
-                    }
-                    articles.append(article)
-                
-                self.rate_limit()
+                articles.extend(self.page_articles(news_url, html))
                 
             except Exception as e:
                 self.logger.error(f"Error processing {news_url}: {str(e)}")
                 continue
         
-        return articles
+        # Near-duplicate news within the batch is dropped before the keyword counts see it
+        if not is_scheme_source(self.source_config['name'], self.source_config):
+            articles, duplicates = NearDuplicateIndex(threshold=config.DEDUP_THRESHOLD).filter(articles)
+            if duplicates:
+                self.logger.info(f"🧹 Skipped {len(duplicates)} near-duplicate articles")
+        
+        # Keywords for the whole batch in one TF-IDF pass
+        return self.assign_keywords(articles)
+
+def is_scheme_source(source_name, source_config):
+    """Testbook / government scheme sources go to schemes, everything else to news"""
+    return 'testbook' in source_name.lower() or source_config.get('category') == 'government_schemes'
+
+def publish_records(file_manager, kind, articles):
+    """Atomically write and publish output2/<kind>.ndjson (plus the optional text report)"""
+    if not articles:
+        return None
+    
+    if kind == 'schemes':
+        filename = file_manager.save_schemes_records(articles)
+        if config.WRITE_TEXT_REPORTS:
+            file_manager.save_schemes_consolidated(articles)
+    else:
+        filename = file_manager.save_news_records(articles)
+        if config.WRITE_TEXT_REPORTS:
+            file_manager.save_news_consolidated(articles)
+    
+    print(f"📢 Published {filename} ({len(articles)} items)")
+    return filename
+
+def publish_stream(file_manager, kind, writer):
+    """Publish a streamed output2/<kind>.ndjson (plus the optional text report)"""
+    filename = writer.close()
+    if filename is None:
+        return None
+    
+    if config.WRITE_TEXT_REPORTS:
+        file_manager.write_text_report(kind)
+    
+    print(f"📢 Published {filename} ({writer.count} items)")
+    return filename
 
 def main():
     """Main function with output2 folder and output folder deletion"""
@@ -71,49 +117,87 @@ def main():
     all_articles = []
     news_articles = []  # For ET + TOI
     scheme_articles = []  # For Testbook schemes
-    successful_sources = 0
+    file_manager = FileManager()
+    # Fresh every run: output2/news.ndjson is the full current scrape, only repeats within it are dropped
+    # (news.py reuses the scores of stories classified in earlier runs)
+    dedup_index = NearDuplicateIndex(threshold=config.DEDUP_THRESHOLD)
     
+    # Pages of every source are fetched on I/O threads and parsed in a process pool
+    # (utils/fetch_parse.py); each kind's articles are collected as pages come back,
+    # and once its last page is done they get keywords in one TF-IDF pass and
+    # output2/<kind>.ndjson is published, so news.py can start classifying while
+    # schemes are still being scraped
+    scrapers = {}
+    kinds = {}
     for source_name, source_config in ALL_SOURCES.items():
-        print(f"\n📊 Processing: {source_config['name']}")
-        print(f"🔗 URL: {source_config['news_urls'][0]}")
-        
-        if 'testbook' in source_name.lower():
-            print("📋 SCHEMES → will go to output2/schemes.txt")
-        else:
-            print("📰 NEWS → will go to output2/news.txt")
+        scrapers[source_name] = SimpleConsolidatedScraper(source_config)
+        kinds[source_name] = 'schemes' if is_scheme_source(source_name, source_config) else 'news'
+        print(f"📊 Queued: {source_config['name']} ({len(source_config['news_urls'])} pages) → output2/{kinds[source_name]}.ndjson")
+    source_names = {scraper: source_name for source_name, scraper in scrapers.items()}
+    jobs = [(scraper, url) for scraper in scrapers.values() for url in scraper.source_config['news_urls']]
+    
+    remaining = {'news': 0, 'schemes': 0}
+    for scraper, _ in jobs:
+        remaining[kinds[source_names[scraper]]] += 1
+    writers = {'news': RecordWriter(NEWS_RECORDS_FILE), 'schemes': RecordWriter(SCHEMES_RECORDS_FILE)}
+    published_files = {}
+    source_counts = {}
+    
+    pipeline = FetchParsePipeline(
+        fetch_workers=config.MAX_CONCURRENT_REQUESTS,
+        parse_workers=config.PARSE_WORKERS,
+        queue_size=config.PAGE_QUEUE_SIZE
+    )
+    def finish_kind(kind):
+        """Keywords for all of a kind's articles in one TF-IDF pass, then write and publish them"""
+        kind_articles = [article for batch in batches[kind].values() for article in batch]
+        if kind_articles:
+            assign_keywords(kind_articles)
+            writers[kind].write(kind_articles)
+        for source_name, batch in batches[kind].items():
+            # Save individual file temporarily in output/daily
+            filename = file_manager.save_articles_to_text(batch, source_name)
+            print(f"💾 Temporary file: {filename}")
+        published_files[kind] = publish_stream(file_manager, kind, writers[kind])
+    
+    batches = {'news': {}, 'schemes': {}}  # kind -> {source name: articles}
+    for (scraper, url), articles in pipeline.run(jobs):
+        source_name = source_names[scraper]
+        kind = kinds[source_name]
+        print(f"\n📊 Parsed: {scraper.source_config['name']}")
+        print(f"🔗 URL: {url}")
         
         try:
-            scraper = SimpleConsolidatedScraper(source_config)
-            articles = scraper.run()
+            # Drop near-duplicate news (wire stories on ET + TOI, overlapping TOI windows) before classification
+            if articles and kind == 'news':
+                articles, duplicates = dedup_index.filter(articles)
+                if duplicates:
+                    print(f"🧹 Skipped {len(duplicates)} near-duplicate articles")
             
             if articles:
+                batches[kind].setdefault(source_name, []).extend(articles)
                 all_articles.extend(articles)
-                successful_sources += 1
+                source_counts[source_name] = source_counts.get(source_name, 0) + len(articles)
                 
                 # Separate articles by type
-                if 'testbook' in source_name.lower() or source_config.get('category') == 'government_schemes':
+                if kind == 'schemes':
                     scheme_articles.extend(articles)
                     print(f"✅ SUCCESS: {len(articles)} SCHEMES extracted")
                 else:
                     news_articles.extend(articles)
                     print(f"✅ SUCCESS: {len(articles)} NEWS articles extracted")
                 
-                total_chars = sum(len(a.get('content', '')) for a in articles)
+                total_chars = sum(len(a.content) for a in articles)
                 avg_chars = total_chars // len(articles)
                 
                 print(f"📊 Total content: {total_chars:,} characters")
                 print(f"📊 Average per item: {avg_chars} characters")
                 
-                # Save individual file temporarily in output/daily
-                file_manager = FileManager()
-                filename = file_manager.save_articles_to_text(articles, source_name)
-                print(f"💾 Temporary file: {filename}")
-                
                 # Show samples
                 print(f"📋 Sample content:")
                 for i, article in enumerate(articles[:2], 1):
-                    title = article.get('title', '')[:70]
-                    content_len = len(article.get('content', ''))
+                    title = article.title[:70]
+                    content_len = len(article.content)
                     
                     print(f"   {i}. {title}...")
                     print(f"      📊 {content_len} characters")
@@ -125,7 +209,30 @@ def main():
             print(f"❌ ERROR: {str(e)}")
             print("🔍 Continuing to next source...")
         
-        time.sleep(2)
+        remaining[kind] -= 1
+        if remaining[kind] == 0:
+            finish_kind(kind)
+    
+    for (scraper, url), error in pipeline.errors:
+        print(f"❌ {scraper.source_config['name']}: {url} failed: {error}")
+    successful_sources = len(source_counts)
+    
+    # History across runs: output2/ only holds the latest scrape
+    archive = get_archive()
+    archived = archive.append(news_articles, 'news') + archive.append(scheme_articles, 'schemes')
+    print(f"\n🗄️  Archived {archived} new records ({len(archive)} in {config.ARCHIVE_DIR})")
+    if archived:
+        get_search_index()  # index the new records
+    
+    get_keyword_engine().save()
+    get_rate_controller().save()
+    
+    # Stage timings of this run → output2/metrics.json + output2/metrics.prom
+    metrics = get_metrics()
+    metrics.export(config.METRICS_FILE, config.METRICS_PROM_FILE)
+    print(f"\n⏱️  Slowest stages (full report: {config.METRICS_FILE}):")
+    for row in metrics.summary()[:5]:
+        print(f"   {row['stage']} [{row['source'] or '-'}]: {row['seconds']:.2f}s over {row['calls']} calls")
     
     # Create consolidated files and clean up
     if all_articles:
@@ -138,18 +245,14 @@ def main():
         print(f"   📰 News Articles: {len(news_articles)}")
         print(f"   📋 Government Schemes: {len(scheme_articles)}")
         
-        file_manager = FileManager()
+        # Consolidated files in output2 were published as each group finished
+        print(f"\n📁 CONSOLIDATED FILES IN OUTPUT2...")
         
-        # Create consolidated files in output2
-        print(f"\n📁 CREATING CONSOLIDATED FILES IN OUTPUT2...")
-        
-        # Create NEWS consolidated file → output2/news.txt
+        # NEWS records → output2/news.ndjson
         if news_articles:
-            print(f"📰 Creating news.txt...")
-            
-            news_file = file_manager.save_news_consolidated(news_articles)
+            news_file = published_files.get('news')
             
-            news_total_chars = sum(len(a.get('content', '')) for a in news_articles)
+            news_total_chars = sum(len(a.content) for a in news_articles)
             news_avg_chars = news_total_chars // len(news_articles)
             
             print(f"✅ NEWS FILE CREATED:")
@@ -158,13 +261,11 @@ def main():
             print(f"   📊 Total content: {news_total_chars:,} characters")
             print(f"   📰 Sources: Economic Times + Times of India")
         
-        # Create SCHEMES consolidated file → output2/schemes.txt
+        # SCHEMES records → output2/schemes.ndjson
         if scheme_articles:
-            print(f"📋 Creating schemes.txt...")
-            
-            schemes_file = file_manager.save_schemes_consolidated(scheme_articles)
+            schemes_file = published_files.get('schemes')
             
-            schemes_total_chars = sum(len(a.get('content', '')) for a in scheme_articles)
+            schemes_total_chars = sum(len(a.content) for a in scheme_articles)
             schemes_avg_chars = schemes_total_chars // len(scheme_articles)
             
             print(f"✅ SCHEMES FILE CREATED:")
@@ -185,8 +286,8 @@ def main():
         # Show final result
         print(f"\n🚀 FINAL RESULT:")
         print(f"📁 Folder: output2/ (same directory as config/)")
-        print(f"📰 output2/news.txt - {len(news_articles)} news articles")
-        print(f"📋 output2/schemes.txt - {len(scheme_articles)} government schemes")
+        print(f"📰 output2/news.ndjson - {len(news_articles)} news articles")
+        print(f"📋 output2/schemes.ndjson - {len(scheme_articles)} government schemes")
         print(f"🗑️  Temporary 'output' folder deleted")
         print(f"💼 Clean setup ready for your farmer app!")
         
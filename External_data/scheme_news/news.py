@@ -1,46 +1,93 @@
-import re
+import sys
+import os
 import json
-from transformers import pipeline
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-articles = []
+from config.settings import config
+from utils.article import iter_ndjson
+from utils.dedup import NearDuplicateIndex
 
-with open(r"C:\SIH_BACKEND\External_data\scheme_news\output2\news.txt", "r", encoding="utf-8") as f:
-    text = f.read()
+# NDJSON records written by multi_source_scraper (FileManager.save_news_records)
+records_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output2", "news.ndjson")
 
-# Extract articles
-matches = re.findall(
-    r"TITLE:\s*(.*?)\n\nCONTENT:\s*(.*?)(?=\n\nKEYWORDS:|\n\n=+|\Z)", 
-    text, 
-    re.S
-)
+labels = ["Harmful for farmers", "Neutral", "Positive for farmers"]
 
-for title, content in matches:
-    articles.append({
-        "title": title.strip(),
-        "content": content.strip().replace("\n", " ")
-    })
 
-labels = ["Harmful for farmers", "Neutral", "Positive for farmers"]
-classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
-
-harmful_articles = []
-
-for art in articles:
-    text = art["title"] + " " + art["content"]
-    output = classifier(text, candidate_labels=labels)
-    
-    # Filter only harmful news
-    if output["labels"][0] == "Harmful for farmers":
-        harmful_articles.append({
-            "title": art["title"],
-            "content": art["content"],
-            "scores": dict(zip(output["labels"], output["scores"]))
+def parse_news_records(path=records_path):
+    """Key/title/content of the news records, ready for classification"""
+    articles = []
+    for article in iter_ndjson(path):
+        articles.append({
+            "key": article.key,
+            "title": article.title.strip(),
+            "content": article.content.strip().replace("\n", " ")
         })
+    return articles
+
+
+# Harmful news read by combine.py
+output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "news.json")
+
+# Signatures and scores of the stories classified so far (utils/dedup.py)
+index_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.DEDUP_INDEX_FILE)
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier():
+    """Zero-shot classifier, loaded once per process"""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            from transformers import pipeline  # heavy: only loaded when classifying
+            _classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+        return _classifier
+
+
+def classify_news(path=records_path, output_path=output_path, index_path=index_path):
+    """Zero-shot classify the news records and save the harmful ones
+
+    Stories classified in an earlier run (or near-identical copies of them)
+    reuse their saved scores; only new ones go through the classifier. The
+    saved scores are kept for the current records only.
+    """
+    index = NearDuplicateIndex(index_path, threshold=config.DEDUP_THRESHOLD)
+
+    harmful_articles = []
+    classified = 0
+    records = parse_news_records(path)
+
+    for art in records:
+        text = art["title"] + " " + art["content"]
+        scores, signature = index.cached_scores(art["key"], text)
+        if scores is None:
+            output = get_classifier()(text, candidate_labels=labels)
+            scores = dict(zip(output["labels"], output["scores"]))
+            classified += 1
+        index.remember(art["key"], signature, scores)
+        
+        # Filter only harmful news
+        if max(scores, key=scores.get) == "Harmful for farmers":
+            harmful_articles.append({
+                "title": art["title"],
+                "content": art["content"],
+                "scores": scores
+            })
+
+    index.retain(art["key"] for art in records)
+    index.save()
+
+    # Save to JSON file
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(harmful_articles, f, indent=4, ensure_ascii=False)
+
+    print(f"Saved harmful articles to {output_path}")
+    print(f"Total harmful articles: {len(harmful_articles)} ({classified} newly classified)")
+    return harmful_articles
 
-# Save to JSON file
-output_path = r"C:\SIH_BACKEND\External_data\scheme_news\output2\news.json"
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(harmful_articles, f, indent=4, ensure_ascii=False)
 
-print(f"Saved harmful articles to {output_path}")
-print(f"Total harmful articles: {len(harmful_articles)}")
+if __name__ == "__main__":
+    classify_news()
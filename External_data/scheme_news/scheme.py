@@ -1,29 +1,40 @@
-import re
+import sys
+import os
 import json
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Load the schemes text file
-file_path = "C:\SIH_BACKEND\External_data\scheme_news\output2\schemes.txt"
-with open(file_path, "r", encoding="utf-8") as f:
-    text = f.read()
-
-# Regex to extract scheme details
-pattern = re.compile(
-    r"SCHEME NAME:\s*(.*?)\n\nSCHEME DETAILS:\n(.*?)(?:\n\nKEYWORDS:\s*(.*?)\n\n=+|$)",
-    re.S
-)
-
-schemes = []
-for match in pattern.findall(text):
-    name, details, keywords = match
-    scheme_data = {
-        "scheme_name": name.strip(),
-        "scheme_details": details.strip(),
-        "keywords": [k.strip() for k in keywords.split(",")] if keywords else []
-    }
-    schemes.append(scheme_data)
-
-# Save JSON output
-output_path = "C:\SIH_BACKEND\External_data\scheme_news\schemes.json"
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(schemes, f, indent=4, ensure_ascii=False)
+from utils.article import iter_ndjson
 
+# NDJSON records written by multi_source_scraper (FileManager.save_schemes_records)
+records_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output2", "schemes.ndjson")
+
+
+def parse_scheme_records(path=records_path):
+    """Scheme name/details/keywords entries from the scheme records"""
+    schemes = []
+    for article in iter_ndjson(path):
+        scheme_data = {
+            "scheme_name": article.title.strip(),
+            "scheme_details": article.content.strip(),
+            "keywords": [k.strip() for k in article.keywords if k.strip()]
+        }
+        schemes.append(scheme_data)
+    return schemes
+
+
+# Scheme list read by combine.py
+output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schemes.json")
+
+
+def export_schemes(path=records_path, output_path=output_path):
+    """Write the scheme entries to the JSON file the backend reads"""
+    schemes = parse_scheme_records(path)
+
+    # Save JSON output
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(schemes, f, indent=4, ensure_ascii=False)
+    return schemes
+
+
+if __name__ == "__main__":
+    export_schemes()
@@ -4,12 +4,18 @@ Enhanced Scraper with Testbook Agriculture Schemes Extraction
 import requests
 import time
 import random
-import logging
-from datetime import datetime
 from abc import ABC, abstractmethod
 from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
+from utils.article import Article
+from utils.logger import get_logger
+from utils.keywords import assign_keywords, get_keyword_engine
+from utils.relevance import get_relevance_scorer
+from utils.frontier import CrawlFrontier, canonicalize_url
+from utils.metrics import get_metrics, traced
+from utils.rate_control import RETRY_STATUSES, get_rate_controller, parse_retry_after
+from config.settings import config
 
 class BaseScraper(ABC):
     """Enhanced scraper with Testbook scheme extraction"""
@@ -28,28 +34,46 @@ class BaseScraper(ABC):
             'Accept-Language': 'en-US,en;q=0.9',
             'Connection': 'keep-alive'
         })
-        self.session.timeout = 30
         
     def setup_logging(self):
-        """Setup logging"""
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(self.__class__.__name__)
+        """Per-source logger on the shared queue-based logging configuration"""
+        self.logger = get_logger(self.__class__.__name__, source=self.source_config.get('name'))
     
     def get_page(self, url):
-        """Fetch webpage with retries"""
-        for attempt in range(2):
+        """Fetch webpage with retries, paced by the per-host rate controller"""
+        controller = get_rate_controller()
+        host = urlparse(url).netloc
+        for attempt in range(1, config.RETRY_ATTEMPTS + 1):
+            controller.wait(host)
+            started = time.monotonic()
+            try:
+                self.logger.info(f"Fetching: {url}", extra={'url': url})
+                with get_metrics().span('get_page', self.source_config.get('name'), url) as span:
+                    response = self.session.get(url, timeout=config.REQUEST_TIMEOUT)
+                    span['status'] = response.status_code
+                    span['bytes'] = len(response.content)
+            except requests.RequestException as e:
+                controller.record(host, None, time.monotonic() - started)
+                self.logger.warning(f"Attempt {attempt} failed for {url}: {str(e)}")
+                continue
+            
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            delay = controller.record(host, response.status_code, time.monotonic() - started, retry_after)
+            if response.status_code in RETRY_STATUSES:
+                self.logger.warning(f"Attempt {attempt} failed for {url}: HTTP {response.status_code}, "
+                                    f"next request to {host} in {max(delay, retry_after or 0):.1f}s")
+                continue
             try:
-                self.logger.info(f"Fetching: {url}")
-                response = self.session.get(url)
                 response.raise_for_status()
-                response.encoding = 'utf-8'
-                return response.text
-            except Exception as e:
-                self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
-                if attempt < 1:
-                    time.sleep(3)
+            except requests.HTTPError as e:
+                # Other 4xx errors will not go away on retry
+                self.logger.warning(f"Failed {url}: {str(e)}")
+                return None
+            response.encoding = 'utf-8'
+            return response.text
         return None
     
+    @traced
     def parse_html(self, html_content):
         """Parse HTML"""
         return BeautifulSoup(html_content, 'html.parser')
@@ -112,6 +136,7 @@ class BaseScraper(ABC):
         
         return True, "Content accepted"
     
+    @traced
     def extract_synopsis_articles(self, soup, url):
         """Main extraction router"""
         articles = []
@@ -133,6 +158,7 @@ class BaseScraper(ABC):
         self.logger.info(f"🎯 TOTAL ARTICLES FOUND: {len(articles)}")
         return articles
     
+    @traced
     def extract_testbook_schemes(self, soup, url):
         """Extract agriculture schemes from Testbook"""
         schemes = []
@@ -157,6 +183,7 @@ class BaseScraper(ABC):
         self.logger.info(f"📚 TESTBOOK RESULT: {len(schemes)} schemes extracted")
         return schemes
     
+    @traced
     def extract_testbook_scheme_sections(self, soup):
         """Extract schemes by identifying scheme sections"""
         schemes = []
@@ -216,6 +243,7 @@ class BaseScraper(ABC):
         
         return schemes
     
+    @traced
     def extract_testbook_by_headings(self, soup):
         """Extract by analyzing heading structure"""
         schemes = []
@@ -271,6 +299,7 @@ class BaseScraper(ABC):
         
         return schemes
     
+    @traced
     def extract_testbook_by_paragraphs(self, soup):
         """Extract by analyzing paragraphs"""
         schemes = []
@@ -351,6 +380,7 @@ class BaseScraper(ABC):
         return schemes
     
     # Keep existing TOI and ET methods
+    @traced
     def extract_toi_articles(self, soup, url):
         """TOI extraction using multiple methods"""
         articles = []
@@ -368,13 +398,15 @@ class BaseScraper(ABC):
                     existing_titles = {article['title'].lower() for article in articles}
                     new_articles = [a for a in method_articles if a['title'].lower() not in existing_titles]
                     articles.extend(new_articles)
-                    self.logger.info(f"✅ TOI Method {i} found {len(new_articles)} new articles")
+                    self.logger.info(f"✅ TOI Method {i} found {len(new_articles)} new articles",
+                                     extra={'sample': 'toi_method'})
             except Exception as e:
-                self.logger.debug(f"TOI Method {i} failed: {str(e)}")
+                self.logger.debug(f"TOI Method {i} failed: {str(e)}", extra={'sample': 'toi_method'})
                 continue
         
         return articles
     
+    @traced
     def extract_toi_complete_articles(self, soup, url):
         """TOI Method 1"""
         articles = []
@@ -403,6 +435,7 @@ class BaseScraper(ABC):
         
         return articles
     
+    @traced
     def extract_toi_by_paragraphs(self, soup, url):
         """TOI Method 2"""
         articles = []
@@ -436,6 +469,7 @@ class BaseScraper(ABC):
         
         return articles
     
+    @traced
     def extract_toi_by_sentences(self, soup, url):
         """TOI Method 3"""
         articles = []
@@ -464,6 +498,7 @@ class BaseScraper(ABC):
         
         return articles
     
+    @traced
     def extract_et_complete_articles(self, soup, url):
         """Economic Times extraction"""
         articles = []
@@ -493,21 +528,90 @@ class BaseScraper(ABC):
         
         return articles
     
-    def extract_keywords(self, text):
-        """Extract keywords"""
-        refined_text = self.light_refine_content(text)
-        words = refined_text.lower().split()
-        keywords = []
+    def new_frontier(self):
+        """Crawl frontier ranked by keyword relevance, with the configured host politeness"""
+        return CrawlFrontier(
+            get_relevance_scorer(),
+            min_delay=get_rate_controller().delay,
+            per_host=config.PER_HOST_CONCURRENCY
+        )
+    
+    def crawl(self, frontier, handler, limit=None):
+        """Drain a frontier with concurrent workers; handler(url, meta) returns an article or None"""
+        def safe_handler(url, meta):
+            try:
+                return handler(url, meta)
+            except Exception as e:
+                self.logger.error(f"❌ Error processing {url}: {str(e)}")
+                return None
+        
+        return frontier.drain(
+            safe_handler,
+            limit=limit or config.MAX_ARTICLES_PER_SOURCE,
+            workers=config.MAX_CONCURRENT_REQUESTS
+        )
+    
+    def find_article_links(self, soup, base_url, frontier=None):
+        """Generic link discovery: same-site links with agriculture terms in their text or URL"""
+        frontier = frontier or self.new_frontier()
+        site = urlparse(base_url).netloc.lower().replace('www.', '')
+        scorer = get_relevance_scorer()
+        
+        for link in soup.find_all('a', href=True):
+            url = canonicalize_url(link['href'], base_url)
+            if not url or site not in urlparse(url).netloc:
+                continue
+            link_text = link.get_text(" ", strip=True)
+            if scorer.score(f"{link_text} {url}").score > 0:
+                frontier.push(url, link_text)
         
-        for word in words:
-            if len(word) > 4 and word.isalpha():
-                keywords.append(word)
+        return frontier.pending()
+    
+    @traced
+    def extract_article_data(self, soup, url):
+        """Generic article page extraction: title from h1/og:title, content from paragraphs"""
+        title_elem = soup.find('h1')
+        title = title_elem.get_text() if title_elem else ''
+        if not title:
+            meta_title = soup.find('meta', property='og:title')
+            title = meta_title.get('content', '') if meta_title else ''
+        
+        paragraphs = [p.get_text(" ", strip=True) for p in soup.find_all('p')]
+        content = '\n\n'.join(p for p in paragraphs if len(p) > 20)
+        
+        return Article.from_source(self.source_config, url, self.clean_text(title), self.light_refine_content(content))
+    
+    def relevance(self, text):
+        """Weighted agriculture keyword score and per-term counts of a text"""
+        return get_relevance_scorer().score(text)
+    
+    def filter_relevant(self, articles):
+        """Keep articles whose title + content reach the source's minimum relevance score"""
+        min_score = self.source_config.get('min_relevance_score', config.MIN_RELEVANCE_SCORE)
+        if min_score <= 0:
+            return articles
+        
+        relevant = []
+        for article in articles:
+            result = self.relevance(f"{article.title} {article.content}")
+            if result.score >= min_score:
+                relevant.append(article)
+            else:
+                self.logger.debug(f"Not relevant (score {result.score}): {article.title[:60]}",
+                                  extra={'sample': 'relevance'})
         
-        return list(dict.fromkeys(keywords))[:8]
+        if len(relevant) < len(articles):
+            self.logger.info(f"🌾 Relevance filter kept {len(relevant)}/{len(articles)} articles")
+        return relevant
+    
+    @traced
+    def extract_keywords(self, text):
+        """Extract TF-IDF keywords for one text (use assign_keywords for a batch)"""
+        return get_keyword_engine().extract(text)
     
-    def rate_limit(self):
-        """Rate limiting"""
-        time.sleep(2)
+    def assign_keywords(self, articles):
+        """Set 'keywords' on all articles with one vectorized TF-IDF pass"""
+        return assign_keywords(articles)
     
     @abstractmethod
     def scrape_articles(self):
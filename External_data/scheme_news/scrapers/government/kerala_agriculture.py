@@ -6,9 +6,23 @@ from scrapers.base_scraper import BaseScraper
 class KeralaAgricultureScraper(BaseScraper):
     """Scraper for Kerala Agriculture Department website"""
     
+    def scrape_article(self, url, meta):
+        """Fetch and extract one article page queued in the frontier"""
+        article_html = self.get_page(url)
+        if not article_html:
+            return None
+        
+        article_soup = self.parse_html(article_html)
+        article_data = self.extract_article_data(article_soup, url)
+        
+        # Only add if we got meaningful content
+        if len(article_data.title) > 10 and len(article_data.content) > 50:
+            return article_data
+        return None
+    
     def scrape_articles(self):
         """Scrape articles from Kerala Agriculture Department"""
-        articles = []
+        frontier = self.new_frontier()
         
         for news_url in self.source_config['news_urls']:
             try:
@@ -19,26 +33,15 @@ class KeralaAgricultureScraper(BaseScraper):
                 
                 soup = self.parse_html(html_content)
                 
-                # Find article links
-                article_links = self.find_article_links(soup, self.source_config['base_url'])
-                
-                self.logger.info(f"Found {len(article_links)} article links")
-                
-                # Scrape each article
-                for link in article_links[:10]:  # Limit to 10 articles per run
-                    article_html = self.get_page(link)
-                    if article_html:
-                        article_soup = self.parse_html(article_html)
-                        article_data = self.extract_article_data(article_soup, link)
-                        
-                        # Only add if we got meaningful content
-                        if len(article_data['title']) > 10 and len(article_data['content']) > 50:
-                            articles.append(article_data)
-                    
-                    # Rate limiting
-                    self.rate_limit()
+                # Queue article links, best keyword score / most recent first
+                self.find_article_links(soup, self.source_config['base_url'], frontier)
                 
             except Exception as e:
                 self.logger.error(f"Error scraping {news_url}: {str(e)}")
         
-        return articles
+        self.logger.info(f"Found {len(frontier)} article links")
+        
+        # Concurrent workers drain the queue within per-host politeness limits
+        articles = self.crawl(frontier, self.scrape_article)
+        
+        return self.assign_keywords(self.filter_relevant(articles))
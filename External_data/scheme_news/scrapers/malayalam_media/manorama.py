@@ -32,11 +32,8 @@ class ManoramaScraper(BaseScraper):
                         article_data = self.extract_article_data(article_soup, link)
                         
                         # Only add if we got meaningful content
-                        if len(article_data['title']) > 10 and len(article_data['content']) > 100:
+                        if len(article_data.title) > 10 and len(article_data.content) > 100:
                             articles.append(article_data)
-                    
-                    # Rate limiting
-                    self.rate_limit()
                 
             except Exception as e:
                 self.logger.error(f"Error scraping {news_url}: {str(e)}")
@@ -2,14 +2,16 @@
 Mathrubhumi Agriculture news scraper - CORRECTED VERSION
 """
 from scrapers.base_scraper import BaseScraper
-from datetime import datetime
+from utils.metrics import traced
+from utils.relevance import get_relevance_scorer
+from utils.article import Article
 
 class MathrubhumiScraper(BaseScraper):
     """Scraper for Mathrubhumi agriculture news - extracts individual articles"""
     
-    def find_article_links(self, soup, base_url):
-        """Find individual article URLs from listing page - UPDATED SELECTORS"""
-        article_links = []
+    def find_article_links(self, soup, base_url, frontier=None):
+        """Queue individual article URLs from listing page - UPDATED SELECTORS"""
+        frontier = frontier or self.new_frontier()
         
         # Updated selectors based on actual website structure
         selectors = [
@@ -30,6 +32,10 @@ class MathrubhumiScraper(BaseScraper):
             'a[href*="dairy"]'
         ]
         
+        # One pass over the document for all selectors; the frontier dedupes canonical URLs
+        for link in soup.select(', '.join(selectors)):
+            frontier.push(link['href'], link.get_text(" ", strip=True), base_url=base_url)
+        
         # Also look for any links in agriculture sections
         agriculture_sections = soup.find_all(['div', 'section'], class_=lambda x: x and 'agriculture' in x.lower() if x else False)
         
@@ -38,38 +44,27 @@ class MathrubhumiScraper(BaseScraper):
             for link in links:
                 href = link.get('href')
                 if href and ('/news/' in href or '/agriculture/' in href):
-                    if href.startswith('/'):
-                        full_url = base_url.rstrip('/') + href
-                        if full_url not in article_links:
-                            article_links.append(full_url)
+                    frontier.push(href, link.get_text(" ", strip=True), base_url=base_url)
         
         # If no specific selectors work, try general approach
-        if not article_links:
+        if not len(frontier):
             # Look for any links that contain agriculture-related keywords in the link text
+            scorer = get_relevance_scorer()
             all_links = soup.find_all('a', href=True)
             for link in all_links:
                 href = link.get('href')
-                link_text = link.get_text().lower()
-                
-                # Check if link text contains Malayalam agriculture terms
-                agriculture_terms = ['കൃഷി', 'കർഷക', 'നെല്ല്', 'തേങ്ങ', 'റബ്ബർ', 'കാപ്പി', 'പശു', 'പാൽ']
-                english_terms = ['gac', 'fruit', 'rubber', 'farming', 'agriculture', 'coconut', 'rice', 'dairy']
+                link_text = link.get_text(" ", strip=True)
                 
-                has_agriculture_term = any(term in link_text for term in agriculture_terms + english_terms)
+                # One automaton pass over the link text for all English + Malayalam keywords
+                has_agriculture_term = scorer.score(link_text).score > 0
                 
                 if href and has_agriculture_term and ('/news/' in href or 'mathrubhumi.com' in href):
-                    if href.startswith('/'):
-                        full_url = base_url.rstrip('/') + href
-                    elif href.startswith('http'):
-                        full_url = href
-                    else:
-                        continue
-                    
-                    if full_url not in article_links and len(article_links) < 15:
-                        article_links.append(full_url)
-        
-        return article_links
+                    if href.startswith('/') or href.startswith('http'):
+                        frontier.push(href, link_text, base_url=base_url)
+        
+        return frontier.pending()
     
+    @traced
     def extract_article_content(self, soup):
         """Extract full content from individual article page"""
         content_selectors = [
@@ -111,6 +106,7 @@ class MathrubhumiScraper(BaseScraper):
         
         return self.clean_text(content)
     
+    @traced
     def extract_article_title(self, soup):
         """Extract article title"""
         title_selectors = [
@@ -148,9 +144,33 @@ class MathrubhumiScraper(BaseScraper):
         
         return "No Title"
     
+    def scrape_article(self, article_url, meta):
+        """Fetch one queued article page and build the article record"""
+        self.logger.info(f"Scraping article: {article_url}")
+        
+        # Get individual article page
+        article_html = self.get_page(article_url)
+        if not article_html:
+            return None
+        
+        article_soup = self.parse_html(article_html)
+        
+        # Extract title and content
+        title = self.extract_article_title(article_soup)
+        content = self.extract_article_content(article_soup)
+        
+        self.logger.info(f"Extracted - Title: {title[:50]}... | Content length: {len(content)}")
+        
+        if len(title) > 5 and len(content) > 50:
+            self.logger.info(f"✅ Successfully added article: {title[:50]}...")
+            return Article.from_source(self.source_config, article_url, title, content)
+        
+        self.logger.warning(f"⚠️ Insufficient content - Title len: {len(title)}, Content len: {len(content)}")
+        return None
+    
     def scrape_articles(self):
         """Scrape individual articles from Mathrubhumi agriculture section"""
-        articles = []
+        frontier = self.new_frontier()
         
         for news_url in self.source_config['news_urls']:
             try:
@@ -163,62 +183,22 @@ class MathrubhumiScraper(BaseScraper):
                 
                 soup = self.parse_html(html_content)
                 
-                # Find individual article links
-                article_links = self.find_article_links(soup, self.source_config['base_url'])
-                
-                self.logger.info(f"Found {len(article_links)} individual article links")
-                
-                # Print found links for debugging
-                for i, link in enumerate(article_links[:5], 1):
-                    self.logger.info(f"  {i}. {link}")
-                
-                # Scrape each individual article
-                for i, article_url in enumerate(article_links[:10]):  # Limit to 10 articles
-                    try:
-                        self.logger.info(f"Scraping article {i+1}/{min(10, len(article_links))}: {article_url}")
-                        
-                        # Get individual article page
-                        article_html = self.get_page(article_url)
-                        if not article_html:
-                            continue
-                        
-                        article_soup = self.parse_html(article_html)
-                        
-                        # Extract title and content
-                        title = self.extract_article_title(article_soup)
-                        content = self.extract_article_content(article_soup)
-                        
-                        self.logger.info(f"Extracted - Title: {title[:50]}... | Content length: {len(content)}")
-                        
-                        if len(title) > 5 and len(content) > 50:
-                            article_data = {
-                                'url': article_url,
-                                'source': self.source_config['name'],
-                                'category': self.source_config['category'],
-                                'language': self.source_config['language'],
-                                'scraped_at': datetime.now().isoformat(),
-                                'title': title,
-                                'content': content,
-                                'date': '',
-                                'author': '',
-                                'images': [],
-                                'keywords': self.extract_keywords(title + " " + content)
-                            }
-                            
-                            articles.append(article_data)
-                            self.logger.info(f"✅ Successfully added article: {title[:50]}...")
-                        else:
-                            self.logger.warning(f"⚠️ Insufficient content - Title len: {len(title)}, Content len: {len(content)}")
-                        
-                        # Rate limiting
-                        self.rate_limit()
-                        
-                    except Exception as e:
-                        self.logger.error(f"❌ Error processing {article_url}: {str(e)}")
-                        continue
+                # Queue individual article links
+                self.find_article_links(soup, self.source_config['base_url'], frontier)
                 
             except Exception as e:
                 self.logger.error(f"❌ Error processing listing page {news_url}: {str(e)}")
         
+        article_links = frontier.pending()
+        self.logger.info(f"Found {len(article_links)} individual article links")
+        
+        # Print highest-priority links for debugging
+        for i, link in enumerate(article_links[:5], 1):
+            self.logger.info(f"  {i}. {link}")
+        
+        # Scrape the best-ranked articles with concurrent, host-polite workers
+        articles = self.crawl(frontier, self.scrape_article)
+        
         self.logger.info(f"📊 Total articles extracted: {len(articles)}")
-        return articles
+        # Relevance filter, then keywords for all articles in one TF-IDF pass
+        return self.assign_keywords(self.filter_relevant(articles))
@@ -0,0 +1,314 @@
+"""
+Offline extraction benchmark
+
+Times parse_html, the site-specific extract_* methods, light_refine_content,
+the Article NDJSON encoder, the news.py / scheme.py record parsers and an end-to-end scrape against the
+local fixture server, using the recorded pages in tests/fixtures. Results are
+reported as pages/sec and MB/sec and compared with benchmark_baseline.json.
+
+    python -m tests.benchmark                      # run and compare
+    python -m tests.benchmark --filter toi         # only matching cases
+    python -m tests.benchmark --update-baseline    # store this run as the baseline
+    python -m tests.benchmark --record             # re-record fixtures from the live sites
+"""
+import argparse
+import importlib.util
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+SCHEME_NEWS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(SCHEME_NEWS_DIR)
+
+from config.settings import config
+from tests.fixture_server import ROUTES, FixtureServer, fixture_path, load_fixture
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+PEST_MODULE = os.path.join(os.path.dirname(SCHEME_NEWS_DIR), "pest_info", "pest.py")
+
+SOURCES = {
+    "et": {"name": "Economic Times Agriculture", "category": "business_agriculture", "language": "english"},
+    "toi": {"name": "Times of India Agriculture", "category": "news_agriculture", "language": "english"},
+    "testbook": {"name": "Testbook Agriculture Schemes", "category": "government_schemes",
+                 "language": "english", "min_relevance_score": 0},
+    "mathrubhumi": {"name": "Mathrubhumi Agriculture", "category": "malayalam_agriculture", "language": "malayalam"},
+}
+
+
+class Case:
+    """One timed operation: fn(*make_args()) over a page of `nbytes` bytes"""
+
+    def __init__(self, name, fn, make_args, nbytes, pages=1, fresh=False):
+        self.name = name
+        self.fn = fn
+        self.make_args = make_args
+        self.nbytes = nbytes
+        self.pages = pages
+        self.fresh = fresh  # fn mutates its input (e.g. decompose()), build new args per call
+
+
+def time_case(case, rounds, min_time):
+    """Best seconds per call over `rounds`, each round long enough to be measurable"""
+    shared = None if case.fresh else case.make_args()
+
+    def timed_round(calls):
+        args = [case.make_args() for _ in range(calls)] if case.fresh else [shared] * calls
+        started = time.perf_counter()
+        for call_args in args:
+            result = case.fn(*call_args)
+        return time.perf_counter() - started, result
+
+    calls = 1
+    elapsed, result = timed_round(calls)
+    while elapsed < min_time and calls < 4096:
+        calls *= 2
+        elapsed, result = timed_round(calls)
+
+    best = elapsed / calls
+    for _ in range(rounds - 1):
+        elapsed, result = timed_round(calls)
+        best = min(best, elapsed / calls)
+    items = len(result) if isinstance(result, list) else int(bool(result))
+    return best, items
+
+
+def load_pest_module():
+    spec = importlib.util.spec_from_file_location("pest", PEST_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def record_articles(articles, copies):
+    """Articles like the scrapers build from extractor output, scaled up by `copies`"""
+    from utils.article import Article
+
+    return [Article(f"{article['title']} #{i}", article['content'], "https://example.com/", "Benchmark",
+                    "news_agriculture", "english")
+            for i in range(copies) for article in articles]
+
+
+def write_records(path, articles, copies):
+    """NDJSON records file like FileManager.save_records writes, scaled up by `copies`"""
+    from utils.article import dump_ndjson
+
+    with open(path, "w", encoding="utf-8") as f:
+        dump_ndjson(record_articles(articles, copies), f)
+    return os.path.getsize(path)
+
+
+def build_cases(workdir, server):
+    from multi_source_scraper import SimpleConsolidatedScraper
+    from scrapers.malayalam_media.mathrubhumi import MathrubhumiScraper
+    import news
+    import scheme
+    from utils.article import dump_ndjson
+
+    et = SimpleConsolidatedScraper(dict(SOURCES["et"], news_urls=[]))
+    toi = SimpleConsolidatedScraper(dict(SOURCES["toi"], news_urls=[]))
+    testbook = SimpleConsolidatedScraper(dict(SOURCES["testbook"], news_urls=[]))
+    mathrubhumi = MathrubhumiScraper(dict(SOURCES["mathrubhumi"], news_urls=[]))
+    pest = load_pest_module()
+
+    pages = {name: load_fixture(name) for name, _ in ROUTES.values()}
+    size = {name: len(html.encode("utf-8")) for name, html in pages.items()}
+
+    def soup_of(scraper, name):
+        return lambda: (scraper.parse_html(pages[name]),)
+
+    def soup_url_of(scraper, name, url):
+        return lambda: (scraper.parse_html(pages[name]), url)
+
+    cases = []
+    for name in pages:
+        cases.append(Case(f"parse_html[{name[:-5]}]", et.parse_html, lambda name=name: (pages[name],), size[name]))
+
+    et_url = "https://economictimes.indiatimes.com/news/economy/agriculture"
+    toi_url = "https://timesofindia.indiatimes.com/topic/agriculture/news"
+    testbook_url = "https://testbook.com/ias-preparation/agriculture-schemes-in-india"
+    article_url = "https://www.mathrubhumi.com/agriculture/news/farming-story-0"
+
+    for method in ("extract_et_complete_articles", "extract_synopsis_articles"):
+        cases.append(Case(f"et.{method}", getattr(et, method),
+                          soup_url_of(et, "economic_times.html", et_url), size["economic_times.html"]))
+    for method in ("extract_toi_complete_articles", "extract_toi_by_paragraphs",
+                   "extract_toi_by_sentences", "extract_toi_articles"):
+        cases.append(Case(f"toi.{method}", getattr(toi, method),
+                          soup_url_of(toi, "times_of_india.html", toi_url), size["times_of_india.html"]))
+    for method in ("extract_testbook_scheme_sections", "extract_testbook_by_headings", "extract_testbook_by_paragraphs"):
+        cases.append(Case(f"testbook.{method}", getattr(testbook, method),
+                          soup_of(testbook, "testbook.html"), size["testbook.html"]))
+    cases.append(Case("testbook.extract_testbook_schemes", testbook.extract_testbook_schemes,
+                      soup_url_of(testbook, "testbook.html", testbook_url), size["testbook.html"]))
+
+    cases.append(Case("mathrubhumi.find_article_links",
+                      lambda soup: mathrubhumi.find_article_links(soup, "https://www.mathrubhumi.com/agriculture"),
+                      soup_of(mathrubhumi, "mathrubhumi_listing.html"), size["mathrubhumi_listing.html"]))
+    cases.append(Case("mathrubhumi.extract_article_content", mathrubhumi.extract_article_content,
+                      soup_of(mathrubhumi, "mathrubhumi_article.html"), size["mathrubhumi_article.html"], fresh=True))
+    cases.append(Case("mathrubhumi.extract_article_title", mathrubhumi.extract_article_title,
+                      soup_of(mathrubhumi, "mathrubhumi_article.html"), size["mathrubhumi_article.html"]))
+    cases.append(Case("mathrubhumi.extract_article_data", mathrubhumi.extract_article_data,
+                      soup_url_of(mathrubhumi, "mathrubhumi_article.html", article_url), size["mathrubhumi_article.html"]))
+
+    # NBAIR functions take raw HTML, so these include parsing
+    cases.append(Case("nbair.extract_alert_links", pest.extract_alert_links,
+                      lambda: (pages["nbair_pest_alert.html"],), size["nbair_pest_alert.html"]))
+    cases.append(Case("nbair.parse_pest_page", pest.parse_pest_page,
+                      lambda: (pages["nbair_pest_page.html"], "https://www.nbair.res.in/pest-alert/fall-armyworm"),
+                      size["nbair_pest_page.html"]))
+
+    # Post-processing on what the extractors produced
+    news_articles = (et.extract_et_complete_articles(et.parse_html(pages["economic_times.html"]), et_url) +
+                     toi.extract_toi_articles(toi.parse_html(pages["times_of_india.html"]), toi_url))
+    scheme_articles = testbook.extract_testbook_schemes(testbook.parse_html(pages["testbook.html"]), testbook_url)
+    texts = [a["content"] for a in news_articles + scheme_articles]
+    text_bytes = sum(len(t.encode("utf-8")) for t in texts)
+    cases.append(Case("light_refine_content", lambda: [et.light_refine_content(t) for t in texts],
+                      tuple, text_bytes, pages=len(texts)))
+
+    news_file = os.path.join(workdir, "news.ndjson")
+    schemes_file = os.path.join(workdir, "schemes.ndjson")
+    news_bytes = write_records(news_file, news_articles, 20)
+    scheme_bytes = write_records(schemes_file, scheme_articles, 20)
+    encoded = record_articles(news_articles, 20)
+    cases.append(Case("article.dump_ndjson", lambda: dump_ndjson(encoded, io.StringIO()), tuple,
+                      news_bytes, pages=len(encoded)))
+    cases.append(Case("news.parse_news_records", news.parse_news_records, lambda: (news_file,),
+                      news_bytes, pages=len(news_articles) * 20))
+    cases.append(Case("scheme.parse_scheme_records", scheme.parse_scheme_records, lambda: (schemes_file,),
+                      scheme_bytes, pages=len(scheme_articles) * 20))
+
+    # Fetch + parse + extract + relevance + keywords through the local server
+    live_paths = ["/economictimes/news/economy/agriculture", "/timesofindia/topic/agriculture/news",
+                  "/testbook/ias-preparation/agriculture-schemes-in-india"]
+    end_to_end = [SimpleConsolidatedScraper(dict(SOURCES[key], news_urls=[server.url(path)]))
+                  for key, path in zip(("et", "toi", "testbook"), live_paths)]
+    cases.append(Case("end_to_end.scrape_articles",
+                      lambda: [a for scraper in end_to_end for a in scraper.scrape_articles()], tuple,
+                      sum(size[ROUTES[path][0]] for path in live_paths), pages=len(live_paths)))
+    return cases
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="scheme_news_bench_")
+    # Keep the run self-contained: no pacing against the local server, no shared state files
+    config.DEFAULT_DELAY = 0
+    config.MIN_DELAY = 0
+    config.RATE_STATE_FILE = os.path.join(workdir, "rate_state.json")
+    config.KEYWORD_STATE_FILE = os.path.join(workdir, "keyword_df.json")
+    logging.disable(logging.INFO)
+
+    results = {}
+    with FixtureServer() as server:
+        for case in build_cases(workdir, server):
+            if args.filter and args.filter not in case.name:
+                continue
+            seconds, items = time_case(case, args.rounds, args.min_time)
+            results[case.name] = {
+                "seconds_per_call": seconds,
+                "pages_per_sec": case.pages / seconds,
+                "mb_per_sec": case.nbytes / seconds / 1e6,
+                "items": items,
+            }
+    return results
+
+
+def report(results, baseline, tolerance):
+    """Print the results table; returns the names of regressed cases"""
+    regressions = []
+    print(f"\n{'case':<48} {'pages/s':>10} {'MB/s':>8} {'items':>6} {'vs base':>9}")
+    print("-" * 85)
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = ""
+        if base:
+            ratio = result["pages_per_sec"] / base["pages_per_sec"]
+            change = f"{(ratio - 1) * 100:+.1f}%"
+            if ratio < 1 - tolerance:
+                regressions.append(name)
+                change += " ⚠️"
+        print(f"{name:<48} {result['pages_per_sec']:>10.1f} {result['mb_per_sec']:>8.2f} "
+              f"{result['items']:>6} {change:>9}")
+    return regressions
+
+
+def record_fixtures():
+    """Overwrite the fixtures with fresh copies of the live pages"""
+    import requests
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": config.USER_AGENTS[0]})
+    for name, url in ROUTES.values():
+        if not url:
+            continue
+        try:
+            response = session.get(url, timeout=config.REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"❌ {name}: {e}")
+            continue
+        response.encoding = "utf-8"
+        with open(fixture_path(name), "w", encoding="utf-8") as f:
+            f.write(response.text)
+        print(f"✅ {name}: {len(response.content):,} bytes from {url}")
+    print("⚠️  NBAIR renders its list with JavaScript; check nbair_pest_alert.html still has rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper extraction benchmark")
+    parser.add_argument("--rounds", type=int, default=5, help="timed rounds per case (best is kept)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per round")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed pages/sec drop vs baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if a case regressed")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--record", action="store_true", help="re-record fixtures from the live sites")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+        return 0
+
+    print(f"⏱️  Benchmarking extraction on recorded fixtures ({args.rounds} rounds)...")
+    results = run(args)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    regressions = report(results, baseline, args.tolerance)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": {name: {k: round(v, 6) if isinstance(v, float) else v for k, v in result.items()}
+                            for name, result in results.items()}
+            }, f, indent=2)
+        print(f"\n💾 Baseline saved to {BASELINE_FILE}")
+    elif not baseline:
+        print("\nℹ️  No baseline yet, run with --update-baseline to store one")
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: "
+              + ", ".join(regressions))
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
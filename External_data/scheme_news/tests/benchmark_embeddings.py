@@ -0,0 +1,121 @@
+"""
+Embedding index benchmark
+
+Times the IVF index of utils/embeddings.py on synthetic clustered unit
+vectors (the sentence model is not needed): incremental adds, training,
+save/load, and query latency p50 / p95 with recall@10 against exact search.
+With --model, the sentence encoder is timed too, on the titles and text of
+the recorded fixture pages.
+
+    python -m tests.benchmark_embeddings
+    python -m tests.benchmark_embeddings --items 200000 --nprobe 16
+    python -m tests.benchmark_embeddings --model
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+SCHEME_NEWS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(SCHEME_NEWS_DIR)
+
+import numpy as np
+
+from utils.embeddings import EmbeddingIndex, normalize
+
+
+def clustered_vectors(count, dim, clusters, seed=3):
+    """Unit vectors scattered around random topic directions, like news about the same few subjects"""
+    rng = np.random.default_rng(seed)
+    topics = normalize(rng.standard_normal((clusters, dim)))
+    return normalize(topics[rng.integers(clusters, size=count)] + rng.standard_normal((count, dim)) / np.sqrt(dim))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_index(args):
+    vectors = clustered_vectors(args.items + args.queries, args.dim, args.topics)
+    items, queries = vectors[:args.items], vectors[args.items:]
+    index = EmbeddingIndex("synthetic", args.dim, nprobe=args.nprobe)
+
+    started = time.perf_counter()
+    for start in range(0, args.items, args.batch):
+        chunk = items[start:start + args.batch]
+        rows = range(start, start + len(chunk))
+        index.add_vectors(chunk, [f"{row:016x}" for row in rows], ["news"] * len(chunk),
+                          [f"item {row}" for row in rows], [row for row in rows])
+    seconds = time.perf_counter() - started
+    print(f"   add + train        {seconds:8.2f}s  {args.items / seconds:10.0f} vectors/s"
+          f"  ({len(index.centroids) if index.centroids is not None else 0} lists)")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "embeddings.npz")
+        started = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        index = EmbeddingIndex.load(path)
+        loaded = time.perf_counter() - started
+        print(f"   save / load        {saved:8.2f}s / {loaded:.2f}s  ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+    latencies, exact_latencies, recall = [], [], []
+    for query in queries:
+        started = time.perf_counter()
+        hits = index.search_vector(query, limit=10)
+        latencies.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        exact = np.argpartition(-(index.vectors @ query), 9)[:10]
+        exact_latencies.append(time.perf_counter() - started)
+        recall.append(len({int(hit.key, 16) for hit in hits} & set(exact.tolist())) / 10)
+    print(f"   ann query          p50 {statistics.median(latencies) * 1000:7.2f} ms"
+          f"   p95 {percentile(latencies, 0.95) * 1000:7.2f} ms   recall@10 {statistics.mean(recall):.3f}")
+    print(f"   exact query        p50 {statistics.median(exact_latencies) * 1000:7.2f} ms"
+          f"   p95 {percentile(exact_latencies, 0.95) * 1000:7.2f} ms")
+
+
+def bench_model(args):
+    from bs4 import BeautifulSoup
+
+    from config.settings import config
+    from tests.fixture_server import ROUTES, load_fixture
+    from utils.embeddings import SentenceEncoder
+
+    texts = []
+    for name in {fixture for fixture, _ in ROUTES.values()}:
+        soup = BeautifulSoup(load_fixture(name), "html.parser")
+        texts.extend(p.get_text(" ", strip=True) for p in soup.find_all(["h1", "h2", "h3", "p"]))
+    texts = [text for text in texts if len(text) > 20][:256]
+    encoder = SentenceEncoder(config.EMBEDDING_MODEL)
+    started = time.perf_counter()
+    encoder.encode(texts[:1])
+    print(f"   model load         {time.perf_counter() - started:8.2f}s  {config.EMBEDDING_MODEL}")
+    started = time.perf_counter()
+    encoder.encode(texts, batch_size=config.EMBEDDING_BATCH_SIZE)
+    seconds = time.perf_counter() - started
+    print(f"   encode             {seconds:8.2f}s  {len(texts) / seconds:10.1f} texts/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding index benchmark")
+    parser.add_argument("--items", type=int, default=50000, help="indexed vectors")
+    parser.add_argument("--dim", type=int, default=384, help="vector size (384 for MiniLM models)")
+    parser.add_argument("--topics", type=int, default=200, help="clusters in the synthetic data")
+    parser.add_argument("--batch", type=int, default=1000, help="vectors per add")
+    parser.add_argument("--queries", type=int, default=200, help="timed queries")
+    parser.add_argument("--nprobe", type=int, default=8, help="IVF lists searched per query")
+    parser.add_argument("--model", action="store_true", help="also time the sentence encoder (needs transformers)")
+    args = parser.parse_args()
+
+    print(f"🧭 Embedding index benchmark: {args.items} x {args.dim} vectors, nprobe {args.nprobe}")
+    bench_index(args)
+    if args.model:
+        bench_model(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Search index benchmark
+
+Builds a synthetic corpus from the words of the recorded fixture pages
+(English and Malayalam), then times indexing, an incremental catch-up with an
+archive, save/load and query latency (p50 / p95) for English and Malayalam
+queries.
+
+    python -m tests.benchmark_search
+    python -m tests.benchmark_search --docs 50000 --queries 500
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+SCHEME_NEWS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(SCHEME_NEWS_DIR)
+
+from bs4 import BeautifulSoup
+
+from tests.fixture_server import ROUTES, load_fixture
+from utils.archive import ArticleArchive
+from utils.article import Article
+from utils.search import SearchIndex
+
+QUERIES = ["coconut subsidy", "paddy insurance", "pest attack", "kisan scheme", "rubber price",
+           "നെല്ല് ഇൻഷുറൻസ്", "തെങ്ങ് കർഷകർ", "കൃഷി വകുപ്പ്"]
+
+
+def fixture_words():
+    """(english words, malayalam words) seen in the fixture pages"""
+    text = " ".join(BeautifulSoup(load_fixture(name), "html.parser").get_text(" ")
+                    for name in {fixture for fixture, _ in ROUTES.values()})
+    english = re.findall(r"[a-z]{3,}", text.lower())
+    malayalam = re.findall("[\u0d00-\u0d7f]{2,}", text)
+    return english or ["farm"], malayalam or ["കൃഷി"]
+
+
+def synthetic_corpus(count, seed=7):
+    random.seed(seed)
+    english, malayalam = fixture_words()
+    base = int(time.time()) - count * 60
+    articles = []
+    for i in range(count):
+        words = malayalam if i % 4 == 0 else english
+        title = " ".join(random.choices(words, k=8))
+        content = " ".join(random.choices(words, k=random.randint(80, 300)))
+        articles.append(Article(title, content, f"https://example.org/{i}", "Bench", "news_agriculture",
+                                "malayalam" if i % 4 == 0 else "english", base + i * 60,
+                                random.sample(words, k=min(3, len(words)))))
+    return articles
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search index benchmark")
+    parser.add_argument("--docs", type=int, default=20000, help="synthetic documents to index")
+    parser.add_argument("--queries", type=int, default=200, help="timed queries")
+    parser.add_argument("--batch", type=int, default=500, help="records appended for the incremental update")
+    args = parser.parse_args()
+
+    articles = synthetic_corpus(args.docs + args.batch)
+    corpus, batch = articles[:args.docs], articles[args.docs:]
+    print(f"🔎 Search benchmark: {len(corpus)} documents, {args.queries} queries")
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    for i, article in enumerate(corpus):
+        index.add(article, "schemes" if i % 5 == 0 else "news")
+    seconds = time.perf_counter() - started
+    print(f"   build              {seconds:8.2f}s  {len(corpus) / seconds:10.0f} docs/s  {len(index.postings)} terms")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        archive = ArticleArchive(os.path.join(workdir, "archive"))
+        archive.append(corpus, "news")
+        index.archive_position = len(archive)
+        archive.append(batch, "news")
+        started = time.perf_counter()
+        added = index.update_from_archive(archive)
+        seconds = time.perf_counter() - started
+        print(f"   incremental update {seconds:8.2f}s  {added / seconds:10.0f} docs/s  ({added} new records)")
+
+        path = os.path.join(workdir, "search_index.npz")
+        started = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        index = SearchIndex.load(path)
+        loaded = time.perf_counter() - started
+        print(f"   save / load        {saved:8.2f}s / {loaded:.2f}s  ({os.path.getsize(path) / 1e6:.1f} MB)")
+        archive.close()
+
+    for label, queries in (("english", QUERIES[:5]), ("malayalam", QUERIES[5:])):
+        latencies = []
+        for i in range(args.queries):
+            started = time.perf_counter()
+            index.search(queries[i % len(queries)], limit=10)
+            latencies.append(time.perf_counter() - started)
+        print(f"   query {label:<12} p50 {statistics.median(latencies) * 1000:7.2f} ms"
+              f"   p95 {percentile(latencies, 0.95) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+CLI startup benchmark
+
+Runs each entry point in a fresh interpreter several times and reports the
+median wall time plus the heavy modules it pulled in. Quick commands
+(--help, list, importing news.py / scheme.py) must stay under the budget and
+must not import any heavy module.
+
+    python -m tests.benchmark_startup
+    python -m tests.benchmark_startup --runs 10 --budget 0.5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCHEME_NEWS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("bs4", "requests", "numpy", "scipy", "transformers", "torch", "couchbase", "playwright")
+
+# name -> (script or module, argv, quick)
+COMMANDS = {
+    "main.py --help": ("main.py", ["--help"], True),
+    "main.py list": ("main.py", ["list"], True),
+    "import news": ("news", None, True),
+    "import scheme": ("scheme", None, True),
+    "import multi_source_scraper": ("multi_source_scraper", None, False),
+}
+
+_PROBE = """
+import json, runpy, sys
+target, argv = {target!r}, {argv!r}
+sys.path.insert(0, {root!r})
+try:
+    if argv is None:
+        __import__(target)
+    else:
+        sys.argv = [target] + argv
+        runpy.run_path(target, run_name="__main__")
+except SystemExit:
+    pass
+sys.stdout.flush()
+sys.stderr.write("@@HEAVY@@" + json.dumps([m for m in {heavy!r} if m in sys.modules]) + "\\n")
+"""
+
+
+def probe(target, argv):
+    """(seconds, heavy modules loaded) for one fresh-interpreter run"""
+    code = _PROBE.format(target=target, argv=argv, root=SCHEME_NEWS_DIR, heavy=HEAVY_MODULES)
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", code], cwd=SCHEME_NEWS_DIR,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - started
+    heavy = []
+    for line in completed.stderr.splitlines():
+        if line.startswith("@@HEAVY@@"):
+            heavy = json.loads(line[len("@@HEAVY@@"):])
+    return elapsed, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per command")
+    parser.add_argument("--budget", type=float, default=1.0, help="max median seconds for quick commands")
+    args = parser.parse_args()
+
+    baseline, _ = probe("sys", None)  # bare interpreter start, for reference
+    print(f"⏱️  Interpreter start: {baseline * 1000:.0f} ms\n")
+    print(f"{'command':<32} {'median ms':>10} {'max ms':>8}  heavy modules")
+    print("-" * 80)
+
+    failures = []
+    for name, (target, argv, quick) in COMMANDS.items():
+        times, heavy = [], []
+        for _ in range(max(1, args.runs)):
+            elapsed, heavy = probe(target, argv)
+            times.append(elapsed)
+        median = statistics.median(times)
+        print(f"{name:<32} {median * 1000:>10.0f} {max(times) * 1000:>8.0f}  {', '.join(heavy) or '-'}")
+        if quick and (median > args.budget or heavy):
+            failures.append(name)
+
+    if failures:
+        print(f"\n❌ Over budget ({args.budget:.1f}s) or importing heavy modules: {', '.join(failures)}")
+        return 1
+    print(f"\n✅ Quick commands start under {args.budget:.1f}s without heavy imports")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
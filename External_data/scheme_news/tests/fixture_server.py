@@ -0,0 +1,81 @@
+"""
+Local HTTP stand-in for the scraped sites
+
+Serves the recorded pages in tests/fixtures under paths that keep the
+site names the extraction router looks for ('timesofindia', 'testbook'),
+so SimpleConsolidatedScraper can run end to end without network access.
+"""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# path -> (fixture file, live URL it was recorded from)
+ROUTES = {
+    "/economictimes/news/economy/agriculture": (
+        "economic_times.html", "https://economictimes.indiatimes.com/news/economy/agriculture?from=mdr"),
+    "/timesofindia/topic/agriculture/news": (
+        "times_of_india.html", "https://timesofindia.indiatimes.com/topic/agriculture/news"),
+    "/testbook/ias-preparation/agriculture-schemes-in-india": (
+        "testbook.html", "https://testbook.com/ias-preparation/agriculture-schemes-in-india"),
+    "/mathrubhumi/agriculture": (
+        "mathrubhumi_listing.html", "https://www.mathrubhumi.com/agriculture"),
+    "/mathrubhumi/agriculture/news/farming-story-0": (
+        "mathrubhumi_article.html", None),
+    "/nbair/pest-alert": (
+        "nbair_pest_alert.html", "https://www.nbair.res.in/pest-alert"),
+    "/nbair/pest-alert/fall-armyworm": (
+        "nbair_pest_page.html", "https://www.nbair.res.in/pest-alert/fall-armyworm"),
+}
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURES_DIR, name)
+
+
+def load_fixture(name):
+    with open(fixture_path(name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        route = ROUTES.get(self.path.split("?", 1)[0].rstrip("/"))
+        if route is None:
+            self.send_error(404)
+            return
+        with open(fixture_path(route[0]), "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Threaded HTTP server on a free local port; use as a context manager"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.httpd = ThreadingHTTPServer((host, port), _FixtureHandler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,277 @@
+"""
+Append-only article archive - compressed blocks + memory-mapped offset index
+
+Every published batch of news and schemes is appended to output2/archive/:
+
+    articles.blocks   compressed blocks of NDJSON Article records
+    articles.idx      one fixed-size entry per record: article ID, scraped_at,
+                      kind, block offset and position within the block
+
+Blocks are zstd-compressed when the zstandard package is installed and
+zlib-compressed otherwise; the codec is stored in each block header, so an
+archive written with either can be read back. The index is memory-mapped as
+a NumPy structured array: lookup by ID and range scans by date are binary
+searches over sorted views of it, and only the blocks holding matching
+records are read and decompressed.
+
+Articles already archived (same Article.key) are not appended again. One
+process appends at a time (the scraper or scheduler.py); readers may open
+the archive while it grows - the index is written after its block, so an
+entry never points at a block that is not on disk yet.
+"""
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.article import Article, to_timestamp
+
+try:
+    import zstandard
+except ImportError:  # zlib blocks only
+    zstandard = None
+
+KINDS = ('news', 'schemes')
+
+CODEC_ZLIB = 0
+CODEC_ZSTD = 1
+
+BLOCK_MAGIC = b'ARCB'
+# magic, codec, compressed size, raw size, crc32 of the compressed bytes
+BLOCK_HEADER = struct.Struct('<4sBIII')
+
+INDEX_DTYPE = np.dtype([
+    ('id', '<u8'),
+    ('scraped_at', '<i8'),
+    ('offset', '<u8'),
+    ('slot', '<u4'),
+    ('kind', 'u1'),
+    ('_pad', 'V3'),
+])
+
+
+def compress(payload):
+    """(codec, compressed bytes) with the best available codec"""
+    if zstandard is not None:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=3).compress(payload)
+    return CODEC_ZLIB, zlib.compress(payload, 6)
+
+
+def decompress(codec, data):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("archive block is zstd-compressed: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown archive codec {codec}")
+
+
+def key_to_id(key):
+    """Article.key (16 hex digits) -> uint64 index ID"""
+    return int(key, 16)
+
+
+class ArticleArchive:
+    """Append-only archive of every scraped article and scheme"""
+
+    def __init__(self, directory="output2/archive", cache_blocks=16):
+        self.directory = directory
+        self.blocks_path = os.path.join(directory, "articles.blocks")
+        self.index_path = os.path.join(directory, "articles.idx")
+        os.makedirs(directory, exist_ok=True)
+        self.cache_blocks = cache_blocks
+        self._lock = threading.RLock()
+        self._index = None
+        self._by_id = None
+        self._by_date = None
+        self._blocks_map = None
+        self._block_cache = OrderedDict()
+
+    def _entries(self):
+        """Memory-mapped index entries (re-mapped when another process appended)"""
+        with self._lock:
+            size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+            count = size // INDEX_DTYPE.itemsize  # a torn trailing entry is ignored
+            if self._index is None or len(self._index) != count:
+                self._index = (np.memmap(self.index_path, dtype=INDEX_DTYPE, mode='r', shape=(count,))
+                               if count else np.empty(0, dtype=INDEX_DTYPE))
+                self._by_id = self._by_date = None
+            return self._index
+
+    def _sorted_by(self, field):
+        """(entries, order, entries[field][order]); built once per index size"""
+        entries = self._entries()
+        with self._lock:
+            cached = self._by_id if field == 'id' else self._by_date
+            if cached is None:
+                order = np.argsort(entries[field], kind='stable')
+                cached = (order, np.ascontiguousarray(entries[field][order]))
+                if field == 'id':
+                    self._by_id = cached
+                else:
+                    self._by_date = cached
+            return (entries,) + cached
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key):
+        return self._find(key_to_id(key)) is not None
+
+    def _find(self, article_id):
+        entries, order, ids = self._sorted_by('id')
+        position = np.searchsorted(ids, np.uint64(article_id))
+        if position < len(ids) and ids[position] == article_id:
+            return entries[order[position]]
+        return None
+
+    def _read_block(self, offset):
+        """Decompressed records of the block at offset, as JSON lines (LRU-cached)"""
+        with self._lock:
+            lines = self._block_cache.get(offset)
+            if lines is not None:
+                self._block_cache.move_to_end(offset)
+                return lines
+
+            end = offset + BLOCK_HEADER.size
+            blocks = self._map_blocks(end)
+            magic, codec, compressed_size, raw_size, crc = BLOCK_HEADER.unpack_from(blocks, offset)
+            if magic != BLOCK_MAGIC:
+                raise ValueError(f"Corrupt archive: no block at offset {offset}")
+            data = self._map_blocks(end + compressed_size)[end:end + compressed_size]
+            if zlib.crc32(data) != crc:
+                raise ValueError(f"Corrupt archive: checksum mismatch in block at offset {offset}")
+            raw = decompress(codec, data)
+            if len(raw) != raw_size:
+                raise ValueError(f"Corrupt archive: block at offset {offset} has the wrong size")
+
+            lines = raw.decode('utf-8').splitlines()
+            self._block_cache[offset] = lines
+            if len(self._block_cache) > self.cache_blocks:
+                self._block_cache.popitem(last=False)
+            return lines
+
+    def _map_blocks(self, min_size):
+        """Read-only map of the blocks file covering at least min_size bytes"""
+        if self._blocks_map is None or len(self._blocks_map) < min_size:
+            if self._blocks_map is not None:
+                self._blocks_map.close()
+            with open(self.blocks_path, 'rb') as f:
+                self._blocks_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._blocks_map
+
+    def _load(self, entry):
+        return Article.from_json(self._read_block(int(entry['offset']))[int(entry['slot'])])
+
+    def append(self, articles, kind):
+        """Archive articles not seen before as one block; returns how many were added"""
+        kind_code = KINDS.index(kind)
+        with self._lock:
+            entries = self._entries()
+            fresh, seen = [], set()
+            for article in articles:
+                key = article.key
+                if key not in seen:
+                    seen.add(key)
+                    fresh.append(article)
+            if not fresh:
+                return 0
+            ids = np.fromiter((key_to_id(article.key) for article in fresh), dtype=np.uint64, count=len(fresh))
+            keep = ~np.isin(ids, entries['id'])
+            fresh = [article for article, new in zip(fresh, keep) if new]
+            ids = ids[keep]
+            if not fresh:
+                return 0
+
+            payload = "".join(article.to_json() + "\n" for article in fresh).encode('utf-8')
+            codec, data = compress(payload)
+            header = BLOCK_HEADER.pack(BLOCK_MAGIC, codec, len(data), len(payload), zlib.crc32(data))
+            with open(self.blocks_path, 'ab') as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.write(header)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            rows = np.zeros(len(fresh), dtype=INDEX_DTYPE)
+            rows['id'] = ids
+            rows['scraped_at'] = [article.scraped_at for article in fresh]
+            rows['offset'] = offset
+            rows['slot'] = np.arange(len(fresh), dtype=np.uint32)
+            rows['kind'] = kind_code
+            with open(self.index_path, 'ab') as f:
+                # Drop a torn entry left by an interrupted append before adding ours
+                f.truncate(len(entries) * INDEX_DTYPE.itemsize)
+                f.write(rows.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            self._index = None
+            return len(fresh)
+
+    def get(self, key):
+        """Article by its Article.key, or None"""
+        entry = self._find(key_to_id(key))
+        return None if entry is None else self._load(entry)
+
+    def range(self, start=None, end=None, kind=None, limit=None):
+        """Articles with start <= scraped_at < end (dates, datetimes, ISO strings or Unix seconds), oldest first"""
+        entries, order, dates = self._sorted_by('scraped_at')
+        low = 0 if start is None else np.searchsorted(dates, to_timestamp(start), side='left')
+        high = len(dates) if end is None else np.searchsorted(dates, to_timestamp(end), side='left')
+        selected = entries[order[low:high]]
+        if kind is not None:
+            selected = selected[selected['kind'] == KINDS.index(kind)]
+        if limit is not None:
+            selected = selected[:limit]
+        for entry in selected:
+            yield self._load(entry)
+
+    def scan(self, start=0):
+        """(position, article, kind) for every record from position `start`, in append order"""
+        entries = self._entries()
+        for position in range(start, len(entries)):
+            entry = entries[position]
+            yield position, self._load(entry), KINDS[entry['kind']]
+
+    def stats(self):
+        """Record counts per kind, date span and on-disk sizes"""
+        entries = self._entries()
+        blocks_size = os.path.getsize(self.blocks_path) if os.path.exists(self.blocks_path) else 0
+        counts = np.bincount(entries['kind'], minlength=len(KINDS)) if len(entries) else [0] * len(KINDS)
+        return {
+            'records': len(entries),
+            **{kind: int(count) for kind, count in zip(KINDS, counts)},
+            'blocks': len(np.unique(entries['offset'])) if len(entries) else 0,
+            'first': int(entries['scraped_at'].min()) if len(entries) else None,
+            'last': int(entries['scraped_at'].max()) if len(entries) else None,
+            'blocks_bytes': blocks_size,
+            'index_bytes': len(entries) * INDEX_DTYPE.itemsize,
+            'codec': 'zstd' if zstandard is not None else 'zlib'
+        }
+
+    def close(self):
+        with self._lock:
+            if self._blocks_map is not None:
+                self._blocks_map.close()
+                self._blocks_map = None
+            self._index = self._by_id = self._by_date = None
+            self._block_cache.clear()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """Process-wide archive in Config.ARCHIVE_DIR"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            from config.settings import config
+            _archive = ArticleArchive(config.ARCHIVE_DIR)
+        return _archive
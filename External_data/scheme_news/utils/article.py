@@ -0,0 +1,133 @@
+"""
+Article record shared by the scrapers, FileManager and the post-processors
+
+Article is a __slots__ class instead of a dict: no per-instance __dict__, the
+repeated source/category/language strings are interned (one copy per
+source, however many articles are kept) and scraped_at is Unix seconds.
+
+NDJSON codec: to_json() / from_json() for one line, dump_ndjson() /
+iter_ndjson() for files. Records carry RECORD_SCHEMA_VERSION and exactly
+RECORD_FIELDS; version 1 records (ISO scraped_at strings) are still read.
+"""
+import hashlib
+import json
+import sys
+import time
+from datetime import date, datetime
+
+# Stable record schema for the NDJSON outputs; bump the version on breaking changes
+# (2: scraped_at is Unix seconds instead of an ISO string)
+RECORD_SCHEMA_VERSION = 2
+RECORD_FIELDS = ('source', 'url', 'category', 'language', 'scraped_at', 'title', 'content', 'keywords')
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+_decode = json.JSONDecoder().decode
+
+
+def to_timestamp(value):
+    """Unix seconds from an int, a float, an ISO string (schema 1), a date/datetime or None (now)"""
+    if value is None or value == '':
+        return int(time.time())
+    if isinstance(value, str):
+        return int(datetime.fromisoformat(value).timestamp())
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime.combine(value, datetime.min.time()).timestamp())
+    return int(value)
+
+
+class Article:
+    """One scraped article or scheme"""
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, title, content, url='', source='', category='', language='', scraped_at=None, keywords=None):
+        self.title = title
+        self.content = content
+        self.url = url
+        self.source = sys.intern(source)
+        self.category = sys.intern(category)
+        self.language = sys.intern(language)
+        self.scraped_at = to_timestamp(scraped_at)
+        self.keywords = keywords if keywords is not None else []
+
+    @classmethod
+    def from_source(cls, source_config, url, title, content):
+        """New article stamped with the source's name/category/language and the current time"""
+        return cls(title, content, url, source_config['name'], source_config['category'], source_config['language'])
+
+    @property
+    def key(self):
+        """Stable 16-hex-digit ID from URL + title (dedup index and archive key)"""
+        return hashlib.sha1(f"{self.url}|{self.title}".encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def scraped_at_iso(self):
+        return datetime.fromtimestamp(self.scraped_at).isoformat()
+
+    def to_record(self):
+        """Plain dict in record order, with the schema version"""
+        return {
+            'schema_version': RECORD_SCHEMA_VERSION,
+            'source': self.source,
+            'url': self.url,
+            'category': self.category,
+            'language': self.language,
+            'scraped_at': self.scraped_at,
+            'title': self.title,
+            'content': self.content,
+            'keywords': self.keywords
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        # Skips __init__: this is the hot path when reading archived records
+        get = record.get
+        article = cls.__new__(cls)
+        article.title = get('title', '')
+        article.content = get('content', '')
+        article.url = get('url', '')
+        article.source = sys.intern(get('source', ''))
+        article.category = sys.intern(get('category', ''))
+        article.language = sys.intern(get('language', ''))
+        scraped_at = get('scraped_at')
+        article.scraped_at = scraped_at if type(scraped_at) is int else to_timestamp(scraped_at)
+        article.keywords = get('keywords') or []
+        return article
+
+    def to_json(self):
+        """One compact JSON line (no trailing newline)"""
+        return _encode(self.to_record())
+
+    @classmethod
+    def from_json(cls, line):
+        return cls.from_record(_decode(line))
+
+    def __reduce__(self):
+        # Unpickled articles (parse pool results) go through __init__ and get interned again
+        return (Article, (self.title, self.content, self.url, self.source, self.category,
+                          self.language, self.scraped_at, self.keywords))
+
+    def __eq__(self, other):
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in RECORD_FIELDS)
+
+    def __repr__(self):
+        return f"Article(source={self.source!r}, title={self.title[:40]!r}, url={self.url!r})"
+
+
+def dump_ndjson(articles, f):
+    """Write one JSON line per article to an open text file; returns the count"""
+    lines = [article.to_json() + "\n" for article in articles]
+    f.writelines(lines)
+    return len(lines)
+
+
+def iter_ndjson(filename):
+    """Stream Articles from an NDJSON file"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield Article.from_json(line)
@@ -0,0 +1,186 @@
+"""
+Near-duplicate article detection with MinHash + LSH banding
+
+ET and TOI often carry the same PTI/Reuters story with small edits, and the
+three TOI extraction methods produce overlapping windows. Exact title dedup
+misses both. Each article is reduced to a MinHash signature of its word
+shingles (title + content); signatures are split into bands and only
+articles sharing a band bucket are compared, so lookups stay close to
+constant time as the archive grows.
+
+A scrape drops near-duplicates within its own batch with a fresh index
+(filter). The saved index (news.py) also keeps the classifier scores of
+the stories in the current news.ndjson, so a story already classified in
+an earlier run, or a near-identical copy of it, is not classified again
+(cached_scores / remember) while still being published. Stories that left
+news.ndjson are dropped from it (retain), so its size follows the
+published records instead of every story ever seen.
+"""
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+
+from utils.file_manager import atomic_open
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def shingles(text, size=3):
+    """Set of hashed word n-grams of a text (falls back to single words for short texts)"""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < size:
+        return {_hash64(w) for w in words}
+    return {_hash64(" ".join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of article signatures, saved to path when one is given"""
+
+    def __init__(self, path=None, num_perm=64, bands=16, shingle_size=3, threshold=0.8):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        # Fixed seed so signatures stay comparable across runs
+        seeds = [_hash64(f"minhash-{i}") for i in range(2 * num_perm)]
+        self._perms = [(seeds[2 * i] % (_MERSENNE_PRIME - 1) + 1, seeds[2 * i + 1] % _MERSENNE_PRIME)
+                       for i in range(num_perm)]
+
+        self.signatures = {}
+        self.buckets = [{} for _ in range(bands)]
+        self.scores = {}  # key -> classifier scores
+        if path:
+            self.load()
+
+    @staticmethod
+    def article_key(article):
+        """Stable ID of an article"""
+        return article.key
+
+    def signature(self, text):
+        """MinHash signature of a text"""
+        values = shingles(text, self.shingle_size)
+        if not values:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min(((a * v + b) % _MERSENNE_PRIME) & _MAX_HASH for v in values)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def query(self, signature):
+        """(key, similarity) of the best indexed match at or above the threshold, else None"""
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(band_key, ()))
+
+        best = None
+        for key in candidates:
+            score = self.similarity(signature, self.signatures[key])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+    def add(self, key, signature):
+        """Index a signature under key"""
+        if key in self.signatures:
+            return
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self.buckets[band].setdefault(band_key, []).append(key)
+
+    def filter(self, articles):
+        """Split articles into (unique, duplicates); unique ones are added to the index
+
+        Duplicates are (article, key of the indexed match, similarity) tuples.
+        """
+        unique, duplicates = [], []
+        for article in articles:
+            key = self.article_key(article)
+            if key in self.signatures:  # the same article twice in the batch
+                duplicates.append((article, key, 1.0))
+                continue
+            signature = self.signature(f"{article.title} {article.content}")
+            match = self.query(signature)
+            if match:
+                duplicates.append((article, match[0], round(match[1], 3)))
+                continue
+            self.add(key, signature)
+            unique.append(article)
+        return unique, duplicates
+
+    def cached_scores(self, key, text):
+        """(scores, signature): classifier scores saved for this article or a near-duplicate, else (None, signature)
+
+        An exact key hit is the article itself, seen in an earlier run; its
+        signature is not computed again (None).
+        """
+        if key in self.scores:
+            return self.scores[key], None
+        signature = self.signature(text)
+        match = self.query(signature)
+        return (self.scores.get(match[0]) if match else None), signature
+
+    def remember(self, key, signature, scores):
+        """Index an article (signature from cached_scores) with its classifier scores"""
+        if signature is not None:
+            self.add(key, signature)
+        self.scores[key] = scores
+
+    def retain(self, keys):
+        """Drop every indexed article whose key is not in keys"""
+        keys = set(keys)
+        signatures = {key: signature for key, signature in self.signatures.items() if key in keys}
+        self.scores = {key: scores for key, scores in self.scores.items() if key in keys}
+        if len(signatures) == len(self.signatures):
+            return
+        self.signatures = {}
+        self.buckets = [{} for _ in range(self.bands)]
+        for key, signature in signatures.items():
+            self.add(key, signature)
+
+    def load(self):
+        """Load signatures saved by a previous run (ignored if parameters changed)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("num_perm") != self.num_perm or data.get("shingle_size") != self.shingle_size:
+            return
+        for key, signature in data.get("signatures", {}).items():
+            self.add(key, tuple(signature))
+        self.scores.update(data.get("scores", {}))
+
+    def save(self):
+        """Persist signatures for the next run"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with atomic_open(self.path) as f:
+            json.dump({
+                "num_perm": self.num_perm,
+                "shingle_size": self.shingle_size,
+                "saved_at": datetime.now().isoformat(),
+                "signatures": {key: list(sig) for key, sig in self.signatures.items()},
+                "scores": self.scores
+            }, f)
@@ -0,0 +1,330 @@
+"""
+Semantic similarity over archived news and schemes - sentence embeddings + IVF
+
+Keyword search misses paraphrases ("crop insurance" vs "Pradhan Mantri Fasal
+Bima Yojana"). Every archived record is embedded with a small multilingual
+sentence model on the CPU (Config.EMBEDDING_MODEL, mean-pooled, loaded
+lazily like the news.py classifier) in batches, and stored as an L2-normalized
+float32 row, so cosine similarity is a dot product.
+
+Vectors are cached by content hash: a record whose title + content was
+embedded before (the same scheme scraped from a new URL) reuses that vector
+instead of running the model again. Like the BM25 index, the embedding index
+follows the archive and only embeds the records appended since its last
+update.
+
+Approximate nearest neighbours: once there are ANN_MIN_ITEMS vectors, a
+spherical k-means splits them into ~4*sqrt(n) lists (IVF). A query is compared
+with the centroids, then only with the vectors of the `nprobe` closest lists.
+New vectors join the list of their nearest centroid; the centroids are
+retrained when the index has doubled since the last training. Smaller
+indexes are searched exactly.
+"""
+import hashlib
+import json
+import threading
+from array import array
+
+import numpy as np
+
+from utils.file_manager import atomic_open
+from utils.search import KINDS, SearchHit
+
+ANN_MIN_ITEMS = 2048
+
+
+def content_hash(title, content):
+    """16-byte hash of the embedded text"""
+    return hashlib.blake2b(f"{title}\n{content}".encode("utf-8"), digest_size=16).digest()
+
+
+def embedding_text(article, max_chars=2000):
+    """What is embedded for an Article: title and the start of the content"""
+    return f"{article.title}\n{article.content[:max_chars]}"
+
+
+class SentenceEncoder:
+    """Mean-pooled transformer sentence embeddings on the CPU, L2-normalized"""
+
+    def __init__(self, model_name, max_length=256):
+        self.model_name = model_name
+        self.max_length = max_length
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._model is None:
+                from transformers import AutoModel, AutoTokenizer  # heavy: only loaded when embedding
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                self._model = AutoModel.from_pretrained(self.model_name).eval()
+        return self._tokenizer, self._model
+
+    def encode(self, texts, batch_size=32):
+        """(len(texts), dim) float32 unit vectors"""
+        import torch
+
+        tokenizer, model = self._load()
+        batches = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), batch_size):
+                tokens = tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                                   max_length=self.max_length, return_tensors="pt")
+                hidden = model(**tokens).last_hidden_state
+                mask = tokens["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                batches.append(torch.nn.functional.normalize(pooled, dim=1).numpy())
+        return np.concatenate(batches).astype(np.float32) if batches else np.empty((0, 0), dtype=np.float32)
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def spherical_kmeans(vectors, clusters, iterations=10, seed=0):
+    """Unit-norm centroids of `clusters` cosine k-means clusters"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind='stable')
+        members, starts = np.unique(assignment[order], return_index=True)
+        sums = np.zeros_like(centroids)
+        sums[members] = np.add.reduceat(vectors[order], starts)
+        empty = ~sums.any(axis=1)
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]  # re-seed empty clusters
+        centroids = normalize(sums)
+    return centroids
+
+
+class EmbeddingIndex:
+    """Normalized vectors of archived records with an IVF index for approximate search"""
+
+    def __init__(self, model_name, dim=None, nprobe=8):
+        self.model_name = model_name
+        self.dim = dim
+        self.nprobe = nprobe
+        self._vectors = np.empty((0, dim or 0), dtype=np.float32)  # capacity grows by doubling
+        self.count = 0
+        self.keys = []
+        self.rows = {}  # key -> row
+        self.titles = []
+        self.kinds = array('B')
+        self.dates = array('q')
+        self.hashes = {}  # content hash -> row of its vector
+        self.archive_position = 0
+        self.centroids = None
+        self.lists = []  # per centroid: array('I') of rows
+        self.trained_count = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def vectors(self):
+        return self._vectors[:self.count]
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        if needed > len(self._vectors):
+            grown = np.empty((max(needed, 2 * len(self._vectors), 256), self.dim), dtype=np.float32)
+            grown[:self.count] = self.vectors
+            self._vectors = grown
+
+    def add_vectors(self, vectors, keys, kinds, titles, dates, hashes=None):
+        """Append unit vectors with their record metadata"""
+        vectors = normalize(vectors)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            start = self.count
+            self._reserve(len(vectors))
+            self._vectors[start:start + len(vectors)] = vectors
+            self.count += len(vectors)
+            for row, key in enumerate(keys, start):
+                self.rows[key] = row
+            self.keys.extend(keys)
+            self.titles.extend(titles)
+            self.kinds.extend(KINDS.index(kind) for kind in kinds)
+            self.dates.extend(dates)
+            for row, digest in enumerate(hashes or [], start):
+                self.hashes.setdefault(digest, row)
+
+            if self.count >= ANN_MIN_ITEMS and self.count >= 2 * self.trained_count:
+                self.train()
+            elif self.centroids is not None:
+                nearest = np.argmax(vectors @ self.centroids.T, axis=1)
+                for row, cluster in enumerate(nearest, start):
+                    self.lists[cluster].append(row)
+
+    def train(self, sample=20000, seed=0):
+        """(Re)build the IVF lists from the current vectors"""
+        with self._lock:
+            vectors = self.vectors
+            clusters = max(1, min(int(4 * np.sqrt(self.count)), self.count))
+            rng = np.random.default_rng(seed)
+            training = vectors if self.count <= sample else vectors[rng.choice(self.count, sample, replace=False)]
+            self.centroids = spherical_kmeans(training, clusters, seed=seed)
+            self._assign_all()
+            self.trained_count = self.count
+
+    def _assign_all(self):
+        assignment = np.empty(self.count, dtype=np.int64)
+        for start in range(0, self.count, 8192):  # bounded (chunk x clusters) score matrix
+            assignment[start:start + 8192] = np.argmax(self.vectors[start:start + 8192] @ self.centroids.T, axis=1)
+        order = np.argsort(assignment, kind='stable').astype(np.uint32)
+        bounds = np.searchsorted(assignment[order], np.arange(len(self.centroids) + 1))
+        self.lists = [array('I', order[bounds[i]:bounds[i + 1]].tobytes()) for i in range(len(self.centroids))]
+
+    def _embed(self, articles, digests, encoder, batch_size):
+        """Vectors for a batch of articles; texts embedded before are taken from the cache"""
+        texts = {}
+        for article, digest in zip(articles, digests):
+            if digest not in self.hashes:
+                texts.setdefault(digest, embedding_text(article))
+        encoded = dict(zip(texts, encoder.encode(list(texts.values()), batch_size=batch_size))) if texts else {}
+        return np.stack([encoded[digest] if digest in encoded else self._vectors[self.hashes[digest]]
+                         for digest in digests])
+
+    def update_from_archive(self, archive, encoder, batch_size=64):
+        """Embed the archive records appended since the last update; returns how many were added"""
+        added = 0
+        with self._lock:
+            articles, kinds, digests = [], [], []
+            for position, article, kind in archive.scan(self.archive_position):
+                articles.append(article)
+                kinds.append(kind)
+                digests.append(content_hash(article.title, article.content))
+                if len(articles) >= 4 * batch_size:
+                    self._add_articles(articles, kinds, digests, encoder, batch_size)
+                    self.archive_position = position + 1
+                    added += len(articles)
+                    articles, kinds, digests = [], [], []
+            if articles:
+                self._add_articles(articles, kinds, digests, encoder, batch_size)
+                self.archive_position = position + 1
+                added += len(articles)
+        return added
+
+    def _add_articles(self, articles, kinds, digests, encoder, batch_size):
+        self.add_vectors(self._embed(articles, digests, encoder, batch_size), [a.key for a in articles], kinds,
+                         [a.title for a in articles], [a.scraped_at for a in articles], digests)
+
+    def search_vector(self, query, limit=10, kind=None, exclude=None, nprobe=None):
+        """Top cosine hits for a unit query vector, best first"""
+        with self._lock:
+            if not self.count:
+                return []
+            query = normalize(query).reshape(-1)
+            if self.centroids is None:
+                candidates = np.arange(self.count)
+            else:
+                probes = min(nprobe or self.nprobe, len(self.centroids))
+                closest = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+                candidates = np.concatenate([np.frombuffer(self.lists[c], dtype=np.uint32) for c in closest]) \
+                    .astype(np.int64)
+            if kind is not None:
+                kinds = np.frombuffer(self.kinds, dtype=np.uint8, count=self.count)
+                candidates = candidates[kinds[candidates] == KINDS.index(kind)]
+            if exclude is not None:
+                candidates = candidates[candidates != exclude]
+            if not len(candidates):
+                return []
+            scores = self._vectors[candidates] @ query
+            if len(candidates) > limit:
+                top = np.argpartition(-scores, limit - 1)[:limit]
+                candidates, scores = candidates[top], scores[top]
+            order = np.argsort(-scores, kind='stable')
+            return [SearchHit(self.keys[row], KINDS[self.kinds[row]], self.titles[row], self.dates[row], float(score))
+                    for row, score in zip(candidates[order], scores[order])]
+
+    def search(self, text, encoder, limit=10, kind=None):
+        """Records most similar in meaning to a free-text query"""
+        return self.search_vector(encoder.encode([text])[0], limit=limit, kind=kind)
+
+    def similar(self, key, limit=10, kind=None):
+        """Records most similar to an indexed record (by Article.key)"""
+        with self._lock:
+            row = self.rows[key]
+            return self.search_vector(self._vectors[row], limit=limit, kind=kind, exclude=row)
+
+    def save(self, path):
+        with self._lock:
+            meta = {'model': self.model_name, 'nprobe': self.nprobe, 'archive_position': self.archive_position,
+                    'trained_count': self.trained_count, 'keys': self.keys, 'titles': self.titles}
+            lists = [np.frombuffer(rows, dtype=np.uint32) for rows in self.lists]
+            hashes = sorted(self.hashes.items(), key=lambda item: item[1])
+            with atomic_open(path, 'wb') as f:
+                np.savez(f, vectors=self.vectors,
+                         kinds=np.frombuffer(self.kinds, dtype=np.uint8),
+                         dates=np.frombuffer(self.dates, dtype=np.int64),
+                         # Raw bytes: an 'S16' array would drop a digest's trailing NUL bytes
+                         hashes=np.frombuffer(b"".join(digest for digest, _ in hashes), dtype=np.uint8).reshape(-1, 16),
+                         hash_rows=np.array([row for _, row in hashes], dtype=np.int64),
+                         centroids=self.centroids if self.centroids is not None else np.empty((0, 0), np.float32),
+                         list_sizes=np.array([len(rows) for rows in lists], dtype=np.int64),
+                         list_rows=np.concatenate(lists) if lists else np.empty(0, dtype=np.uint32),
+                         meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+            vectors = data['vectors']
+            index = cls(meta['model'], vectors.shape[1] if vectors.size else None, meta['nprobe'])
+            index._vectors = np.array(vectors, dtype=np.float32)
+            index.count = len(vectors)
+            index.keys = meta['keys']
+            index.rows = {key: row for row, key in enumerate(index.keys)}
+            index.titles = meta['titles']
+            index.kinds = array('B', data['kinds'].tobytes())
+            index.dates = array('q', data['dates'].tobytes())
+            index.hashes = dict(zip((digest.tobytes() for digest in data['hashes']), data['hash_rows'].tolist()))
+            index.archive_position = meta['archive_position']
+            index.trained_count = meta['trained_count']
+            if data['centroids'].size:
+                index.centroids = data['centroids']
+                bounds = np.concatenate([[0], np.cumsum(data['list_sizes'])])
+                rows = data['list_rows']
+                index.lists = [array('I', rows[bounds[i]:bounds[i + 1]].tobytes()) for i in range(len(bounds) - 1)]
+        return index
+
+
+_encoder = None
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_encoder():
+    """Process-wide sentence encoder for Config.EMBEDDING_MODEL (the model loads on first use)"""
+    global _encoder
+    with _index_lock:
+        if _encoder is None:
+            from config.settings import config
+            _encoder = SentenceEncoder(config.EMBEDDING_MODEL)
+        return _encoder
+
+
+def get_embedding_index(update=True):
+    """Process-wide index: loaded from Config.EMBEDDING_INDEX_FILE and caught up with the archive"""
+    global _index
+    encoder = get_encoder()
+    with _index_lock:
+        from config.settings import config
+        if _index is None:
+            try:
+                _index = EmbeddingIndex.load(config.EMBEDDING_INDEX_FILE)
+            except (FileNotFoundError, KeyError, ValueError):
+                _index = EmbeddingIndex(config.EMBEDDING_MODEL)
+            if _index.model_name != config.EMBEDDING_MODEL:  # vectors of another model are not comparable
+                _index = EmbeddingIndex(config.EMBEDDING_MODEL)
+        if update:
+            from utils.archive import get_archive
+            if _index.update_from_archive(get_archive(), encoder, batch_size=config.EMBEDDING_BATCH_SIZE):
+                _index.save(config.EMBEDDING_INDEX_FILE)
+        return _index
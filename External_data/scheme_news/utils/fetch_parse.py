@@ -0,0 +1,132 @@
+"""
+Fetch/parse pipeline - network I/O on threads, HTML parsing on processes
+
+Fetch threads download pages and put the raw HTML on a bounded queue; the
+calling thread moves pages from the queue into a process pool that runs the
+CPU-bound part (BeautifulSoup parsing, extraction, relevance filtering) and
+yields each page's articles as soon as it is done. Parsing one page
+overlaps with downloading the next, and BeautifulSoup no longer holds the
+GIL the fetch threads need. Every job is yielded exactly once; pages that
+failed to fetch or parse yield None.
+
+Memory stays bounded: fetch threads block once `queue_size` pages are
+waiting, and at most `max_in_flight` pages are inside the pool.
+
+Workers build one scraper per (class, source) and call its
+page_articles(url, html). Metrics spans recorded in a worker are sent back
+with the result and merged into the parent's get_metrics().
+"""
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from utils.metrics import get_metrics
+
+_DONE = object()
+
+# Worker-process state: scraper instances reused across pages
+_worker_scrapers = {}
+
+
+def parse_page(scraper_class, source_config, url, html):
+    """Runs in a pool process: (articles, metrics spans) for one fetched page"""
+    key = (scraper_class, source_config['name'])
+    scraper = _worker_scrapers.get(key)
+    if scraper is None:
+        scraper = _worker_scrapers[key] = scraper_class(source_config)
+    metrics = get_metrics()
+    metrics.spans.clear()
+    articles = scraper.page_articles(url, html)
+    return articles, list(metrics.spans)
+
+
+class FetchParsePipeline:
+    """Yields (job, articles or None) for jobs of (scraper, url), fetching and parsing concurrently"""
+
+    def __init__(self, fetch_workers=4, parse_workers=2, queue_size=8, max_in_flight=None):
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = max(1, queue_size)
+        self.max_in_flight = max_in_flight or 2 * self.parse_workers
+        self.errors = []  # (job, exception) for pages that failed to fetch or parse
+
+    def run(self, jobs):
+        pages = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        pending = iter(jobs)
+        pending_lock = threading.Lock()
+
+        def put(item):
+            # Blocks while the queue is full (backpressure), gives up once the consumer stopped
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def fetcher():
+            try:
+                while not stop.is_set():
+                    with pending_lock:
+                        job = next(pending, None)
+                    if job is None:
+                        return
+                    scraper, url = job
+                    try:
+                        html = scraper.get_page(url)
+                    except Exception as e:
+                        self.errors.append((job, e))
+                        html = None
+                    put((job, html))
+            finally:
+                put(_DONE)
+
+        # spawn: the parent has logging/fetch threads running, which fork does not copy safely
+        pool = ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=multiprocessing.get_context('spawn'))
+        fetchers = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="fetch")
+        for _ in range(self.fetch_workers):
+            fetchers.submit(fetcher)
+
+        in_flight = {}
+        fetchers_left = self.fetch_workers
+        metrics = get_metrics()
+        try:
+            while fetchers_left or in_flight:
+                # Feed fetched pages to the pool while it has room; only block on
+                # the queue when there is no parse result to wait for instead
+                while fetchers_left and len(in_flight) < self.max_in_flight:
+                    try:
+                        item = pages.get(block=not in_flight)
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        fetchers_left -= 1
+                        continue
+                    job, html = item
+                    if not html:
+                        yield job, None
+                        continue
+                    scraper, url = job
+                    future = pool.submit(parse_page, type(scraper), scraper.source_config, url, html)
+                    in_flight[future] = job
+                if not in_flight:
+                    continue
+
+                done, _ = wait(in_flight, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    try:
+                        articles, spans = future.result()
+                    except Exception as e:
+                        self.errors.append((job, e))
+                        yield job, None
+                        continue
+                    for span in spans:
+                        metrics.record(span)
+                    yield job, articles
+        finally:
+            stop.set()
+            fetchers.shutdown(wait=True)
+            pool.shutdown(wait=True, cancel_futures=True)
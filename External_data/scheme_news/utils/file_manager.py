@@ -1,23 +1,187 @@
 """
 File Manager - Create output2 at root level and delete output folder after consolidation
+
+output2/news.ndjson and output2/schemes.ndjson hold one Article record per
+line (utils/article.py) and are what news.py / scheme.py read. The decorated
+news.txt / schemes.txt reports are optional and can be rendered from the
+records later with write_text_report().
+
+Every file is written to a temporary file in the same directory and then
+published with an atomic rename, so readers never see a half-written file.
+Published files are listed in output2/manifest.json (size, sha256, items);
+downstream stages can start on a file as soon as it appears there
+(see wait_for_published). RecordWriter streams records into the temp file
+as a scraper produces them and publishes it once the last one is in.
 """
 import os
 import json
 import shutil
+import hashlib
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
 
+from utils.article import RECORD_FIELDS, RECORD_SCHEMA_VERSION, dump_ndjson, iter_ndjson
+from utils.metrics import get_metrics
+
+NEWS_RECORDS_FILE = "output2/news.ndjson"
+SCHEMES_RECORDS_FILE = "output2/schemes.ndjson"
+MANIFEST_FILE = "output2/manifest.json"
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+_manifest_lock = threading.Lock()
+
+
+@contextmanager
+def atomic_open(filename, mode='w', encoding='utf-8'):
+    """Write to a temp file next to filename, fsync and rename it into place on success"""
+    directory = os.path.dirname(filename) or '.'
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filename)}.", suffix=".tmp", dir=directory)
+    try:
+        with open(fd, mode, encoding=encoding if 'b' not in mode else None, buffering=WRITE_BUFFER_SIZE) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _file_sha256(filename):
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(manifest_file=MANIFEST_FILE):
+    """Published files: {path: {size, sha256, items, published_at}}"""
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def publish_to_manifest(filename, items=None, manifest_file=MANIFEST_FILE):
+    """Record a finished file in the manifest (the manifest itself is replaced atomically)"""
+    with _manifest_lock:
+        manifest = read_manifest(manifest_file)
+        manifest[filename.replace(os.sep, '/')] = {
+            'size': os.path.getsize(filename),
+            'sha256': _file_sha256(filename),
+            'items': items,
+            'published_at': datetime.now().isoformat()
+        }
+        with atomic_open(manifest_file) as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def wait_for_published(filename, timeout=None, poll_interval=1.0, since=None, manifest_file=MANIFEST_FILE):
+    """Block until filename is in the manifest (published after `since`, an ISO time, if given)
+
+    Returns the manifest entry, or None on timeout.
+    """
+    key = filename.replace(os.sep, '/')
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        entry = read_manifest(manifest_file).get(key)
+        if entry and (since is None or entry['published_at'] >= since):
+            return entry
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        time.sleep(poll_interval)
+
+
+def iter_records(filename):
+    """Stream raw records from an NDJSON file, one dict per non-empty line (iter_ndjson for Articles)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class RecordWriter:
+    """NDJSON records appended as they arrive; close() publishes the file atomically
+
+    Nothing is written (and a previously published file is kept) until the
+    first record arrives. abort() discards what was written.
+    """
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        self._stack = ExitStack()
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def write(self, articles):
+        """Append records for articles; returns how many were written"""
+        if not articles:
+            return 0
+        with self._lock:
+            if self._file is None:
+                self._file = self._stack.enter_context(atomic_open(self.filename))
+            written = dump_ndjson(articles, self._file)
+            self.count += written
+        return written
+    
+    def close(self):
+        """Publish the file and list it in the manifest; None when nothing was written"""
+        with self._lock:
+            if self._file is None:
+                return None
+            with get_metrics().span('save', os.path.basename(self.filename), self.filename) as span:
+                self._stack.close()
+                publish_to_manifest(self.filename, self.count)
+                span['bytes'] = os.path.getsize(self.filename)
+                span['items'] = self.count
+            self._file = None
+            return self.filename
+    
+    def abort(self):
+        """Drop the temp file without publishing"""
+        with self._lock:
+            if self._file is not None:
+                error = RuntimeError(f"aborted writing {self.filename}")
+                self._stack.__exit__(type(error), error, None)
+                self._file = None
+
+
 class FileManager:
     """File manager for agriculture articles"""
     
+    _directories_ready = False
+    
     def __init__(self):
         self.setup_directories()
         
     def setup_directories(self):
-        """Create directories"""
+        """Create directories (once per process)"""
+        if FileManager._directories_ready:
+            return
         os.makedirs('output', exist_ok=True)
         os.makedirs('output/daily', exist_ok=True)
         os.makedirs('output/consolidated', exist_ok=True)
         os.makedirs('output2', exist_ok=True)  # Create output2 at root level (same as config)
+        FileManager._directories_ready = True
+    
+    @contextmanager
+    def publish(self, filename, items=None):
+        """Atomically write filename, then list it in the manifest"""
+        with get_metrics().span('save', os.path.basename(filename), filename) as span:
+            with atomic_open(filename) as f:
+                yield f
+            publish_to_manifest(filename, items)
+            span['bytes'] = os.path.getsize(filename)
+            span['items'] = items or 0
     
     def save_articles_to_text(self, articles, source_name):
         """Save articles to individual text file in output/daily (temporary)"""
@@ -28,7 +192,8 @@ class FileManager:
         filename = f"output/daily/{source_name}_{timestamp}.txt"
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
+            with get_metrics().span('save', source_name, filename) as span, atomic_open(filename) as f:
+                span['items'] = len(articles)
                 f.write(f"AGRICULTURE CONTENT - {source_name.upper()}\n")
                 f.write("=" * 60 + "\n")
                 f.write(f"Source: {source_name}\n")
@@ -37,9 +202,9 @@ class FileManager:
                 f.write("=" * 60 + "\n\n")
                 
                 for i, article in enumerate(articles, 1):
-                    title = article.get('title', 'No Title')
-                    content = article.get('content', 'No Content')
-                    keywords = article.get('keywords', [])
+                    title = article.title
+                    content = article.content
+                    keywords = article.keywords
                     
                     f.write(f"ITEM {i}\n")
                     f.write("-" * 30 + "\n")
@@ -54,6 +219,53 @@ class FileManager:
             print(f"Error saving file: {str(e)}")
             return None
     
+    @contextmanager
+    def stream_records(self, filename):
+        """RecordWriter for filename: published when the block exits, discarded on error"""
+        writer = RecordWriter(filename)
+        try:
+            yield writer
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+    
+    def save_records(self, articles, filename):
+        """Save articles as NDJSON records"""
+        if not articles:
+            return None
+        
+        try:
+            with self.stream_records(filename) as writer:
+                writer.write(articles)
+            
+            return filename
+            
+        except Exception as e:
+            print(f"Error saving records file: {str(e)}")
+            return None
+    
+    def save_news_records(self, news_articles):
+        """Save NEWS records in output2/news.ndjson"""
+        return self.save_records(news_articles, NEWS_RECORDS_FILE)
+    
+    def save_schemes_records(self, scheme_articles):
+        """Save SCHEMES records in output2/schemes.ndjson"""
+        return self.save_records(scheme_articles, SCHEMES_RECORDS_FILE)
+    
+    def write_text_report(self, kind):
+        """Render output2/news.txt or output2/schemes.txt from the NDJSON records on demand"""
+        if kind == 'news':
+            records_file, save = NEWS_RECORDS_FILE, self.save_news_consolidated
+        elif kind == 'schemes':
+            records_file, save = SCHEMES_RECORDS_FILE, self.save_schemes_consolidated
+        else:
+            raise ValueError(f"Unknown report kind '{kind}', expected 'news' or 'schemes'")
+        
+        if not os.path.exists(records_file):
+            return None
+        return save(list(iter_ndjson(records_file)))
+    
     def save_news_consolidated(self, news_articles):
         """Save NEWS consolidated file in output2/news.txt"""
         if not news_articles:
@@ -62,7 +274,7 @@ class FileManager:
         filename = "output2/news.txt"  # Root level output2
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
+            with self.publish(filename, len(news_articles)) as f:
                 f.write("AGRICULTURE NEWS CONSOLIDATED\n")
                 f.write("Economic Times + Times of India\n")
                 f.write("=" * 70 + "\n")
@@ -72,7 +284,7 @@ class FileManager:
                 # Source breakdown
                 sources = {}
                 for article in news_articles:
-                    source = article.get('source', 'Unknown')
+                    source = article.source
                     sources[source] = sources.get(source, 0) + 1
                 
                 f.write(f"Sources: {', '.join([f'{s} ({c})' for s, c in sources.items()])}\n")
@@ -83,10 +295,10 @@ class FileManager:
                 f.write("=" * 70 + "\n\n")
                 
                 for i, article in enumerate(news_articles, 1):
-                    title = article.get('title', 'No Title')
-                    content = article.get('content', 'No Content')
-                    source = article.get('source', 'Unknown')
-                    keywords = article.get('keywords', [])
+                    title = article.title
+                    content = article.content
+                    source = article.source
+                    keywords = article.keywords
                     
                     f.write(f"NEWS ARTICLE {i}\n")
                     f.write("-" * 40 + "\n")
@@ -110,7 +322,7 @@ class FileManager:
         filename = "output2/schemes.txt"  # Root level output2
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
+            with self.publish(filename, len(scheme_articles)) as f:
                 f.write("AGRICULTURE SCHEMES CONSOLIDATED\n")
                 f.write("Government Schemes for Farmers\n")
                 f.write("=" * 70 + "\n")
@@ -120,7 +332,7 @@ class FileManager:
                 # Source breakdown
                 sources = {}
                 for article in scheme_articles:
-                    source = article.get('source', 'Unknown')
+                    source = article.source
                     sources[source] = sources.get(source, 0) + 1
                 
                 f.write(f"Sources: {', '.join([f'{s} ({c})' for s, c in sources.items()])}\n")
@@ -132,10 +344,10 @@ class FileManager:
                 f.write("=" * 70 + "\n\n")
                 
                 for i, article in enumerate(scheme_articles, 1):
-                    title = article.get('title', 'No Title')
-                    content = article.get('content', 'No Content')
-                    source = article.get('source', 'Unknown')
-                    keywords = article.get('keywords', [])
+                    title = article.title
+                    content = article.content
+                    source = article.source
+                    keywords = article.keywords
                     
                     f.write(f"GOVERNMENT SCHEME {i}\n")
                     f.write("-" * 40 + "\n")
@@ -156,6 +368,7 @@ class FileManager:
         try:
             if os.path.exists('output'):
                 shutil.rmtree('output')
+                FileManager._directories_ready = False
                 print("🗑️  Deleted temporary 'output' folder")
                 return True
             else:
@@ -0,0 +1,180 @@
+"""
+Crawl frontier - canonical URL dedup, priority queue and per-host politeness
+
+Discovered links are canonicalized (lower-case host, no fragment, no
+tracking parameters, sorted query) and deduplicated with a set. Pending URLs
+sit in a heap ranked by keyword relevance of the link text/slug plus a
+recency bonus, and drain() lets several workers process them concurrently
+while keeping at most `per_host` requests in flight per host and at least
+`min_delay` seconds between request starts to the same host. min_delay
+may also be a function of the host, e.g. RateController.delay, so pacing
+follows what each server currently tolerates.
+"""
+import heapq
+import itertools
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {"fbclid", "gclid", "from", "ref", "source", "utm_source", "utm_medium",
+                   "utm_campaign", "utm_term", "utm_content"}
+_URL_DATE_RE = re.compile(r"(20\d{2})[/-](\d{1,2})[/-](\d{1,2})")
+_SLUG_SPLIT_RE = re.compile(r"[/_\-.]+")
+
+
+def canonicalize_url(url, base_url=None):
+    """Absolute, normalized form of a URL used for dedup; None for non-http links"""
+    if not url:
+        return None
+    if base_url:
+        url = urljoin(base_url, url.strip())
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ("http", "https"):
+        return None
+
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((parts.scheme == "http" and parts.port == 80) or
+                           (parts.scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if k.lower() not in TRACKING_PARAMS))
+    return urlunsplit((parts.scheme, host, path, query, ""))
+
+
+def url_date(url):
+    """Publication date embedded in a URL path, if any"""
+    match = _URL_DATE_RE.search(url)
+    if not match:
+        return None
+    try:
+        return datetime(*(int(g) for g in match.groups()))
+    except ValueError:
+        return None
+
+
+class CrawlFrontier:
+    """Thread-safe priority frontier with set-based dedup and host politeness"""
+
+    def __init__(self, scorer=None, min_delay=2.0, per_host=1, recency_days=30, recency_weight=2.0):
+        self.scorer = scorer
+        self.min_delay = min_delay
+        self._delay = min_delay if callable(min_delay) else (lambda host: min_delay)
+        self.per_host = per_host
+        self.recency_days = recency_days
+        self.recency_weight = recency_weight
+
+        self.seen = set()
+        self._queues = {}  # host -> heap of (-priority, order, url, meta)
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._host_active = {}
+        self._host_next_start = {}
+
+    def priority(self, url, text="", published=None):
+        """Keyword score of link text + URL slug, plus a bonus for recent articles"""
+        score = 0.0
+        if self.scorer is not None:
+            slug = " ".join(_SLUG_SPLIT_RE.split(urlsplit(url).path))
+            score += self.scorer.score(f"{text} {slug}").score
+
+        published = published or url_date(url)
+        if published is not None:
+            age_days = max(0.0, (datetime.now() - published).total_seconds() / 86400)
+            score += self.recency_weight * max(0.0, 1 - age_days / self.recency_days)
+        return score
+
+    def push(self, url, text="", base_url=None, published=None, meta=None):
+        """Add a URL unless already seen; returns the canonical URL if it was new"""
+        canonical = canonicalize_url(url, base_url)
+        if canonical is None:
+            return None
+        with self._cond:
+            if canonical in self.seen:
+                return None
+            self.seen.add(canonical)
+            # heapq is a min-heap: negate priority; discovery order breaks ties (listing pages are newest first)
+            entry = (-self.priority(canonical, text, published), next(self._order), canonical, meta or {})
+            heapq.heappush(self._queues.setdefault(urlsplit(canonical).netloc, []), entry)
+            self._cond.notify()
+            return canonical
+
+    def __len__(self):
+        with self._cond:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def pending(self):
+        """Queued URLs, highest priority first (does not consume them)"""
+        with self._cond:
+            return [entry[2] for entry in sorted(e for queue in self._queues.values() for e in queue)]
+
+    def _take(self):
+        """Best URL among hosts with a free slot, waiting for politeness if needed"""
+        with self._cond:
+            while True:
+                if not any(self._queues.values()) and self._in_flight == 0:
+                    return None
+                now = time.monotonic()
+                best_host, wait = None, None
+                for host, queue in self._queues.items():
+                    if not queue or self._host_active.get(host, 0) >= self.per_host:
+                        continue
+                    ready_at = self._host_next_start.get(host, 0.0)
+                    if ready_at > now:
+                        wait = ready_at - now if wait is None else min(wait, ready_at - now)
+                    elif best_host is None or queue[0] < self._queues[best_host][0]:
+                        best_host = host
+
+                if best_host is not None:
+                    _, _, url, meta = heapq.heappop(self._queues[best_host])
+                    self._host_active[best_host] = self._host_active.get(best_host, 0) + 1
+                    self._host_next_start[best_host] = now + self._delay(best_host)
+                    self._in_flight += 1
+                    return url, meta
+                self._cond.wait(timeout=wait)
+
+    def _release(self, url):
+        with self._cond:
+            host = urlsplit(url).netloc
+            self._host_active[host] -= 1
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def drain(self, handler, limit=None, workers=4):
+        """Run handler(url, meta) over queued URLs with concurrent workers
+
+        Handlers may push() more URLs. Stops after `limit` URLs have been
+        dispatched or when the frontier is empty. Returns the non-None
+        handler results in completion order.
+        """
+        results = []
+        results_lock = threading.Lock()
+        dispatched = itertools.count()
+
+        def worker():
+            while True:
+                if limit is not None and next(dispatched) >= limit:
+                    return
+                item = self._take()
+                if item is None:
+                    return
+                url, meta = item
+                try:
+                    result = handler(url, meta)
+                    if result is not None:
+                        with results_lock:
+                            results.append(result)
+                finally:
+                    self._release(url)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(worker) for _ in range(max(1, workers))]
+        for future in futures:
+            future.result()  # surface handler errors
+        return results
@@ -0,0 +1,189 @@
+"""
+Corpus-level TF-IDF keyword extraction
+
+All articles of a batch are tokenized once into a sparse term-count matrix;
+TF-IDF weighting and the per-article top-k selection are done on the whole
+matrix with NumPy/SciPy instead of per-word Python loops. Document
+frequencies are accumulated across batches and runs (saved to a JSON state
+file), so a word that appears in every article of every run - "agriculture",
+"farmers" - stops ranking as a keyword. Each document is counted once: the
+keys of the documents already counted (Article.key, or a hash of the text)
+are saved with the frequencies, so pages scraped again do not inflate them.
+
+Tokenization keeps Malayalam words whole: vowel signs and virama are
+combining marks that \\w does not match, so the Malayalam block is matched
+explicitly.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from utils.file_manager import atomic_open
+
+TOKEN_RE = re.compile(r"(?:[^\W\d_]|[\u0D00-\u0D65\u0D70-\u0D7F\u200C\u200D])+")
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+me more most my myself no nor not now of off on once only or other our ours ourselves out over own
+said same says she should so some such than that the their theirs them themselves then there these
+they this those through to too under until up very was we were what when where which while who
+whom why will with would you your yours yourself yourselves
+according already among another around across against almost along although always amid
+announced another being called comes during either every first however including itself last
+later latest least made make many might more much must news next number often per percent
+report reported several since still their there thereby therefore these third though three
+through today told total under upon used using various where whether which while within without
+year years like don due
+ഒരു ഈ ആ എന്ന എന്നും എന്നാൽ എന്നിവ ഉണ്ട് ഇല്ല ആണ് എന്ന് ചെയ്തു ചെയ്യുന്ന കൂടി നിന്ന് വേണ്ടി
+""".split())
+
+
+def tokenize(text, min_length=3):
+    """Lower-cased word tokens without stop words; Malayalam words kept whole"""
+    return [
+        token for token in TOKEN_RE.findall((text or "").lower())
+        if len(token) >= min_length and token not in STOP_WORDS
+    ]
+
+
+class KeywordEngine:
+    """TF-IDF keyword extractor with document frequencies persisted across runs"""
+
+    def __init__(self, state_file="output2/keyword_df.json", top_k=8):
+        self.state_file = state_file
+        self.top_k = top_k
+        self.doc_count = 0
+        self.doc_freq = {}
+        self.seen = set()  # keys of the documents counted in doc_count / doc_freq
+        self._lock = threading.Lock()
+        self.load()
+
+    def _count_matrix(self, texts):
+        """Sparse (documents x vocabulary) term-count matrix and the vocabulary list"""
+        vocabulary = {}
+        indices, indptr = [], [0]
+        for text in texts:
+            for token in tokenize(text):
+                indices.append(vocabulary.setdefault(token, len(vocabulary)))
+            indptr.append(len(indices))
+
+        data = np.ones(len(indices), dtype=np.float32)
+        counts = sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), len(vocabulary))
+        )
+        counts.sum_duplicates()
+        terms = np.empty(len(vocabulary), dtype=object)
+        for term, column in vocabulary.items():
+            terms[column] = term
+        return counts, terms
+
+    @staticmethod
+    def text_key(text):
+        """Document key of a text without one (content hash)"""
+        return hashlib.sha1((text or "").encode("utf-8")).hexdigest()[:16]
+
+    def extract_batch(self, texts, top_k=None, keys=None):
+        """Top-k keywords for every text, highest TF-IDF first
+
+        keys identify the documents (e.g. Article.key); texts whose key was
+        counted before add nothing to the document frequencies.
+        """
+        top_k = top_k or self.top_k
+        if not texts:
+            return []
+        if keys is None:
+            keys = [self.text_key(text) for text in texts]
+
+        counts, terms = self._count_matrix(texts)
+        if counts.shape[1] == 0:
+            return [[] for _ in texts]
+
+        with self._lock:
+            new_rows = []
+            for row, key in enumerate(keys):
+                if key not in self.seen:
+                    self.seen.add(key)
+                    new_rows.append(row)
+            if new_rows:
+                new_df = np.asarray((counts[new_rows] > 0).sum(axis=0)).ravel()
+                self.doc_count += len(new_rows)
+                for column in np.flatnonzero(new_df):
+                    term = terms[column]
+                    self.doc_freq[term] = self.doc_freq.get(term, 0) + int(new_df[column])
+            df = np.fromiter((self.doc_freq.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+            total_docs = self.doc_count
+
+        # Smoothed IDF over every document seen so far, sublinear TF, L2-normalized rows
+        idf = np.log((1.0 + total_docs) / (1.0 + df)) + 1.0
+        weights = counts.copy()
+        weights.data = 1.0 + np.log(weights.data)
+        weights = weights.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        weights = sparse.diags(1.0 / norms) @ weights
+        weights = weights.tocsr()
+
+        # Rank every non-zero within its row in one lexsort, keep ranks < top_k
+        rows = np.repeat(np.arange(weights.shape[0]), np.diff(weights.indptr))
+        order = np.lexsort((-weights.data, rows))
+        ranks = np.arange(order.size) - weights.indptr[rows[order]]
+        keep = order[ranks < top_k]
+
+        keywords = [[] for _ in texts]
+        for row, column in zip(rows[keep], weights.indices[keep]):
+            keywords[row].append(terms[column])
+        return keywords
+
+    def extract(self, text, top_k=None):
+        """Keywords of a single text (prefer extract_batch for many texts)"""
+        return self.extract_batch([text], top_k)[0]
+
+    def load(self):
+        """Restore document frequencies from the state file"""
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        self.doc_count = state.get("doc_count", 0)
+        self.doc_freq = state.get("doc_freq", {})
+        self.seen = set(state.get("seen", []))
+
+    def save(self):
+        """Persist document frequencies for the next run"""
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        with self._lock:
+            state = {"doc_count": self.doc_count, "doc_freq": dict(self.doc_freq), "seen": sorted(self.seen)}
+        with atomic_open(self.state_file) as f:
+            json.dump(state, f, ensure_ascii=False)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_keyword_engine():
+    """Process-wide engine shared by all scrapers of a run"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            from config.settings import config
+            _engine = KeywordEngine(config.KEYWORD_STATE_FILE, config.KEYWORDS_PER_ARTICLE)
+        return _engine
+
+
+def assign_keywords(articles):
+    """Set 'keywords' on all articles with one vectorized TF-IDF pass"""
+    texts = [f"{a.title} {a.content}" for a in articles]
+    keys = [a.key for a in articles]
+    for article, keywords in zip(articles, get_keyword_engine().extract_batch(texts, keys=keys)):
+        article.keywords = keywords
+    return articles
@@ -1,42 +1,138 @@
 """
 Logging utilities for the scraper
+
+All loggers share one process-wide configuration. Records are put on a queue
+by a QueueHandler and written by a QueueListener thread to the console and,
+as one JSON object per line, to logs/scraper_<date>.jsonl - scraper threads
+only pay for a queue put, never for file I/O or handler locks.
+
+Scraper loggers carry their source name in every record (get_logger(name,
+source=...)). High-volume lines can be sampled by tagging them with
+extra={'sample': '<key>'}: only one in Config.LOG_SAMPLE_RATE of those is kept,
+warnings and errors always pass.
 """
+import atexit
+import json
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONTEXT_FIELDS = ('source', 'url', 'sampled')
+
+_listener = None
+_queue_handler = None
+_listener_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the source/url context when present"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in `rate` INFO/DEBUG records per sample key; untagged records pass"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = max(1, int(rate))
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, 'sample', None)
+        if key is None or record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            count = self.counts.get(key, 0)
+            self.counts[key] = count + 1
+        if count % self.rate:
+            return False
+        record.sampled = self.rate
+        return True
+
+
+class SourceAdapter(logging.LoggerAdapter):
+    """Adds the scraper's source name to every record, keeping per-call extras"""
+
+    def process(self, msg, kwargs):
+        kwargs['extra'] = {**self.extra, **kwargs.get('extra', {})}
+        return msg, kwargs
+
+
+def configure_logging(level=None, log_file=None, sample_rate=None):
+    """Install the shared queue-based configuration (first call wins)"""
+    global _listener, _queue_handler
+    with _listener_lock:
+        if _listener is not None:
+            return
+        from config.settings import config
+
+        if level is None:
+            level = getattr(logging, str(config.LOG_LEVEL).upper(), logging.INFO)
+        if log_file is None:
+            os.makedirs(config.LOGS_DIR, exist_ok=True)
+            log_file = os.path.join(config.LOGS_DIR, f"scraper_{datetime.now().strftime('%Y-%m-%d')}.jsonl")
+        else:
+            os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(sample_rate or config.LOG_SAMPLE_RATE))
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        _queue_handler = queue_handler
+
+        _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener, _queue_handler
+    with _listener_lock:
+        if _listener is not None:
+            logging.getLogger().removeHandler(_queue_handler)
+            _listener.stop()
+            _listener = _queue_handler = None
+
+
+def get_logger(name, source=None):
+    """Logger on the shared configuration, tagged with a source name if given"""
+    configure_logging()
+    logger = logging.getLogger(name)
+    return SourceAdapter(logger, {'source': source}) if source else logger
+
 
 def setup_logger(name, log_file=None, level=logging.INFO):
-    """Setup logger with file and console handlers"""
-    
-    # Create logs directory if it doesn't exist
-    os.makedirs('logs', exist_ok=True)
-    
-    # Create logger
+    """Setup logger with file and console handlers (shared queue-based configuration)"""
+    configure_logging(level=level, log_file=log_file)
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Avoid duplicate handlers
-    if logger.handlers:
-        return logger
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler
-    if log_file is None:
-        log_file = f"logs/{name}_{datetime.now().strftime('%Y-%m-%d')}.log"
-    
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
     return logger
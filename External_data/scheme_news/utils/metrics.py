@@ -0,0 +1,150 @@
+"""
+Run metrics - per-URL trace spans and per-stage timing aggregates
+
+Scraper stages (get_page, parse_html, every extract_* method) and
+FileManager saves record a span: stage, source, URL, duration, bytes, items
+and error. Spans are aggregated per (stage, source) as they are recorded;
+the most recent spans are also kept individually. At the end of a run
+export() writes output2/metrics.json (aggregates + spans) and
+output2/metrics.prom (Prometheus text format).
+
+A span without a URL inherits the last URL traced on the same thread, so
+parse_html is attributed to the page get_page just fetched.
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class Metrics:
+    """Thread-safe span recorder with per-(stage, source) aggregates"""
+
+    def __init__(self, max_spans=10000):
+        self.started_at = datetime.now()
+        self.spans = deque(maxlen=max_spans)
+        self.stages = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, stage, source=None, url=None):
+        """Time a block; the yielded dict accepts 'bytes', 'items' and 'status'"""
+        if url:
+            self._local.url = url
+        else:
+            url = getattr(self._local, "url", None)
+        record = {"stage": stage, "source": source or "", "url": url,
+                  "start": time.time(), "seconds": 0.0, "bytes": 0, "items": 0, "error": None}
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record["error"] = type(e).__name__
+            raise
+        finally:
+            record["seconds"] = time.perf_counter() - started
+            self.record(record)
+
+    def record(self, record):
+        """Add a finished span to the aggregates and the span log"""
+        with self._lock:
+            self.spans.append(record)
+            stats = self.stages.setdefault((record["stage"], record["source"]), {
+                "calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0, "bytes": 0, "items": 0
+            })
+            stats["calls"] += 1
+            stats["errors"] += 1 if record["error"] else 0
+            stats["seconds"] += record["seconds"]
+            stats["max_seconds"] = max(stats["max_seconds"], record["seconds"])
+            stats["bytes"] += record["bytes"] or 0
+            stats["items"] += record["items"] or 0
+
+    def summary(self):
+        """Aggregates sorted by total time, slowest stage first"""
+        with self._lock:
+            rows = [dict(stats, stage=stage, source=source) for (stage, source), stats in self.stages.items()]
+        return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+    def to_prometheus(self):
+        """Aggregates in Prometheus text exposition format"""
+        metrics = [
+            ("scraper_stage_calls_total", "counter", "Calls per stage and source", "calls"),
+            ("scraper_stage_errors_total", "counter", "Calls that raised", "errors"),
+            ("scraper_stage_seconds_total", "counter", "Total seconds spent in the stage", "seconds"),
+            ("scraper_stage_seconds_max", "gauge", "Slowest single call", "max_seconds"),
+            ("scraper_stage_bytes_total", "counter", "Bytes fetched or written", "bytes"),
+            ("scraper_stage_items_total", "counter", "Items extracted or saved", "items"),
+        ]
+        rows = self.summary()
+        lines = []
+        for name, kind, help_text, field in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for row in rows:
+                source = row["source"].replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}{{stage="{row["stage"]}",source="{source}"}} {row[field]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_file="output2/metrics.json", prom_file="output2/metrics.prom"):
+        """Write the JSON report and the Prometheus text file"""
+        from utils.file_manager import atomic_open  # file_manager imports this module
+        os.makedirs(os.path.dirname(json_file) or ".", exist_ok=True)
+        with self._lock:
+            spans = list(self.spans)
+        with atomic_open(json_file) as f:
+            json.dump({
+                "started_at": self.started_at.isoformat(),
+                "exported_at": datetime.now().isoformat(),
+                "stages": self.summary(),
+                "spans": spans
+            }, f, ensure_ascii=False, indent=2)
+        if prom_file:
+            with atomic_open(prom_file) as f:
+                f.write(self.to_prometheus())
+        return json_file
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Process-wide metrics of the current run"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
+
+
+def traced(method):
+    """Record a span for a scraper method
+
+    The stage is the method name, the source is self.source_config['name'] and
+    the URL comes from a `url`/`article_url` argument when the method has one.
+    List results count as items, a dict result as one item. Nested traced
+    methods are timed inclusively.
+    """
+    signature = inspect.signature(method)
+    url_param = next((name for name in ("url", "article_url") if name in signature.parameters), None)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        url = None
+        if url_param:
+            url = signature.bind_partial(self, *args, **kwargs).arguments.get(url_param)
+        source = getattr(self, "source_config", {}).get("name")
+        with get_metrics().span(method.__name__, source, url) as span:
+            result = method(self, *args, **kwargs)
+            if isinstance(result, list):
+                span["items"] = len(result)
+            elif isinstance(result, dict):
+                span["items"] = 1
+            return result
+    return wrapper
@@ -0,0 +1,132 @@
+"""
+Adaptive per-host rate control
+
+Each host gets its own delay between request starts. Fast, healthy
+responses shrink the delay step by step (down to min_delay); slow responses
+nudge it up; 429 / 5xx responses double it with random jitter and honour
+Retry-After. The learned delays are saved to a JSON file, so the next run
+starts at the pace the site accepted last time instead of a fixed sleep.
+"""
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from utils.file_manager import atomic_open
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateController:
+    """Thread-safe per-host delay controller with persisted state"""
+
+    def __init__(self, state_file="output2/rate_state.json", initial_delay=2.0, min_delay=0.25,
+                 max_delay=60.0, fast_response=1.0, speedup=0.8, slowdown=1.25, backoff=2.0):
+        self.state_file = state_file
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.fast_response = fast_response
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.backoff = backoff
+
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._next_slot = {}
+        self.load()
+
+    def _host(self, host):
+        return self._hosts.setdefault(host, {"delay": self.initial_delay, "latency": None,
+                                             "errors": 0, "requests": 0})
+
+    def delay(self, host):
+        with self._lock:
+            return self._host(host)["delay"]
+
+    def wait(self, host):
+        """Reserve the next request slot for host and sleep until it starts"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self._host(host)["delay"]
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, host, status, elapsed, retry_after=None):
+        """Adapt the host delay to one response (status None = connection error)"""
+        with self._lock:
+            state = self._host(host)
+            state["requests"] += 1
+            state["latency"] = elapsed if state["latency"] is None else 0.8 * state["latency"] + 0.2 * elapsed
+
+            if status is None or status in RETRY_STATUSES:
+                state["errors"] += 1
+                delay = state["delay"] * self.backoff * random.uniform(1.0, 1.5)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                    # Nothing is sent to this host before Retry-After has passed
+                    self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + retry_after)
+            elif elapsed <= self.fast_response:
+                delay = state["delay"] * self.speedup
+            else:
+                delay = state["delay"] * self.slowdown
+
+            state["delay"] = min(self.max_delay, max(self.min_delay, delay))
+            return state["delay"]
+
+    def load(self):
+        """Restore learned delays from the state file"""
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                hosts = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        for host, state in hosts.items():
+            self._host(host).update(state)
+
+    def save(self):
+        """Persist learned delays for the next run"""
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        with self._lock:
+            hosts = {host: dict(state) for host, state in self._hosts.items()}
+        with atomic_open(self.state_file) as f:
+            json.dump(hosts, f, indent=2)
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_rate_controller():
+    """Process-wide controller shared by all scrapers"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            from config.settings import config
+            _controller = RateController(
+                config.RATE_STATE_FILE,
+                initial_delay=config.DEFAULT_DELAY,
+                min_delay=config.MIN_DELAY,
+                max_delay=config.MAX_DELAY
+            )
+        return _controller
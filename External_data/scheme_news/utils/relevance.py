@@ -0,0 +1,115 @@
+"""
+Agriculture relevance scoring with an Aho-Corasick automaton
+
+The automaton is built once from the keyword configuration
+(Config.AGRICULTURE_KEYWORDS, KERALA_AGRICULTURE_KEYWORDS and
+REJECT_KEYWORDS in config/sources.py) and finds every keyword occurrence in
+a single pass over the text, instead of one `term in text` scan per term.
+English terms must match whole words ("rice" does not match "price");
+Malayalam terms match inside words, since they are usually inflected.
+"""
+import threading
+from collections import deque, namedtuple
+
+Relevance = namedtuple("Relevance", ["score", "counts"])
+
+
+def _is_latin_letter(char):
+    return char.isascii() and char.isalpha()
+
+
+class RelevanceScorer:
+    """Multi-pattern keyword matcher returning match counts and a weighted score"""
+
+    def __init__(self, weights):
+        # weights: {term: weight}; negative weights penalize (reject terms)
+        self.weights = {}
+        for term, weight in weights.items():
+            term = term.strip().lower()
+            if term:
+                self.weights[term] = self.weights.get(term, 0) + weight
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for term in self.weights:
+            self._add(term)
+        self._build_failure_links()
+
+    def _add(self, term):
+        state = 0
+        for char in term:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append(term)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def _whole_word(self, text, start, end):
+        """Latin terms need non-letter neighbours; other scripts match anywhere"""
+        if not _is_latin_letter(text[start]):
+            return True
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return not _is_latin_letter(before) and not _is_latin_letter(after)
+
+    def matches(self, text):
+        """{term: count} of every keyword occurrence in text"""
+        text = (text or "").lower()
+        counts = {}
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for term in output[state]:
+                start = index - len(term) + 1
+                if self._whole_word(text, start, index + 1):
+                    counts[term] = counts.get(term, 0) + 1
+        return counts
+
+    def score(self, text):
+        """Relevance(score, counts); each distinct term counts once toward the score"""
+        counts = self.matches(text)
+        return Relevance(sum(self.weights[term] for term in counts), counts)
+
+    def is_relevant(self, text, min_score=1.0):
+        return self.score(text).score >= min_score
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_relevance_scorer():
+    """Process-wide scorer built from the keyword configuration"""
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            from config.settings import config
+            from config.sources import KERALA_AGRICULTURE_KEYWORDS, REJECT_KEYWORDS
+
+            weights = {term: 1.0 for term in config.AGRICULTURE_KEYWORDS}
+            for term in KERALA_AGRICULTURE_KEYWORDS:
+                weights[term] = 2.0
+            for term in REJECT_KEYWORDS:
+                weights[term] = -5.0
+            _scorer = RelevanceScorer(weights)
+        return _scorer
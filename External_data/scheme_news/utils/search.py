@@ -0,0 +1,233 @@
+"""
+Full-text search over archived news and schemes - inverted index + BM25
+
+Every archived record is indexed by its title, content and keywords (title
+terms count three times, keywords twice). Each term keeps a postings list of
+(document, weighted term frequency) in growable arrays; a query scores only
+the documents in the postings of its terms, with BM25 computed on NumPy views
+of those arrays, and the top hits are picked with argpartition.
+
+The index follows the archive: update_from_archive() adds the records
+appended since the last update, so new articles are searchable without a
+rebuild. The index is saved to Config.SEARCH_INDEX_FILE between runs.
+
+Analysis reuses utils/keywords.tokenize and adds what matters for
+Malayalam queries: chillu letters written as consonant + virama + ZWJ are
+normalized to the atomic chillu, joiners are dropped, and the common case
+suffixes are stripped, so "നെല്ലിന്റെ" and "നെല്ല്" meet at the same term.
+English terms get a light plural stemmer ("subsidies" -> "subsidy").
+"""
+import json
+import math
+import threading
+from array import array
+from dataclasses import dataclass
+
+import numpy as np
+
+from utils.file_manager import atomic_open
+from utils.keywords import tokenize
+
+FIELD_WEIGHTS = {'title': 3, 'keywords': 2, 'content': 1}
+KINDS = ('news', 'schemes')
+
+# Chillu letters typed as consonant + virama + ZWJ -> atomic chillu (ൺ ൻ ർ ൽ ൾ)
+_CHILLU = {
+    "\u0d23\u0d4d\u200d": "\u0d7a",
+    "\u0d28\u0d4d\u200d": "\u0d7b",
+    "\u0d30\u0d4d\u200d": "\u0d7c",
+    "\u0d32\u0d4d\u200d": "\u0d7d",
+    "\u0d33\u0d4d\u200d": "\u0d7e",
+}
+_JOINERS = str.maketrans("", "", "\u200c\u200d")
+
+# Case and postposition endings, longest first
+MALAYALAM_SUFFIXES = sorted("""
+ിന്റെ യുടെ ുടെ ന്റെ ത്തിന്റെ ത്തിൽ ത്തിന് ത്തെ ത്തോടെ ിലേക്ക് യിലേക്ക് ിലെ യിലെ ിൽ യിൽ
+ിന് യ്ക്ക് ക്ക് ിനെ യെ ും യും ാണ് ോടെ ുകൾ ുകളുടെ കൾ ങ്ങൾ ങ്ങളുടെ
+""".split(), key=len, reverse=True)
+
+VIRAMA = "\u0d4d"
+
+
+def _is_malayalam(token):
+    return "\u0d00" <= token[0] <= "\u0d7f"
+
+
+def normalize_malayalam(text):
+    for sequence, chillu in _CHILLU.items():
+        text = text.replace(sequence, chillu)
+    return text.translate(_JOINERS)
+
+
+def stem(token):
+    """Light suffix stripping: Malayalam case endings, English plurals"""
+    if _is_malayalam(token):
+        for suffix in MALAYALAM_SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+                token = token[:-len(suffix)]
+                break
+        return token.rstrip(VIRAMA)
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def analyze(text):
+    """Search terms of a text or query"""
+    return [stem(token) for token in tokenize(normalize_malayalam(text or ""), min_length=2)]
+
+
+@dataclass
+class SearchHit:
+    key: str
+    kind: str
+    title: str
+    scraped_at: int
+    score: float
+
+
+class SearchIndex:
+    """Incremental inverted index with BM25 ranking"""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> (array('I') doc ids, array('f') weighted term frequencies)
+        self.doc_keys = []
+        self.doc_titles = []
+        self.doc_kinds = array('B')
+        self.doc_dates = array('q')
+        self.doc_lengths = array('f')
+        self.archive_position = 0  # archive records indexed so far
+        self._total_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.doc_keys)
+
+    def add(self, article, kind):
+        """Index one Article; returns its document number"""
+        frequencies = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = article.keywords if field == 'keywords' else getattr(article, field)
+            text = " ".join(value) if field == 'keywords' else value
+            for term in analyze(text):
+                frequencies[term] = frequencies.get(term, 0) + weight
+        length = float(sum(frequencies.values()))
+
+        with self._lock:
+            doc = len(self.doc_keys)
+            self.doc_keys.append(article.key)
+            self.doc_titles.append(article.title)
+            self.doc_kinds.append(KINDS.index(kind))
+            self.doc_dates.append(article.scraped_at)
+            self.doc_lengths.append(length)
+            self._total_length += length
+            for term, frequency in frequencies.items():
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = (array('I'), array('f'))
+                postings[0].append(doc)
+                postings[1].append(frequency)
+            return doc
+
+    def update_from_archive(self, archive):
+        """Index the archive records appended since the last update; returns how many"""
+        added = 0
+        with self._lock:
+            for position, article, kind in archive.scan(self.archive_position):
+                self.add(article, kind)
+                self.archive_position = position + 1
+                added += 1
+        return added
+
+    def search(self, query, limit=10, kind=None):
+        """Top BM25 hits for a query, best first"""
+        terms = list(dict.fromkeys(analyze(query)))
+        with self._lock:
+            count = len(self.doc_keys)
+            if not terms or not count:
+                return []
+            lengths = np.frombuffer(self.doc_lengths, dtype=np.float32, count=count)
+            average = self._total_length / count
+            scores = np.zeros(count, dtype=np.float32)
+            for term in terms:
+                postings = self.postings.get(term)
+                if postings is None:
+                    continue
+                docs = np.frombuffer(postings[0], dtype=np.uint32)
+                frequencies = np.frombuffer(postings[1], dtype=np.float32)
+                idf = math.log(1.0 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * lengths[docs] / average)
+                scores[docs] += idf * frequencies * (self.k1 + 1.0) / (frequencies + norm)
+
+            if kind is not None:
+                scores[np.frombuffer(self.doc_kinds, dtype=np.uint8, count=count) != KINDS.index(kind)] = 0.0
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+            return [SearchHit(self.doc_keys[doc], KINDS[self.doc_kinds[doc]], self.doc_titles[doc],
+                              self.doc_dates[doc], float(scores[doc])) for doc in candidates]
+
+    def save(self, path):
+        """Postings as flat arrays in one .npz, plus document metadata"""
+        with self._lock:
+            terms = list(self.postings)
+            offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(self.postings[term][0]) for term in terms])
+            docs = np.concatenate([np.frombuffer(self.postings[t][0], dtype=np.uint32) for t in terms]) \
+                if terms else np.empty(0, dtype=np.uint32)
+            frequencies = np.concatenate([np.frombuffer(self.postings[t][1], dtype=np.float32) for t in terms]) \
+                if terms else np.empty(0, dtype=np.float32)
+            meta = {'k1': self.k1, 'b': self.b, 'archive_position': self.archive_position,
+                    'terms': terms, 'keys': self.doc_keys, 'titles': self.doc_titles}
+            with atomic_open(path, 'wb') as f:
+                np.savez(f, offsets=offsets, docs=docs, frequencies=frequencies,
+                         kinds=np.frombuffer(self.doc_kinds, dtype=np.uint8),
+                         dates=np.frombuffer(self.doc_dates, dtype=np.int64),
+                         lengths=np.frombuffer(self.doc_lengths, dtype=np.float32),
+                         meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+            index = cls(meta['k1'], meta['b'])
+            index.archive_position = meta['archive_position']
+            index.doc_keys = meta['keys']
+            index.doc_titles = meta['titles']
+            index.doc_kinds = array('B', data['kinds'].tobytes())
+            index.doc_dates = array('q', data['dates'].tobytes())
+            index.doc_lengths = array('f', data['lengths'].tobytes())
+            index._total_length = float(data['lengths'].sum(dtype=np.float64))
+            offsets, docs, frequencies = data['offsets'], data['docs'], data['frequencies']
+            for i, term in enumerate(meta['terms']):
+                start, end = offsets[i], offsets[i + 1]
+                index.postings[term] = (array('I', docs[start:end].tobytes()),
+                                        array('f', frequencies[start:end].tobytes()))
+        return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(update=True):
+    """Process-wide index: loaded from Config.SEARCH_INDEX_FILE and caught up with the archive"""
+    global _index
+    with _index_lock:
+        from config.settings import config
+        if _index is None:
+            try:
+                _index = SearchIndex.load(config.SEARCH_INDEX_FILE)
+            except (FileNotFoundError, KeyError, ValueError):
+                _index = SearchIndex()
+        if update:
+            from utils.archive import get_archive
+            if _index.update_from_archive(get_archive()):
+                _index.save(config.SEARCH_INDEX_FILE)
+        return _index
@@ -0,0 +1,181 @@
+"""
+Weather alerts for every district from declarative threshold rules
+
+A rule names a weather.json field, a comparison and a threshold, and
+optionally how many hours the condition must have held:
+
+    {"name": "fungal_risk", "field": "humidity", "op": ">", "threshold": 85, "hours": 6, ...}
+
+Rules are compiled once: rules on the same (field, comparison) share one
+vectorized comparison against their stacked thresholds. The recent history
+(weather_history.json, kept by weather.py) is laid out as a
+districts x time matrix per field, so all rules are evaluated over all
+districts and rows at once and the Python work does not grow with the
+number of rules or districts. For sustained rules, the time of the last
+row that broke the condition gives how long it has held at the latest row.
+Districts missing from the latest fetch are left out rather than alerted
+on from an old reading. Only building the alert records themselves is per alert.
+
+Active alerts are written to alerts.json, which combine.py adds to the
+combined output.
+
+    python alerts.py          # evaluate the history and write alerts.json
+"""
+import json
+import operator
+import os
+from datetime import datetime
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+history_file = os.path.join(BASE_DIR, "weather_history.json")
+alerts_file = os.path.join(BASE_DIR, "alerts.json")
+
+DEFAULT_RULES = [
+    {"name": "heat_stress", "field": "feels_like_c", "op": ">=", "threshold": 40, "hours": 0,
+     "severity": "warning", "message": "Heat stress: avoid field work at midday, irrigate in the evening"},
+    {"name": "severe_heat_stress", "field": "feels_like_c", "op": ">=", "threshold": 46, "hours": 0,
+     "severity": "severe", "message": "Severe heat stress: shade livestock and nurseries, stop midday work"},
+    {"name": "fungal_risk", "field": "humidity", "op": ">", "threshold": 85, "hours": 6,
+     "severity": "warning", "message": "Fungal disease risk: inspect paddy, pepper and banana for leaf spots"},
+    {"name": "high_fungal_risk", "field": "humidity", "op": ">", "threshold": 90, "hours": 12,
+     "severity": "severe", "message": "High fungal disease risk: consider a preventive fungicide spray"},
+    {"name": "cold_stress", "field": "temperature_c", "op": "<", "threshold": 12, "hours": 3,
+     "severity": "warning", "message": "Cold nights: protect seedlings and young plantation crops"},
+]
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+# Rows of one fetch are a few seconds apart; a district whose latest row is
+# older than this, compared with the newest row of all, missed the latest fetch
+FETCH_WINDOW_SECONDS = 30 * 60
+
+
+class CompiledRules:
+    """Rules grouped by (field, comparison) with their thresholds and durations as arrays"""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        for rule in self.rules:
+            if rule["op"] not in OPERATORS:
+                raise ValueError(f"Unknown comparison {rule['op']!r} in rule {rule['name']}")
+        groups = {}
+        for position, rule in enumerate(self.rules):
+            groups.setdefault((rule["field"], rule["op"]), []).append(position)
+        # (field, comparison, rule positions, thresholds)
+        self.groups = [(field, OPERATORS[op], np.array(positions),
+                        np.array([self.rules[p]["threshold"] for p in positions], dtype=np.float64))
+                       for (field, op), positions in groups.items()]
+        self.hours = np.array([rule.get("hours", 0) for rule in self.rules], dtype=np.float64)
+        self.fields = sorted({rule["field"] for rule in self.rules})
+
+
+def history_matrix(rows, fields):
+    """(districts, times, labels, {field: values}), each districts x T, right-aligned and NaN-padded
+
+    times are Unix seconds, labels the rows' original "time" strings.
+    """
+    by_district = {}
+    for row in rows:
+        if "error" in row or not row.get("time") or not row.get("district"):
+            continue
+        by_district.setdefault(row["district"], []).append(row)
+    districts = sorted(by_district)
+    length = max((len(v) for v in by_district.values()), default=0)
+
+    times = np.full((len(districts), length), np.nan)
+    labels = np.full((len(districts), length), None, dtype=object)
+    values = {field: np.full((len(districts), length), np.nan) for field in fields}
+    for i, district in enumerate(districts):
+        series = sorted(by_district[district], key=lambda row: row["time"])
+        offset = length - len(series)  # right-align: the latest row of every district is the last column
+        labels[i, offset:] = [row["time"] for row in series]
+        times[i, offset:] = [datetime.fromisoformat(row["time"]).timestamp() for row in series]
+        for field in fields:
+            values[field][i, offset:] = [row.get(field) if row.get(field) is not None else np.nan
+                                         for row in series]
+    return districts, times, labels, values
+
+
+def evaluate(rows, rules=DEFAULT_RULES, fetch_window=FETCH_WINDOW_SECONDS):
+    """Active alerts at the latest fetch, as records
+
+    "Now" is the newest row of all districts; districts without a row from
+    that fetch (their fetch failed) raise no alerts from older readings.
+    """
+    compiled = rules if isinstance(rules, CompiledRules) else CompiledRules(rules)
+    districts, times, labels, values = history_matrix(rows, compiled.fields)
+    if not districts or not compiled.rules:
+        return []
+    current = times[:, -1] >= np.max(times[:, -1]) - fetch_window
+    if not current.all():
+        districts = [district for district, keep in zip(districts, current) if keep]
+        times, labels = times[current], labels[current]
+        values = {field: column[current] for field, column in values.items()}
+    count, length = times.shape
+
+    # districts x T x rules: does each row meet each rule's condition
+    met = np.zeros((count, length, len(compiled.rules)), dtype=bool)
+    latest_values = np.empty((count, len(compiled.rules)))
+    for field, compare, positions, thresholds in compiled.groups:
+        column = values[field]
+        with np.errstate(invalid="ignore"):
+            met[:, :, positions] = compare(column[:, :, None], thresholds)  # NaN (missing) never meets
+        latest_values[:, positions] = column[:, -1:]
+
+    # Streak of rows meeting the rule that ends at the latest row
+    steps = np.arange(length)[None, :, None]
+    streak_start = np.where(~met, steps, -1).max(axis=1) + 1  # districts x rules
+    start_column = np.minimum(streak_start, length - 1)
+    held_hours = (times[:, -1:] - np.take_along_axis(times, start_column, axis=1)) / 3600.0
+    active = (streak_start < length) & (held_hours >= compiled.hours[None, :])
+
+    # Records for the active (district, rule) pairs, gathered column-wise
+    district_index, rule_index = np.nonzero(active)
+    names = [rule["name"] for rule in compiled.rules]
+    severities = [rule.get("severity", "warning") for rule in compiled.rules]
+    messages = [rule.get("message", "") for rule in compiled.rules]
+    fields = [rule["field"] for rule in compiled.rules]
+    thresholds = [rule["threshold"] for rule in compiled.rules]
+    columns = zip(
+        district_index.tolist(), rule_index.tolist(),
+        latest_values[district_index, rule_index].tolist(),
+        labels[district_index, start_column[district_index, rule_index]].tolist(),
+        np.round(held_hours[district_index, rule_index], 2).tolist(),
+        labels[district_index, -1].tolist())
+    return [{
+        "district": districts[d],
+        "rule": names[r],
+        "severity": severities[r],
+        "message": messages[r],
+        "field": fields[r],
+        "value": value,
+        "threshold": thresholds[r],
+        "since": since,
+        "hours": hours,
+        "time": latest
+    } for d, r, value, since, hours, latest in columns]
+
+
+def load_history(path=history_file):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def update_alerts(history_path=history_file, output_path=alerts_file, rules=DEFAULT_RULES):
+    """Evaluate the weather history and write the active alerts to alerts.json"""
+    alerts = evaluate(load_history(history_path), rules)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(alerts, f, indent=4, ensure_ascii=False)
+    return alerts
+
+
+if __name__ == "__main__":
+    alerts = update_alerts()
+    print(f"⚠️  {len(alerts)} active weather alerts saved to {alerts_file}")
+    for alert in alerts:
+        print(f"   {alert['district']:<20} {alert['rule']:<20} {alert['field']}={alert['value']} since {alert['since']}")
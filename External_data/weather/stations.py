@@ -0,0 +1,143 @@
+"""
+Weather for any farm location - spatial index over the weather sample points
+
+weather.py samples the weather at 14 district centroids. StationIndex puts
+those points in a KD-tree (scipy's cKDTree when scipy is installed, a
+vectorized brute-force search otherwise) and answers "weather at this
+lat/lon" for whole arrays of coordinates at once:
+
+- nearest: the values of the closest station, with its district
+  (districts whose fetch failed are not stations)
+- idw: inverse-distance-weighted mean of the k closest stations; a station
+  with a missing value is left out of that value's average
+
+Points are placed on the unit sphere, so the straight-line distance the
+tree works with orders stations the same way as the great-circle distance,
+which is what is reported (km).
+
+    python stations.py 10.05 76.33            # weather at one location
+"""
+import json
+import os
+import sys
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # brute-force search over the stations
+    cKDTree = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+weather_file = os.path.join(BASE_DIR, "weather.json")
+
+EARTH_RADIUS_KM = 6371.0
+FIELDS = ("temperature_c", "feels_like_c", "humidity")
+
+
+def to_unit_vectors(lat, lon):
+    """(n, 3) points on the unit sphere for latitude/longitude arrays in degrees"""
+    lat, lon = np.radians(np.asarray(lat, dtype=np.float64)), np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def chord_to_km(chord):
+    """Great-circle distance for a straight-line distance between unit vectors"""
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0))
+
+
+class StationIndex:
+    """Nearest-station and IDW lookups over weather rows with known coordinates"""
+
+    def __init__(self, rows, coordinates):
+        """rows: weather.json records; coordinates: {district: (lat, lon)}"""
+        stations = [row for row in rows if row.get("district") in coordinates and "error" not in row]
+        if not stations:
+            raise ValueError("no weather stations: every district fetch failed or has no coordinates")
+        self.districts = [row["district"] for row in stations]
+        self.lat = np.array([coordinates[d][0] for d in self.districts], dtype=np.float64)
+        self.lon = np.array([coordinates[d][1] for d in self.districts], dtype=np.float64)
+        self.points = to_unit_vectors(self.lat, self.lon)
+        # Rows that failed to fetch ("error") are not stations; missing values are NaN
+        self.values = {field: np.array([row.get(field) if row.get(field) is not None else np.nan
+                                        for row in stations], dtype=np.float64)
+                       for field in FIELDS}
+        self.tree = cKDTree(self.points) if cKDTree is not None else None
+
+    def __len__(self):
+        return len(self.districts)
+
+    def query(self, lat, lon, k=1):
+        """(distances in km, station indices), each (n, k), closest first"""
+        points = to_unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        k = min(k, len(self))
+        if self.tree is not None:
+            chords, indices = self.tree.query(points, k=k)
+            chords, indices = chords.reshape(len(points), k), indices.reshape(len(points), k)
+        else:
+            chords = np.empty((len(points), k))
+            indices = np.empty((len(points), k), dtype=np.int64)
+            for start in range(0, len(points), 4096):  # bounded (chunk x stations) distance matrix
+                block = np.linalg.norm(points[start:start + 4096, None, :] - self.points[None, :, :], axis=-1)
+                nearest = np.argpartition(block, k - 1, axis=1)[:, :k] if k < len(self) else \
+                    np.broadcast_to(np.arange(len(self)), block.shape).copy()
+                order = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1)
+                indices[start:start + 4096] = np.take_along_axis(nearest, order, axis=1)
+                chords[start:start + 4096] = np.take_along_axis(block, indices[start:start + 4096], axis=1)
+        return chord_to_km(chords), indices
+
+    def nearest(self, lat, lon):
+        """{"district", "distance_km", <field>: ...} arrays for each location: the closest station's values"""
+        distances, indices = self.query(lat, lon, k=1)
+        indices = indices[:, 0]
+        result = {"district": np.array(self.districts, dtype=object)[indices], "distance_km": distances[:, 0]}
+        for field, values in self.values.items():
+            result[field] = values[indices]
+        return result
+
+    def idw(self, lat, lon, k=3, power=2.0):
+        """Like nearest(), with each field interpolated from the k closest stations by 1 / distance**power"""
+        distances, indices = self.query(lat, lon, k=k)
+        weights = 1.0 / np.maximum(distances, 1e-6) ** power
+        exact = distances[:, :1] < 1e-3
+        first_only = np.arange(weights.shape[1]) == 0
+
+        result = {"district": np.array(self.districts, dtype=object)[indices[:, 0]], "distance_km": distances[:, 0]}
+        for field, values in self.values.items():
+            neighbour_values = values[indices]
+            missing = np.isnan(neighbour_values)
+            # A location on top of a station takes that station's value, when it has one
+            field_weights = np.where(exact & ~missing[:, :1], first_only, weights)
+            field_weights = np.where(missing, 0.0, field_weights)
+            total = field_weights.sum(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result[field] = np.where(total > 0, (field_weights * np.nan_to_num(neighbour_values)).sum(axis=1)
+                                         / total, np.nan)
+        return result
+
+    def weather_at(self, lat, lon, method="idw", k=3):
+        """Weather record for one location"""
+        result = self.idw(lat, lon, k=k) if method == "idw" else self.nearest(lat, lon)
+        record = {"lat": lat, "lon": lon, "method": method,
+                  "district": result["district"][0], "distance_km": round(float(result["distance_km"][0]), 2)}
+        for field in FIELDS:
+            value = float(result[field][0])
+            record[field] = None if np.isnan(value) else round(value, 2)
+        return record
+
+
+def load_station_index(path=weather_file):
+    """StationIndex over the latest weather.json and the district coordinates in weather.py"""
+    from weather import districts
+
+    with open(path, "r", encoding="utf-8") as f:
+        rows = json.load(f)
+    return StationIndex(rows, districts)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python stations.py LAT LON")
+    index = load_station_index()
+    print(json.dumps(index.weather_at(float(sys.argv[1]), float(sys.argv[2])), indent=4, ensure_ascii=False))
@@ -1,6 +1,6 @@
 import requests
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import os
 
@@ -27,58 +27,98 @@ districts = {
     "Kasaragod": (12.5000, 75.2000)
 }
 
-results = []
-
-for district, (lat, lon) in districts.items():
-    url = f"https://{API_HOST}/latlon"
-    querystring = {
-        "latitude": lat,
-        "longitude": lon,
-        "lang": "EN"
-    }
-    headers = {
-        "x-rapidapi-host": API_HOST,
-        "x-rapidapi-key": API_KEY
-    }
-    response = requests.get(url, headers=headers, params=querystring)
-
-    if response.status_code != 200:
-        results.append({
-            "district": district,
-            "error": f"Failed to fetch data ({response.status_code})"
-        })
-        continue
-
-    data = response.json()
-    if "weather" in data and len(data["weather"]) > 0:
-        weather_info = data["weather"][0]
-        main = weather_info.get("main", "")
-        description = weather_info.get("description", "")
-        temp = data.get("main", {}).get("temp")
-        feels_like = data.get("main", {}).get("feels_like")
-        humidity = data.get("main", {}).get("humidity")
-        dt = datetime.fromtimestamp(data.get("dt", 0)).isoformat()
-        temp_c = temp - 273.15 if temp is not None else None
-        feels_like_c = feels_like - 273.15 if feels_like is not None else None
-        results.append({
-            "district": district,
-            "time": dt,
-            "temperature_c": round(temp_c, 2) if temp_c is not None else None,
-            "feels_like_c": round(feels_like_c, 2) if feels_like_c is not None else None,
-            "humidity": humidity,
-            "weather": main,
-            "description": description
-        })
-    else:
-        results.append({
-            "district": district,
-            "error": "No weather data available"
-        })
-
-# Write results to a JSON file
-output_file = r"C:\SIH_BACKEND\External_data\weather\weather.json"
-with open(output_file, "w", encoding="utf-8") as f:
-    json.dump(results, f, indent=4, ensure_ascii=False)
-
-# Print confirmation
-print(f"Weather data saved to {output_file}")
+output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather.json")
+# Recent rows of every fetch, for the sustained-condition rules in alerts.py
+history_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather_history.json")
+HISTORY_HOURS = 72
+
+
+def fetch_weather(session=None):
+    """Current weather for every district (pass a requests.Session to reuse connections)"""
+    http = session or requests
+    results = []
+
+    for district, (lat, lon) in districts.items():
+        url = f"https://{API_HOST}/latlon"
+        querystring = {
+            "latitude": lat,
+            "longitude": lon,
+            "lang": "EN"
+        }
+        headers = {
+            "x-rapidapi-host": API_HOST,
+            "x-rapidapi-key": API_KEY
+        }
+        response = http.get(url, headers=headers, params=querystring)
+
+        if response.status_code != 200:
+            results.append({
+                "district": district,
+                "error": f"Failed to fetch data ({response.status_code})"
+            })
+            continue
+
+        data = response.json()
+        if "weather" in data and len(data["weather"]) > 0:
+            weather_info = data["weather"][0]
+            main = weather_info.get("main", "")
+            description = weather_info.get("description", "")
+            temp = data.get("main", {}).get("temp")
+            feels_like = data.get("main", {}).get("feels_like")
+            humidity = data.get("main", {}).get("humidity")
+            dt = datetime.fromtimestamp(data.get("dt", 0)).isoformat()
+            temp_c = temp - 273.15 if temp is not None else None
+            feels_like_c = feels_like - 273.15 if feels_like is not None else None
+            results.append({
+                "district": district,
+                "time": dt,
+                "temperature_c": round(temp_c, 2) if temp_c is not None else None,
+                "feels_like_c": round(feels_like_c, 2) if feels_like_c is not None else None,
+                "humidity": humidity,
+                "weather": main,
+                "description": description
+            })
+        else:
+            results.append({
+                "district": district,
+                "error": "No weather data available"
+            })
+    return results
+
+
+def save_weather(results, path=output_file):
+    """Write results to a JSON file"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    return path
+
+
+def append_history(results, path=history_file, hours=HISTORY_HOURS):
+    """Add the fetched rows to the history, keeping the last `hours` hours"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            history = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        history = []
+    rows = {(row["district"], row["time"]): row for row in history + results if "error" not in row and row.get("time")}
+    if not rows:
+        return []
+    cutoff = (datetime.fromisoformat(max(time for _, time in rows)) - timedelta(hours=hours)).isoformat()
+    history = sorted((row for (_, time), row in rows.items() if time >= cutoff),
+                     key=lambda row: (row["time"], row["district"]))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=4, ensure_ascii=False)
+    return history
+
+
+if __name__ == "__main__":
+    from alerts import update_alerts
+
+    results = fetch_weather()
+    save_weather(results)
+    append_history(results)
+    alerts = update_alerts()
+
+    # Print confirmation
+    print(f"Weather data saved to {output_file}")
+    print(f"{len(alerts)} active weather alerts saved")
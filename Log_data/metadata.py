@@ -3,6 +3,7 @@ from typing import List, Optional
 from llama_cloud import ExtractConfig, ExtractMode
 from llama_cloud_services import LlamaExtract
 from dotenv import load_dotenv
+import json
 import os
 
 # Load variables from .env
@@ -76,8 +77,13 @@ class FarmLog(BaseModel):
 config = ExtractConfig(extraction_mode=ExtractMode.FAST)
 
 # Extract data from farm log file
-farm_log_file = "C:\SIH_BACKEND\Log_data\sample.txt"  # replace with your file
+farm_log_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample.txt")  # replace with your file
 result = extractor.extract(FarmLog, config, farm_log_file)
 
 # Print structured metadata
-print(result.data)
\ No newline at end of file
+print(result.data)
+
+# Save for combine.py
+metadata_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "metadata.json")
+with open(metadata_file, "w", encoding="utf-8") as f:
+    json.dump(result.data, f, indent=4, ensure_ascii=False)
\ No newline at end of file
@@ -1,10 +1,16 @@
 import json
+import os
+
+from recommend import recommend_schemes
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Paths to individual JSON outputs
-news_path = r"C:\SIH_BACKEND\External_data\scheme_news\news.json"
-scheme_path = r"C:\SIH_BACKEND\External_data\scheme_news\schemes.json"
-weather_path = r"C:\SIH_BACKEND\External_data\weather\weather.json"
-log_path = r"C:\SIH_BACKEND\Log_data\metadata.json"   # assuming you save farm log result here
+news_path = os.path.join(BASE_DIR, "External_data", "scheme_news", "news.json")
+scheme_path = os.path.join(BASE_DIR, "External_data", "scheme_news", "schemes.json")
+weather_path = os.path.join(BASE_DIR, "External_data", "weather", "weather.json")
+alerts_path = os.path.join(BASE_DIR, "External_data", "weather", "alerts.json")   # weather alerts from alerts.py
+log_path = os.path.join(BASE_DIR, "Log_data", "metadata.json")   # farm log result saved by metadata.py
 
 # Load JSON files
 def load_json(path):
@@ -16,22 +22,32 @@ def load_json(path):
     except json.JSONDecodeError:
         return None
 
-news_data = load_json(news_path)
-scheme_data = load_json(scheme_path)
-weather_data = load_json(weather_path)
-log_data = load_json(log_path)
-
-# Combine all into single JSON
-final_data = {
-    "news": news_data if news_data else [],
-    "scheme": scheme_data if scheme_data else [],
-    "weather": weather_data if weather_data else [],
-    "log": log_data if log_data else {}
-}
-
-# Save combined JSON
-output_path = r"C:\SIH_BACKEND\combined_data.json"
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(final_data, f, indent=4, ensure_ascii=False)
-
-print(f"✅ Combined JSON saved to {output_path}")
+def combine(output_path=os.path.join(BASE_DIR, "combined_data.json")):
+    """Merge the news, scheme, weather, alert and farm log outputs (plus scheme recommendations) into combined_data.json"""
+    news_data = load_json(news_path)
+    scheme_data = load_json(scheme_path)
+    weather_data = load_json(weather_path)
+    alert_data = load_json(alerts_path)
+    log_data = load_json(log_path)
+
+    # Combine all into single JSON
+    final_data = {
+        "news": news_data if news_data else [],
+        "scheme": scheme_data if scheme_data else [],
+        "weather": weather_data if weather_data else [],
+        "alerts": alert_data if alert_data else [],
+        "log": log_data if log_data else {},
+        # Ranked schemes for each farm log, in log order (recommend.py)
+        "recommendations": recommend_schemes(scheme_data, log_data)
+    }
+
+    # Save combined JSON
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(final_data, f, indent=4, ensure_ascii=False)
+
+    print(f"✅ Combined JSON saved to {output_path}")
+    return final_data
+
+
+if __name__ == "__main__":
+    combine()
@@ -1,55 +1,67 @@
 import json
-from datetime import timedelta
+import os
 import traceback
 
-from couchbase.exceptions import CouchbaseException
-from couchbase.auth import PasswordAuthenticator
-from couchbase.cluster import Cluster
-from couchbase.options import ClusterOptions
-
-# --- Couchbase Connection ---
-endpoint = "couchbases://cb.1rsxs0hrd0ojm0pu.cloud.couchbase.com"  # Replace with your Capella endpoint
-username = "SIH-2025"   # Replace with your cluster username
-password = "Sih-2025"   # Replace with your cluster password
-bucket_name = "travel-sample"   # You can use another bucket if needed
-scope_name = "tenant_agent_00"   # Use default scope unless you created a custom one
-collection_name = "bookings"   # Use default collection unless you created a custom one
-
-# --- Load your combined JSON file ---
-combined_json_path = r"C:\SIH_BACKEND\combined_data.json"
-with open(combined_json_path, "r", encoding="utf-8") as f:
-    combined_data = json.load(f)
-
-# --- Connect to Couchbase ---
-auth = PasswordAuthenticator(username, password)
-options = ClusterOptions(auth)
-options.apply_profile("wan_development")
-
-try:
-    cluster = Cluster(endpoint, options)
-    cluster.wait_until_ready(timedelta(seconds=10))
-
-    # Get bucket, scope, and collection
-    cb = cluster.bucket(bucket_name)
-    cb_coll = cb.scope(scope_name).collection(collection_name)
-
-    # Key for your document (unique ID in Couchbase)
-    key = "combined_json_2025"
-
-    # Insert combined JSON into Couchbase
-    try:
-        result = cb_coll.insert(key, combined_data)
-        print("\n✅ Inserted combined JSON into Couchbase. CAS:", result.cas)
-    except CouchbaseException as e:
-        print("\n⚠️ Insert failed:", e)
+from query import CouchbaseQueryBackend, item_documents
+from shard import build_shards, index_key
+from storage import get_store, close_store
+
+combined_json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "combined_data.json")
+
+# Key for the full combined document (unique ID in Couchbase)
+key = "combined_json_2025"
+
+
+def sync(combined_data, store=None):
+    """Push the combined document, its shards and item documents to Couchbase"""
+    # Connection settings (endpoint, credentials, durability, timeouts) come from storage.StorageConfig
+    store = store or get_store()
+
+    # Per-district shards and their index, plus one typed document per news/scheme/weather item for querying
+    documents = build_shards(combined_data)
+    items = item_documents(combined_data)
+    documents.update(items)
+
+    # The index lists the item keys of this sync, so the next one can remove items that are gone
+    # (news and schemes no longer published, weather rows of earlier fetches)
+    previous_index = store.get(index_key()) or {}
+    stale = set(previous_index.get("items") or []) - set(items)
+    documents[index_key()]["items"] = sorted(items)
+
+    # Combined document: only the sections (news/scheme/weather/alerts/log/recommendations) that changed are sent
+    changed = store.update_sections(key, combined_data)
+    if changed:
+        print(f"\n✅ Updated {key}: {', '.join(changed)}")
+    else:
+        print(f"\n✅ {key} already up to date")
+
+    # Shards and items: upsert concurrently; keys are stable so re-runs overwrite instead of failing
+    results, errors = store.bulk_upsert(documents)
+
+    print(f"\n✅ Upserted {len(results)}/{len(documents)} shard and item documents into Couchbase")
+    for failed_key, error in errors.items():
+        print(f"\n⚠️ Upsert failed for {failed_key}:", error)
+
+    if stale:
+        errors = store.bulk_remove(stale)
+        print(f"\n🗑️  Removed {len(stale) - len(errors)}/{len(stale)} item documents no longer in the combined data")
+        for failed_key, error in errors.items():
+            print(f"\n⚠️ Remove failed for {failed_key}:", error)
+
+    # Secondary indexes used by query.py (no-op when they already exist); the in-memory store has none
+    if store.cluster is not None:
+        CouchbaseQueryBackend(store.cluster, store.config).ensure_indexes()
+    return changed
+
+
+if __name__ == "__main__":
+    # --- Load your combined JSON file ---
+    with open(combined_json_path, "r", encoding="utf-8") as f:
+        combined_data = json.load(f)
 
-    # Retrieve it back
     try:
-        result = cb_coll.get(key)
-        print("\n📥 Retrieved JSON from Couchbase:")
-        print(json.dumps(result.content_as[dict], indent=4, ensure_ascii=False))
-    except CouchbaseException as e:
-        print("\n⚠️ Fetch failed:", e)
-
-except Exception as e:
-    traceback.print_exc()
+        sync(combined_data)
+    except Exception as e:
+        traceback.print_exc()
+    finally:
+        close_store()
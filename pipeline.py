@@ -0,0 +1,259 @@
+"""
+Dependency-aware runner for the whole backend refresh
+
+Each stage is one of the existing scripts, declared with the files it reads
+and writes. Dependencies follow from those paths (a stage waits for the
+stages producing its inputs), so independent stages - scraping, weather,
+pests, the farm-log extraction - run concurrently and a full refresh takes
+as long as the critical path.
+
+A stage with inputs is skipped when the content hash of its inputs and of
+its script matches the last successful run and its outputs still exist -
+e.g. the BART classification in news.py is not rerun when the scrape
+produced the same news.ndjson. Stages without inputs fetch from the network
+and always run. Timings, fingerprints and the critical path are saved to
+.pipeline_state.json; each stage's output goes to logs/pipeline/<stage>.log.
+
+    python pipeline.py                    # refresh everything that changed
+    python pipeline.py --dry-run          # show stages, dependencies and last timings
+    python pipeline.py --stages combine,database --force
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+state_path = os.path.join(BASE_DIR, ".pipeline_state.json")
+log_dir = os.path.join(BASE_DIR, "logs", "pipeline")
+
+
+@dataclass
+class Stage:
+    name: str
+    script: str  # relative to BASE_DIR; run with its own directory as cwd
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+
+    @property
+    def script_path(self):
+        return os.path.join(BASE_DIR, self.script)
+
+
+STAGES = [
+    Stage("scrape", "External_data/scheme_news/multi_source_scraper.py",
+          outputs=["External_data/scheme_news/output2/news.ndjson",
+                   "External_data/scheme_news/output2/schemes.ndjson"]),
+    Stage("news", "External_data/scheme_news/news.py",
+          inputs=["External_data/scheme_news/output2/news.ndjson"],
+          outputs=["External_data/scheme_news/news.json"]),
+    Stage("schemes", "External_data/scheme_news/scheme.py",
+          inputs=["External_data/scheme_news/output2/schemes.ndjson"],
+          outputs=["External_data/scheme_news/schemes.json"]),
+    Stage("weather", "External_data/weather/weather.py",
+          outputs=["External_data/weather/weather.json",
+                   "External_data/weather/alerts.json"]),
+    Stage("pests", "External_data/pest_info/pest.py"),
+    Stage("metadata", "Log_data/metadata.py",
+          inputs=["Log_data/sample.txt"],
+          outputs=["Log_data/metadata.json"]),
+    Stage("combine", "combine.py",
+          inputs=["External_data/scheme_news/news.json",
+                  "External_data/scheme_news/schemes.json",
+                  "External_data/weather/weather.json",
+                  "External_data/weather/alerts.json",
+                  "Log_data/metadata.json",
+                  "recommend.py"],
+          outputs=["combined_data.json"]),
+    Stage("database", "database.py",
+          inputs=["combined_data.json"]),
+]
+
+
+def dependencies(stages):
+    """{stage name: set of stage names producing its inputs}"""
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            producers[path] = stage.name
+    return {stage.name: {producers[path] for path in stage.inputs if path in producers} for stage in stages}
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(stage):
+    """Hash of the stage script and the content of every input (None if an input is missing)"""
+    digest = hashlib.sha256(file_hash(stage.script_path).encode())
+    for path in stage.inputs:
+        full_path = os.path.join(BASE_DIR, path)
+        if not os.path.exists(full_path):
+            return None
+        digest.update(f"{path}:{file_hash(full_path)}".encode())
+    return digest.hexdigest()
+
+
+def load_state():
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"stages": {}}
+
+
+def save_state(state):
+    fd, tmp_path = tempfile.mkstemp(dir=BASE_DIR, prefix=".pipeline_state.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+
+def critical_path(stages, deps, durations):
+    """(seconds, [stage names]) of the longest dependency chain by duration"""
+    finish = {}
+    chain = {}
+    for stage in stages:  # STAGES is listed in dependency order
+        before = max(deps[stage.name], key=lambda name: finish.get(name, 0.0), default=None)
+        finish[stage.name] = durations.get(stage.name, 0.0) + (finish[before] if before else 0.0)
+        chain[stage.name] = (chain[before] if before else []) + [stage.name]
+    end = max(finish, key=finish.get)
+    return finish[end], chain[end]
+
+
+def run_stage(stage):
+    """Run the stage script; returns (ok, seconds)"""
+    os.makedirs(log_dir, exist_ok=True)
+    started = time.perf_counter()
+    with open(os.path.join(log_dir, f"{stage.name}.log"), "w", encoding="utf-8") as log:
+        completed = subprocess.run(
+            [sys.executable, stage.script_path],
+            cwd=os.path.dirname(stage.script_path),
+            stdout=log, stderr=subprocess.STDOUT
+        )
+    return completed.returncode == 0, time.perf_counter() - started
+
+
+class PipelineRunner:
+    """Runs stages in dependency order with up to `workers` stages at once"""
+
+    def __init__(self, stages=STAGES, workers=4, force=False):
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = list(stages)
+        self.deps = dependencies(stages)
+        self.workers = workers
+        self.force = force
+        self.state = load_state()
+        self.results = {}
+        self._lock = threading.Lock()
+
+    def should_skip(self, stage):
+        """Unchanged inputs + same script + outputs present = nothing to do"""
+        if self.force or not stage.inputs:
+            return False
+        previous = self.state["stages"].get(stage.name, {})
+        if not previous.get("ok") or previous.get("fingerprint") != fingerprint(stage):
+            return False
+        # An upstream stage that re-ran and changed our inputs changes the fingerprint too
+        return all(os.path.exists(os.path.join(BASE_DIR, path)) for path in stage.outputs)
+
+    def execute(self, stage):
+        if self.should_skip(stage):
+            print(f"⏭️  {stage.name}: inputs unchanged, skipped")
+            return "skipped", 0.0
+        print(f"🚀 {stage.name}: running {stage.script}")
+        ok, seconds = run_stage(stage)
+        with self._lock:
+            self.state["stages"][stage.name] = {
+                "ok": ok,
+                "seconds": round(seconds, 3),
+                "fingerprint": fingerprint(stage) if ok else None,
+                "finished_at": datetime.now().isoformat()
+            }
+        print(f"{'✅' if ok else '❌'} {stage.name}: {seconds:.1f}s")
+        return ("ok" if ok else "failed"), seconds
+
+    def run(self, selected=None):
+        """Run the selected stages (default all); returns {name: (status, seconds)}"""
+        selected = set(selected or self.stages)
+        pending = [stage for stage in self.order if stage.name in selected]
+        running = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            while pending or running:
+                for stage in list(pending):
+                    upstream = [name for name in self.deps[stage.name] if name in selected]
+                    if any(self.results.get(name, ("",))[0] in ("failed", "blocked") for name in upstream):
+                        self.results[stage.name] = ("blocked", 0.0)
+                        print(f"⛔ {stage.name}: upstream stage failed")
+                        pending.remove(stage)
+                    elif all(name in self.results for name in upstream):
+                        running[executor.submit(self.execute, stage)] = stage.name
+                        pending.remove(stage)
+                if not running:
+                    if pending:
+                        raise RuntimeError(f"Stages cannot be scheduled: {[stage.name for stage in pending]}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.results[running.pop(future)] = future.result()
+
+        wall = time.perf_counter() - started
+        durations = {name: seconds for name, (_, seconds) in self.results.items()}
+        path_seconds, path = critical_path(self.order, self.deps, durations)
+        self.state["last_run"] = {
+            "finished_at": datetime.now().isoformat(),
+            "wall_seconds": round(wall, 3),
+            "critical_path": path,
+            "critical_path_seconds": round(path_seconds, 3),
+            "results": {name: {"status": status, "seconds": round(seconds, 3)}
+                        for name, (status, seconds) in self.results.items()}
+        }
+        save_state(self.state)
+        print(f"\n⏱️  Wall time {wall:.1f}s, critical path {' → '.join(path)} ({path_seconds:.1f}s)")
+        return self.results
+
+
+def describe(runner):
+    """Print the stage graph with the last recorded timings"""
+    durations = {name: info.get("seconds", 0.0) for name, info in runner.state["stages"].items()}
+    for stage in runner.order:
+        after = ", ".join(sorted(runner.deps[stage.name])) or "-"
+        last = durations.get(stage.name)
+        print(f"   {stage.name:<10} after: {after:<36} last: {f'{last:.1f}s' if last is not None else '-'}")
+    path_seconds, path = critical_path(runner.order, runner.deps, durations)
+    print(f"\n📈 Critical path: {' → '.join(path)} ({path_seconds:.1f}s with last timings)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the backend refresh pipeline")
+    parser.add_argument("--stages", help="comma-separated stage names to run (default: all)")
+    parser.add_argument("--workers", type=int, default=4, help="stages run at the same time")
+    parser.add_argument("--force", action="store_true", help="run stages even if their inputs are unchanged")
+    parser.add_argument("--dry-run", action="store_true", help="show the plan without running anything")
+    args = parser.parse_args()
+
+    runner = PipelineRunner(workers=args.workers, force=args.force)
+    selected = args.stages.split(",") if args.stages else None
+    unknown = set(selected or []) - set(runner.stages)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}; available: {', '.join(runner.stages)}")
+
+    if args.dry_run:
+        describe(runner)
+    else:
+        results = runner.run(selected)
+        sys.exit(0 if all(status in ("ok", "skipped") for status, _ in results.values()) else 1)
@@ -0,0 +1,263 @@
+"""
+Query layer over the stored agriculture data
+
+Each news item, scheme and weather row is also stored as its own small
+document with a `type` field, so it can be indexed and queried server-side
+instead of downloading combined_json_2025 and filtering client-side:
+
+- news by harmful score     -> idx_agri_news_harmful
+- schemes by keyword        -> idx_agri_scheme_keywords
+- weather by district/time  -> idx_agri_weather_district_time
+
+CouchbaseQueryBackend runs parameterized SQL++ against Capella;
+SQLiteQueryBackend implements the same calls on a local (default in-memory)
+SQLite database so query latency can be benchmarked offline.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+ITEM_KEY_PREFIX = "combined_json_2025"
+HARMFUL_LABEL = "Harmful for farmers"
+
+
+@dataclass
+class Page:
+    """One page of query results"""
+    items: list = field(default_factory=list)
+    offset: int = 0
+    limit: int = 20
+    has_more: bool = False
+
+    @property
+    def next_offset(self):
+        return self.offset + len(self.items) if self.has_more else None
+
+
+def _item_id(*parts):
+    return hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:16]
+
+
+def item_documents(combined_data):
+    """{key: document} with one typed document per news item, scheme and weather row"""
+    documents = {}
+
+    for item in combined_data.get("news") or []:
+        key = f"{ITEM_KEY_PREFIX}::news::{_item_id(item.get('title'))}"
+        documents[key] = {
+            "type": "news",
+            "title": item.get("title"),
+            "content": item.get("content"),
+            "harmful_score": (item.get("scores") or {}).get(HARMFUL_LABEL, 0.0),
+            "scores": item.get("scores") or {}
+        }
+
+    for item in combined_data.get("scheme") or []:
+        key = f"{ITEM_KEY_PREFIX}::scheme::{_item_id(item.get('scheme_name'))}"
+        documents[key] = {
+            "type": "scheme",
+            "scheme_name": item.get("scheme_name"),
+            "scheme_details": item.get("scheme_details"),
+            "keywords": [k.lower() for k in item.get("keywords") or [] if k]
+        }
+
+    for row in combined_data.get("weather") or []:
+        if "error" in row:
+            continue
+        key = f"{ITEM_KEY_PREFIX}::weather::{_item_id(row.get('district'), row.get('time'))}"
+        document = dict(row)
+        document["type"] = "weather"
+        documents[key] = document
+
+    return documents
+
+
+def _page(rows, offset, limit):
+    """Build a Page from a query that fetched limit + 1 rows"""
+    return Page(items=rows[:limit], offset=offset, limit=limit, has_more=len(rows) > limit)
+
+
+class QueryBackend(ABC):
+    """Parameterized queries with offset/limit paging"""
+
+    @abstractmethod
+    def news_by_harmful_score(self, min_score=0.5, offset=0, limit=20):
+        """News with harmful score >= min_score, most harmful first"""
+
+    @abstractmethod
+    def schemes_by_keyword(self, keyword, offset=0, limit=20):
+        """Schemes tagged with keyword, by name"""
+
+    @abstractmethod
+    def weather_by_district(self, district, start=None, end=None, offset=0, limit=20):
+        """Weather rows of a district between ISO times start and end, newest first"""
+
+
+class CouchbaseQueryBackend(QueryBackend):
+    """SQL++ queries over the typed item documents in one collection"""
+
+    INDEXES = {
+        "idx_agri_news_harmful": "(harmful_score DESC) WHERE type = 'news'",
+        "idx_agri_scheme_keywords": "(DISTINCT ARRAY k FOR k IN keywords END, scheme_name) WHERE type = 'scheme'",
+        "idx_agri_weather_district_time": "(district, time DESC) WHERE type = 'weather'",
+    }
+
+    def __init__(self, cluster, config):
+        self.cluster = cluster
+        self.config = config
+        self.keyspace = f"`{config.bucket_name}`.`{config.scope_name}`.`{config.collection_name}`"
+
+    def ensure_indexes(self):
+        """Create the secondary indexes if they do not exist yet"""
+        for name, definition in self.INDEXES.items():
+            self._run(f"CREATE INDEX IF NOT EXISTS {name} ON {self.keyspace}{definition}", {})
+
+    def _run(self, statement, params):
+        from couchbase.options import QueryOptions
+        options = QueryOptions(named_parameters=params, timeout=timedelta(seconds=self.config.kv_timeout))
+        return list(self.cluster.query(statement, options).rows())
+
+    def news_by_harmful_score(self, min_score=0.5, offset=0, limit=20):
+        rows = self._run(
+            f"SELECT META(d).id AS `key`, d.title, d.content, d.harmful_score FROM {self.keyspace} d "
+            "WHERE d.type = 'news' AND d.harmful_score >= $min_score "
+            "ORDER BY d.harmful_score DESC OFFSET $offset LIMIT $limit",
+            {"min_score": min_score, "offset": offset, "limit": limit + 1}
+        )
+        return _page(rows, offset, limit)
+
+    def schemes_by_keyword(self, keyword, offset=0, limit=20):
+        rows = self._run(
+            f"SELECT META(d).id AS `key`, d.scheme_name, d.scheme_details, d.keywords FROM {self.keyspace} d "
+            "WHERE d.type = 'scheme' AND ANY k IN d.keywords SATISFIES k = $keyword END "
+            "ORDER BY d.scheme_name OFFSET $offset LIMIT $limit",
+            {"keyword": keyword.lower(), "offset": offset, "limit": limit + 1}
+        )
+        return _page(rows, offset, limit)
+
+    def weather_by_district(self, district, start=None, end=None, offset=0, limit=20):
+        rows = self._run(
+            f"SELECT META(d).id AS `key`, d.district, d.time, d.temperature_c, d.feels_like_c, "
+            f"d.humidity, d.weather, d.description FROM {self.keyspace} d "
+            "WHERE d.type = 'weather' AND d.district = $district "
+            "AND d.time >= $start AND d.time <= $end "
+            "ORDER BY d.time DESC OFFSET $offset LIMIT $limit",
+            {"district": district, "start": start or "", "end": end or "9999",
+             "offset": offset, "limit": limit + 1}
+        )
+        return _page(rows, offset, limit)
+
+
+class SQLiteQueryBackend(QueryBackend):
+    """Same queries on a local SQLite database, for offline use and benchmarks"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS news (
+            key TEXT PRIMARY KEY, title TEXT, content TEXT, harmful_score REAL
+        );
+        CREATE TABLE IF NOT EXISTS scheme (
+            key TEXT PRIMARY KEY, scheme_name TEXT, scheme_details TEXT, keywords TEXT
+        );
+        CREATE TABLE IF NOT EXISTS scheme_keyword (
+            keyword TEXT, key TEXT, PRIMARY KEY (keyword, key)
+        );
+        CREATE TABLE IF NOT EXISTS weather (
+            key TEXT PRIMARY KEY, district TEXT, time TEXT, temperature_c REAL,
+            feels_like_c REAL, humidity REAL, weather TEXT, description TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_agri_news_harmful ON news (harmful_score DESC);
+        CREATE INDEX IF NOT EXISTS idx_agri_weather_district_time ON weather (district, time DESC);
+    """
+
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(self.SCHEMA)
+
+    def load(self, documents):
+        """Insert or replace typed item documents (see item_documents)"""
+        with self.conn:
+            for key, doc in documents.items():
+                if doc["type"] == "news":
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO news VALUES (?, ?, ?, ?)",
+                        (key, doc["title"], doc["content"], doc["harmful_score"]))
+                elif doc["type"] == "scheme":
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO scheme VALUES (?, ?, ?, ?)",
+                        (key, doc["scheme_name"], doc["scheme_details"], json.dumps(doc["keywords"])))
+                    self.conn.execute("DELETE FROM scheme_keyword WHERE key = ?", (key,))
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO scheme_keyword VALUES (?, ?)",
+                        [(keyword, key) for keyword in doc["keywords"]])
+                elif doc["type"] == "weather":
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO weather VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (key, doc.get("district"), doc.get("time"), doc.get("temperature_c"),
+                         doc.get("feels_like_c"), doc.get("humidity"), doc.get("weather"),
+                         doc.get("description")))
+        return self
+
+    def _rows(self, statement, params):
+        return [dict(row) for row in self.conn.execute(statement, params).fetchall()]
+
+    def news_by_harmful_score(self, min_score=0.5, offset=0, limit=20):
+        rows = self._rows(
+            "SELECT key, title, content, harmful_score FROM news WHERE harmful_score >= :min_score "
+            "ORDER BY harmful_score DESC LIMIT :limit OFFSET :offset",
+            {"min_score": min_score, "offset": offset, "limit": limit + 1}
+        )
+        return _page(rows, offset, limit)
+
+    def schemes_by_keyword(self, keyword, offset=0, limit=20):
+        rows = self._rows(
+            "SELECT s.key, s.scheme_name, s.scheme_details, s.keywords FROM scheme_keyword k "
+            "JOIN scheme s ON s.key = k.key WHERE k.keyword = :keyword "
+            "ORDER BY s.scheme_name LIMIT :limit OFFSET :offset",
+            {"keyword": keyword.lower(), "offset": offset, "limit": limit + 1}
+        )
+        for row in rows:
+            row["keywords"] = json.loads(row["keywords"])
+        return _page(rows, offset, limit)
+
+    def weather_by_district(self, district, start=None, end=None, offset=0, limit=20):
+        rows = self._rows(
+            "SELECT key, district, time, temperature_c, feels_like_c, humidity, weather, description "
+            "FROM weather WHERE district = :district AND time >= :start AND time <= :end "
+            "ORDER BY time DESC LIMIT :limit OFFSET :offset",
+            {"district": district, "start": start or "", "end": end or "9999",
+             "offset": offset, "limit": limit + 1}
+        )
+        return _page(rows, offset, limit)
+
+
+def benchmark(backend, runs=200):
+    """Average latency in milliseconds of each query against a backend"""
+    queries = {
+        "news_by_harmful_score": lambda: backend.news_by_harmful_score(0.5),
+        "schemes_by_keyword": lambda: backend.schemes_by_keyword("agriculture"),
+        "weather_by_district": lambda: backend.weather_by_district("Thrissur"),
+    }
+    timings = {}
+    for name, run in queries.items():
+        start = time.perf_counter()
+        for _ in range(runs):
+            run()
+        timings[name] = (time.perf_counter() - start) * 1000 / runs
+    return timings
+
+
+if __name__ == "__main__":
+    combined_json_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "combined_data.json")
+    with open(combined_json_path, "r", encoding="utf-8") as f:
+        combined_data = json.load(f)
+
+    backend = SQLiteQueryBackend().load(item_documents(combined_data))
+    print("📊 SQLite query latency (offline):")
+    for name, ms in benchmark(backend).items():
+        print(f"   {name}: {ms:.3f} ms")
@@ -0,0 +1,256 @@
+"""
+Scheme recommendations for farm logs
+
+Connects the FarmLog extracted by Log_data/metadata.py (crops, irrigation
+method, fertilizers applied, pests, tasks...) with the schemes exported by
+scheme.py. Both sides are reduced to the same features:
+
+- crop:<name>       paddy, coconut, banana, rubber, vegetables, ...
+- activity:<name>   irrigation, soil health, plant protection, insurance, ...
+- kw:<word>         scheme keywords (scheme.py) that also appear in the log
+
+SchemeMatcher builds an inverted index once per scheme list: feature ->
+(schemes, weight), weighted by how rare the feature is among the schemes and
+normalized per scheme, so a page listing every scheme does not outrank the
+scheme about paddy insurance. A batch of logs is scored in one pass over the
+postings of the features the logs contain (NumPy gather + bincount), never by
+comparing every log with every scheme, and the top schemes of each log are
+picked with argpartition.
+
+    python recommend.py            # recommendations for the log in combined_data.json
+"""
+import json
+import math
+import os
+import re
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CROP_TERMS = {
+    "paddy": ["paddy", "rice", "nel", "നെല്ല്", "നെൽ"],
+    "coconut": ["coconut", "coconuts", "copra", "coir", "തെങ്ങ്", "നാളികേരം"],
+    "banana": ["banana", "bananas", "plantain", "വാഴ"],
+    "rubber": ["rubber", "latex", "റബ്ബർ"],
+    "pepper": ["pepper", "black pepper", "കുരുമുളക്"],
+    "cardamom": ["cardamom", "ഏലം"],
+    "spices": ["spice", "spices", "ginger", "turmeric", "nutmeg", "clove"],
+    "vegetables": ["vegetable", "vegetables", "okra", "bitter gourd", "brinjal", "long beans", "tomato",
+                   "cowpea", "amaranthus", "പച്ചക്കറി"],
+    "fruits": ["fruit", "fruits", "mango", "pineapple", "jackfruit", "horticulture"],
+    "tea_coffee": ["tea", "coffee", "plantation crops"],
+    "cashew_arecanut": ["cashew", "arecanut", "areca"],
+    "pulses_oilseeds": ["pulses", "oilseeds", "oil palm", "millets", "groundnut"],
+}
+
+ACTIVITY_TERMS = {
+    "irrigation": ["irrigation", "irrigate", "irrigated", "watered", "watering", "drip", "sprinkler",
+                   "micro irrigation", "water channels", "borewell", "pump", "per drop more crop"],
+    "soil_health": ["soil", "soil test", "soil health", "soil moisture", "nutrient", "fertilizer", "fertilizers",
+                    "fertiliser", "urea", "nitrogen", "deficiency", "manure"],
+    "organic": ["organic", "neem", "compost", "vermicompost", "bio fertilizer", "natural farming"],
+    "plant_protection": ["pest", "pests", "aphid", "aphids", "disease", "diseases", "fungal", "infection",
+                         "pesticide", "spray", "plant protection"],
+    "crop_insurance": ["insurance", "crop loss", "damage", "drought", "heatwave", "flood", "bima"],
+    "mechanization": ["machinery", "machine", "tractor", "equipment", "tiller", "harvester", "mechanization",
+                      "mechanisation"],
+    "livestock": ["cow", "cows", "cattle", "cow shed", "dairy", "milk", "livestock", "goat", "poultry",
+                  "animal husbandry", "feeding trough", "fisheries"],
+    "credit": ["loan", "loans", "credit", "kisan credit card", "kcc", "interest subvention"],
+    "market": ["market", "markets", "price", "prices", "enam", "procurement", "msp", "sold"],
+    "post_harvest": ["harvest", "harvested", "post harvest", "storage", "warehouse", "cold storage"],
+}
+
+# Feature weight on the log side: what is grown counts more than what was done
+FEATURE_WEIGHTS = {"crop": 3.0, "activity": 2.0, "kw": 1.0}
+
+# FarmLog fields read from each log (nested keys joined with '.')
+LOG_FIELDS = [
+    "crops",
+    "irrigation.fields_watered", "irrigation.method", "irrigation.water_source",
+    "soil_fertilizer.soil_condition", "soil_fertilizer.soil_tests", "soil_fertilizer.fertilizers_applied",
+    "pest_disease.observed", "pest_disease.treatment_applied", "pest_disease.damage_notes",
+    "labor_operations.tasks_completed",
+    "machinery.equipment_used", "machinery.maintenance_notes",
+    "additional_notes",
+]
+
+# Words, Malayalam vowel signs and virama included
+_WORD = re.compile(r"[\w\u0d00-\u0d7f]+")
+
+
+def _term_lookup():
+    """{term: feature} for every crop and activity term, and the longest term in words"""
+    lookup = {}
+    for prefix, terms in (("crop", CROP_TERMS), ("activity", ACTIVITY_TERMS)):
+        for name, words in terms.items():
+            for word in words:
+                lookup[" ".join(_WORD.findall(word.lower()))] = f"{prefix}:{name}"
+    return lookup, max(len(term.split()) for term in lookup)
+
+
+def _field_text(log, path):
+    value = log
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return ""
+        value = value.get(part)
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value if v)
+    return str(value) if value else ""
+
+
+def log_text(log):
+    """The FarmLog fields that say what the farm grows and does, as one text"""
+    return " ".join(_field_text(log, path) for path in LOG_FIELDS)
+
+
+def _as_list(section):
+    """A single log dict, a list of logs or nothing -> list of logs"""
+    if not section:
+        return []
+    if isinstance(section, dict):
+        return [section]
+    return list(section)
+
+
+class SchemeMatcher:
+    """Inverted feature -> scheme index over one list of schemes"""
+
+    def __init__(self, schemes):
+        self.schemes = list(schemes)
+        self.lookup, self.max_words = _term_lookup()
+        self.features = {}  # feature -> column
+        self.keywords = set()
+
+        scheme_features = []
+        for scheme in self.schemes:
+            keywords = {k.lower() for k in scheme.get("keywords") or [] if k}
+            self.keywords |= keywords
+            text = f"{scheme.get('scheme_name') or ''} {scheme.get('scheme_details') or ''} {' '.join(keywords)}"
+            scheme_features.append(self._text_features(text) | {f"kw:{k}" for k in keywords})
+        for features in scheme_features:
+            for feature in features:
+                self.features.setdefault(feature, len(self.features))
+
+        # Scheme weights: idf of the feature among the schemes, L2-normalized per scheme
+        count = len(self.schemes)
+        document_frequency = np.zeros(len(self.features))
+        for features in scheme_features:
+            document_frequency[[self.features[f] for f in features]] += 1
+        idf = np.log((1.0 + count) / (1.0 + document_frequency)) + 1e-3
+        rows, columns, weights = [], [], []
+        for scheme, features in enumerate(scheme_features):
+            columns_of_scheme = [self.features[f] for f in features]
+            values = idf[columns_of_scheme]
+            norm = math.sqrt(float(values @ values)) or 1.0
+            rows.extend([scheme] * len(columns_of_scheme))
+            columns.extend(columns_of_scheme)
+            weights.extend(values / norm)
+
+        # Postings as CSR over features: schemes of feature f are indices[indptr[f]:indptr[f + 1]]
+        rows, columns, weights = np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64), np.array(weights)
+        order = np.argsort(columns, kind="stable")
+        self.indices = rows[order]
+        self.data = weights[order]
+        self.indptr = np.zeros(len(self.features) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(self.features)), out=self.indptr[1:])
+        self.scheme_features = scheme_features
+
+    def _text_features(self, text, keywords=None):
+        """Crop/activity features of the 1..max_words word n-grams of text (plus kw: features)"""
+        words = _WORD.findall((text or "").lower())
+        lookup = self.lookup
+        features = set()
+        for n in range(1, self.max_words + 1):
+            grams = words if n == 1 else [" ".join(words[i:i + n]) for i in range(len(words) - n + 1)]
+            features.update(lookup[gram] for gram in grams if gram in lookup)
+        if keywords:
+            features.update(f"kw:{word}" for word in words if word in keywords)
+        return features
+
+    def log_features(self, log):
+        """Features of one FarmLog"""
+        return self._text_features(log_text(log), self.keywords)
+
+    def score(self, logs):
+        """(len(logs) x len(schemes)) scores and each log's features"""
+        log_features = [self.log_features(log) for log in logs]
+        log_rows, columns, weights = [], [], []
+        for row, features in enumerate(log_features):
+            for feature in features:
+                column = self.features.get(feature)
+                if column is not None:
+                    log_rows.append(row)
+                    columns.append(column)
+                    weights.append(FEATURE_WEIGHTS[feature.split(":", 1)[0]])
+
+        scores = np.zeros((len(logs), len(self.schemes)))
+        if not log_rows:
+            return scores, log_features
+        log_rows, columns, weights = np.array(log_rows), np.array(columns), np.array(weights)
+
+        # Expand every (log, feature) pair into that feature's postings in one gather
+        starts, lengths = self.indptr[columns], self.indptr[columns + 1] - self.indptr[columns]
+        total = int(lengths.sum())
+        pair = np.repeat(np.arange(len(columns)), lengths)
+        positions = starts[pair] + np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        flat = log_rows[pair] * len(self.schemes) + self.indices[positions]
+        scores.reshape(-1)[:] = np.bincount(flat, weights=weights[pair] * self.data[positions],
+                                            minlength=scores.size)
+        return scores, log_features
+
+    def recommend(self, logs, top_k=5):
+        """For each log, its best schemes: [{"scheme_name", "score", "matched"}], best first"""
+        logs = _as_list(logs)
+        if not logs or not self.schemes:
+            return [[] for _ in logs]
+        scores, log_features = self.score(logs)
+        k = min(top_k, len(self.schemes))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        top = np.take_along_axis(top, np.argsort(-top_scores, axis=1, kind="stable"), axis=1)
+
+        results = []
+        for row, schemes in enumerate(top):
+            results.append([
+                {
+                    "scheme_name": self.schemes[scheme].get("scheme_name"),
+                    "score": round(float(scores[row, scheme]), 4),
+                    "matched": sorted(log_features[row] & self.scheme_features[scheme])
+                }
+                for scheme in schemes if scores[row, scheme] > 0
+            ])
+        return results
+
+
+def recommend_schemes(schemes, logs, top_k=5):
+    """Ranked schemes for each farm log (one list per log)"""
+    return SchemeMatcher(schemes or []).recommend(logs, top_k=top_k)
+
+
+def benchmark(matcher, logs, rounds=5):
+    """Logs scored per second (best of rounds)"""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        matcher.recommend(logs)
+        best = min(best, time.perf_counter() - started)
+    return len(logs) / best
+
+
+if __name__ == "__main__":
+    combined_json_path = os.path.join(BASE_DIR, "combined_data.json")
+    with open(combined_json_path, "r", encoding="utf-8") as f:
+        combined_data = json.load(f)
+
+    matcher = SchemeMatcher(combined_data.get("scheme") or [])
+    logs = _as_list(combined_data.get("log"))
+    for log, recommendations in zip(logs, matcher.recommend(logs)):
+        print(f"🌾 Log {log.get('date') or '(undated)'}: {len(recommendations)} schemes")
+        for item in recommendations:
+            print(f"   {item['score']:.3f}  {item['scheme_name']}  {', '.join(item['matched'])}")
+    if logs:
+        print(f"⏱️  {benchmark(matcher, logs * 2000):,.0f} logs/sec ({len(matcher.schemes)} schemes)")
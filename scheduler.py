@@ -0,0 +1,360 @@
+"""
+Resident scheduler for the backend refresh
+
+One long-running process instead of a cron of one-shot scripts: the imports,
+the scrapers' HTTP sessions, the weather session, the Playwright browser, the
+BART classifier and the Couchbase connection are set up once and reused by
+every refresh.
+
+Every source in ALL_SOURCES refreshes on its own interval (source config
+'refresh_interval', in seconds), weather hourly and pests daily. A job that
+is still running when its next run comes due is never started twice: all the
+runs it missed are coalesced into one rerun as soon as it finishes. When news,
+schemes or weather changed, combine.py and the Couchbase sync run at most once
+per PUBLISH_INTERVAL.
+
+    python scheduler.py                           # run until SIGINT / SIGTERM
+    python scheduler.py --once                    # run every job once, publish, exit
+    python scheduler.py --jobs weather,publish
+"""
+import argparse
+import functools
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEME_NEWS_DIR = os.path.join(BASE_DIR, "External_data", "scheme_news")
+WEATHER_DIR = os.path.join(BASE_DIR, "External_data", "weather")
+PEST_DIR = os.path.join(BASE_DIR, "External_data", "pest_info")
+for path in (SCHEME_NEWS_DIR, WEATHER_DIR, PEST_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# Seconds between runs; sources without 'refresh_interval' use the first two
+NEWS_INTERVAL = 4 * 3600
+SCHEMES_INTERVAL = 24 * 3600
+WEATHER_INTERVAL = 3600
+PEST_INTERVAL = 24 * 3600
+PUBLISH_INTERVAL = 60
+
+
+class Job:
+    """`func` run every `interval` seconds on `executor` (default: the scheduler's pool)"""
+
+    def __init__(self, name, interval, func, executor=None):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.executor = executor
+        self.next_run = None  # monotonic time; None = due now
+        self.running = False
+        self.pending = False  # came due while running: rerun once when done
+        self.runs = 0
+        self.failures = 0
+        self.coalesced = 0
+        self.last_seconds = None
+
+
+class Scheduler:
+    """Starts due jobs from the calling thread; jobs run on executors"""
+
+    def __init__(self, workers=4):
+        self.jobs = {}
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._stopping = threading.Event()
+
+    def add(self, job):
+        self.jobs[job.name] = job
+        return job
+
+    def tick(self, now=None):
+        """Start the jobs that are due; returns seconds until the next one"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for job in self.jobs.values():
+                if job.next_run is not None and now < job.next_run:
+                    continue
+                # Keep the schedule's phase, but never schedule in the past:
+                # ticks missed while the process was busy are not replayed
+                following = (job.next_run if job.next_run is not None else now) + job.interval
+                job.next_run = following if following > now else now + job.interval
+                if job.running:
+                    job.coalesced += 1
+                    if not job.pending:
+                        job.pending = True
+                        print(f"⏸️  {job.name}: previous run still going, next run coalesced")
+                    continue
+                self._start(job)
+            return max(0.0, min(job.next_run for job in self.jobs.values()) - now) if self.jobs else None
+
+    def _start(self, job):
+        job.running = True
+        (job.executor or self.executor).submit(self._run, job)
+
+    def _run(self, job):
+        started = time.perf_counter()
+        ok = True
+        try:
+            job.func()
+        except Exception:
+            ok = False
+            traceback.print_exc()
+        seconds = time.perf_counter() - started
+        with self._lock:
+            job.runs += 1
+            job.failures += 0 if ok else 1
+            job.last_seconds = seconds
+            print(f"{'✅' if ok else '❌'} {job.name}: {seconds:.1f}s, next in {timedelta(seconds=round(job.interval))}")
+            if job.pending and not self._stopping.is_set():
+                job.pending = False
+                self._start(job)
+            else:
+                job.running = False
+                self._idle.notify_all()
+
+    def wait_idle(self):
+        """Block until no job is running"""
+        with self._lock:
+            self._idle.wait_for(lambda: not any(job.running for job in self.jobs.values()))
+
+    def run_forever(self, max_sleep=60):
+        """Tick until stop() is called, then let the running jobs finish"""
+        while not self._stopping.is_set():
+            delay = self.tick()
+            self._stopping.wait(max_sleep if delay is None else min(delay, max_sleep))
+        self.wait_idle()
+
+    def stop(self):
+        self._stopping.set()
+
+    def shutdown(self):
+        self.stop()
+        self.executor.shutdown(wait=True)
+
+    def status(self):
+        """{job name: counters} for logging"""
+        with self._lock:
+            return {job.name: {"runs": job.runs, "failures": job.failures, "coalesced": job.coalesced,
+                               "last_seconds": round(job.last_seconds, 3) if job.last_seconds is not None else None}
+                    for job in self.jobs.values()}
+
+
+class Refresher:
+    """Warm resources shared by the jobs, and the job functions themselves"""
+
+    def __init__(self):
+        from config.settings import config
+        from utils.file_manager import FileManager
+
+        self.config = config
+        self.file_manager = FileManager()
+        self.scrapers = {}
+        self.latest = self.load_latest()  # kind -> {source name: last non-empty batch}
+        self.weather_session = None
+        # Playwright objects may only be used from the thread that created them
+        self.browser_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser")
+        self._playwright = None
+        self._browser = None
+        self._lock = threading.Lock()
+        self._kind_locks = {"news": threading.Lock(), "schemes": threading.Lock()}
+        self._dirty = threading.Event()
+
+    @staticmethod
+    def load_latest():
+        """Published records of output2/news.ndjson and schemes.ndjson, grouped by source
+
+        Sources not refreshed yet since start-up keep their records when a
+        kind is republished.
+        """
+        from config.sources import ALL_SOURCES
+        from utils.article import iter_ndjson
+        from utils.file_manager import NEWS_RECORDS_FILE, SCHEMES_RECORDS_FILE
+
+        source_names = {source_config["name"]: source_name for source_name, source_config in ALL_SOURCES.items()}
+        latest = {"news": {}, "schemes": {}}
+        for kind, path in (("news", NEWS_RECORDS_FILE), ("schemes", SCHEMES_RECORDS_FILE)):
+            if not os.path.exists(path):
+                continue
+            for article in iter_ndjson(path):
+                source_name = source_names.get(article.source, article.source)
+                latest[kind].setdefault(source_name, []).append(article)
+        return latest
+
+    def refresh_source(self, source_name, source_config):
+        """Scrape one source, republish its kind and rebuild news.json / schemes.json"""
+        from multi_source_scraper import SimpleConsolidatedScraper, is_scheme_source, publish_records
+        from utils.archive import get_archive
+        from utils.keywords import get_keyword_engine
+        from utils.metrics import get_metrics
+        from utils.rate_control import get_rate_controller
+        from utils.search import get_search_index
+
+        with self._lock:
+            scraper = self.scrapers.get(source_name)
+            if scraper is None:
+                scraper = self.scrapers[source_name] = SimpleConsolidatedScraper(source_config)
+        articles = scraper.run()
+
+        kind = "schemes" if is_scheme_source(source_name, source_config) else "news"
+        # The source's full current scrape (repeats within it already dropped by scrape_articles,
+        # before keywords) replaces its last batch; classify_news reuses the scores of stories it
+        # classified before
+        with self._lock:
+            get_keyword_engine().save()
+            get_rate_controller().save()
+            get_metrics().export(self.config.METRICS_FILE, self.config.METRICS_PROM_FILE)
+            if not articles:
+                print(f"⚠️  {source_name}: nothing scraped, keeping its last batch")
+                return
+            if get_archive().append(articles, kind):
+                get_search_index()  # index the new records
+            self.latest[kind][source_name] = articles
+
+        with self._kind_locks[kind]:
+            with self._lock:
+                records = [article for batch in self.latest[kind].values() for article in batch]
+            publish_records(self.file_manager, kind, records)
+            if kind == "news":
+                from news import classify_news
+                classify_news()  # the classifier stays loaded; only new stories are classified
+            else:
+                from scheme import export_schemes
+                export_schemes()
+        self._dirty.set()
+
+    def refresh_weather(self):
+        import requests
+        from alerts import update_alerts
+        from weather import append_history, fetch_weather, save_weather
+
+        if self.weather_session is None:
+            self.weather_session = requests.Session()
+        results = fetch_weather(self.weather_session)
+        path = save_weather(results)
+        append_history(results)
+        alerts = update_alerts()
+        print(f"🌦️  Weather data saved to {path} ({len(alerts)} active alerts)")
+        self._dirty.set()
+
+    def refresh_pests(self):
+        """Runs on browser_executor so the browser stays on its own thread"""
+        from pest import download_images, extract_alert_links, fetch_main_page, scrape_pest_info
+
+        if self._browser is None:
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True)
+        try:
+            links = extract_alert_links(fetch_main_page(self._browser))
+            data = scrape_pest_info(links, self._browser)
+        except Exception:
+            self._close_browser()  # relaunched on the next run
+            raise
+        download_images(data, folder=os.path.join(PEST_DIR, "pest_alert_images"))
+        print(f"🐛 {len(data)} pest alerts refreshed")
+
+    def publish(self):
+        """combine.py + Couchbase sync, only when an output changed since the last publish"""
+        if not self._dirty.is_set():
+            return
+        self._dirty.clear()
+        from combine import combine
+        from database import sync
+        from storage import get_store
+
+        try:
+            changed = sync(combine(), get_store())
+        except Exception:
+            self._dirty.set()  # retry on the next publish
+            raise
+        print(f"📤 Synced to Couchbase ({', '.join(changed) if changed else 'no section changes'})")
+
+    def _close_browser(self):
+        try:
+            if self._browser is not None:
+                self._browser.close()
+            if self._playwright is not None:
+                self._playwright.stop()
+        finally:
+            self._browser = self._playwright = None
+
+    def close(self):
+        self.browser_executor.submit(self._close_browser).result()
+        self.browser_executor.shutdown(wait=True)
+        if self.weather_session is not None:
+            self.weather_session.close()
+        for scraper in self.scrapers.values():
+            scraper.session.close()
+        if "storage" in sys.modules:
+            sys.modules["storage"].close_store()
+        from utils.logger import stop_logging
+        stop_logging()
+
+
+def build_jobs(refresher):
+    from config.sources import ALL_SOURCES
+    from multi_source_scraper import is_scheme_source
+
+    jobs = []
+    for source_name, source_config in ALL_SOURCES.items():
+        default = SCHEMES_INTERVAL if is_scheme_source(source_name, source_config) else NEWS_INTERVAL
+        jobs.append(Job(source_name, source_config.get("refresh_interval", default),
+                        functools.partial(refresher.refresh_source, source_name, source_config)))
+    jobs.append(Job("weather", WEATHER_INTERVAL, refresher.refresh_weather))
+    jobs.append(Job("pests", PEST_INTERVAL, refresher.refresh_pests, executor=refresher.browser_executor))
+    jobs.append(Job("publish", PUBLISH_INTERVAL, refresher.publish))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep the backend data refreshed")
+    parser.add_argument("--jobs", help="comma-separated job names to schedule (default: all)")
+    parser.add_argument("--workers", type=int, default=4, help="jobs run at the same time")
+    parser.add_argument("--once", action="store_true", help="run every job once, publish and exit")
+    args = parser.parse_args()
+
+    # Scraper config paths (output2/, logs/) are relative to scheme_news
+    os.chdir(SCHEME_NEWS_DIR)
+    refresher = Refresher()
+    scheduler = Scheduler(workers=args.workers)
+    jobs = build_jobs(refresher)
+    selected = args.jobs.split(",") if args.jobs else [job.name for job in jobs]
+    unknown = set(selected) - {job.name for job in jobs}
+    if unknown:
+        parser.error(f"unknown job(s): {', '.join(sorted(unknown))}; available: {', '.join(job.name for job in jobs)}")
+    for job in jobs:
+        if job.name in selected:
+            scheduler.add(job)
+
+    print(f"🕒 Scheduler started {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    for job in scheduler.jobs.values():
+        print(f"   {job.name:<30} every {timedelta(seconds=round(job.interval))}")
+
+    signal.signal(signal.SIGINT, lambda *_: scheduler.stop())
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    try:
+        if args.once:
+            scheduler.tick()
+            scheduler.wait_idle()
+            if "publish" in scheduler.jobs:
+                refresher.publish()
+        else:
+            scheduler.run_forever()
+    finally:
+        print("🛑 Stopping: waiting for running jobs")
+        scheduler.shutdown()
+        refresher.close()
+        for name, counters in scheduler.status().items():
+            print(f"   {name:<30} {counters}")
+
+
+if __name__ == "__main__":
+    main()
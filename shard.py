@@ -0,0 +1,187 @@
+"""
+Shard combined_data.json into one document per district plus a small index
+
+Each district shard holds:
+- weather rows for that district
+- news and schemes that mention the district
+- farm logs tagged with that district
+
+News and schemes that name no district, and logs without a district, go
+into a single "statewide" shard so they are stored once instead of being
+copied into all 14 district shards. Clients read their district shard plus
+the statewide shard; the index lists every key with per-section counts.
+"""
+import json
+import os
+import re
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+combined_json_path = os.path.join(BASE_DIR, "combined_data.json")
+shard_output_dir = os.path.join(BASE_DIR, "shards")
+
+# Key layout in Couchbase: <prefix>::index, <prefix>::statewide and <prefix>::district::<slug>
+SHARD_KEY_PREFIX = "combined_json_2025"
+
+KERALA_DISTRICTS = [
+    "Thiruvananthapuram", "Kollam", "Pathanamthitta", "Alappuzha",
+    "Kottayam", "Idukki", "Ernakulam", "Thrissur", "Palakkad",
+    "Malappuram", "Kozhikode", "Wayanad", "Kannur", "Kasaragod"
+]
+
+# Older / English spellings that still show up in news copy
+DISTRICT_ALIASES = {
+    "Thiruvananthapuram": ["trivandrum"],
+    "Kollam": ["quilon"],
+    "Alappuzha": ["alleppey"],
+    "Ernakulam": ["kochi", "cochin"],
+    "Thrissur": ["trichur"],
+    "Palakkad": ["palghat"],
+    "Kozhikode": ["calicut"],
+    "Kannur": ["cannanore"],
+    "Kasaragod": ["kasargod"],
+}
+
+
+def district_slug(district):
+    """Lower-case, underscore separated key fragment for a district"""
+    return re.sub(r"[^a-z0-9]+", "_", district.lower()).strip("_")
+
+
+def shard_key(district):
+    """Document key for a district shard"""
+    return f"{SHARD_KEY_PREFIX}::district::{district_slug(district)}"
+
+
+def statewide_key():
+    """Document key for the statewide shard"""
+    return f"{SHARD_KEY_PREFIX}::statewide"
+
+
+def index_key():
+    """Document key for the shard index"""
+    return f"{SHARD_KEY_PREFIX}::index"
+
+
+def _district_pattern(districts):
+    """One regex that finds any district name or alias in a text"""
+    lookup = {}
+    for district in districts:
+        lookup[district.lower()] = district
+        for alias in DISTRICT_ALIASES.get(district, []):
+            lookup[alias] = district
+
+    names = sorted(lookup, key=len, reverse=True)
+    pattern = re.compile(r"\b(" + "|".join(re.escape(n) for n in names) + r")\b", re.IGNORECASE)
+    return pattern, lookup
+
+
+def _mentioned_districts(text, pattern, lookup):
+    """Districts named in a piece of text"""
+    return {lookup[m.lower()] for m in pattern.findall(text or "")}
+
+
+def _item_text(item, fields):
+    """Join the searchable text fields of a news/scheme item"""
+    return " ".join(str(item.get(field) or "") for field in fields)
+
+
+def _as_list(section):
+    """Normalise a section that may be a single dict, a list or empty"""
+    if not section:
+        return []
+    if isinstance(section, dict):
+        return [section]
+    return list(section)
+
+
+def _index_entry(key, shard):
+    """Key and per-section counts of one shard"""
+    return {
+        "key": key,
+        "news": len(shard["news"]),
+        "scheme": len(shard["scheme"]),
+        "weather": len(shard["weather"]),
+        "log": len(shard["log"])
+    }
+
+
+def build_shards(combined_data, districts=None):
+    """Split a combined document into {key: document}: district shards, a statewide shard and an index"""
+    weather = _as_list(combined_data.get("weather"))
+    logs = _as_list(combined_data.get("log"))
+
+    if districts is None:
+        districts = list(KERALA_DISTRICTS)
+        for row in weather:
+            if row.get("district") and row["district"] not in districts:
+                districts.append(row["district"])
+
+    pattern, lookup = _district_pattern(districts)
+
+    shards = {
+        district: {"district": district, "news": [], "scheme": [], "weather": [], "log": []}
+        for district in districts
+    }
+    statewide = {"district": None, "news": [], "scheme": [], "weather": [], "log": []}
+
+    for row in weather:
+        if row.get("district") in shards:
+            shards[row["district"]]["weather"].append(row)
+
+    for section, fields in (("news", ("title", "content")), ("scheme", ("scheme_name", "scheme_details"))):
+        for item in _as_list(combined_data.get(section)):
+            targets = _mentioned_districts(_item_text(item, fields), pattern, lookup)
+            if not targets:
+                statewide[section].append(item)
+            for district in targets:
+                shards[district][section].append(item)
+
+    for log in logs:
+        district = log.get("district")
+        if district in shards:
+            shards[district]["log"].append(log)
+        else:
+            statewide["log"].append(log)
+
+    generated_at = datetime.now().isoformat()
+    documents = {}
+    index = {"generated_at": generated_at, "districts": {}}
+
+    for district, shard in shards.items():
+        shard["generated_at"] = generated_at
+        key = shard_key(district)
+        documents[key] = shard
+        index["districts"][district] = _index_entry(key, shard)
+
+    statewide["generated_at"] = generated_at
+    documents[statewide_key()] = statewide
+    index["statewide"] = _index_entry(statewide_key(), statewide)
+
+    documents[index_key()] = index
+    return documents
+
+
+def save_shards(documents, output_dir=shard_output_dir):
+    """Write each shard document to <output_dir>/<key>.json"""
+    os.makedirs(output_dir, exist_ok=True)
+    for key, document in documents.items():
+        filename = os.path.join(output_dir, key.replace("::", "__") + ".json")
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=4, ensure_ascii=False)
+    return output_dir
+
+
+if __name__ == "__main__":
+    with open(combined_json_path, "r", encoding="utf-8") as f:
+        combined_data = json.load(f)
+
+    documents = build_shards(combined_data)
+    save_shards(documents)
+
+    print(f"✅ Wrote {len(documents)} shard documents to {shard_output_dir}")
+    for district, entry in documents[index_key()]["districts"].items():
+        print(f"   {district}: {entry['weather']} weather, {entry['news']} news, "
+              f"{entry['scheme']} schemes, {entry['log']} logs")
+    entry = documents[index_key()]["statewide"]
+    print(f"   Statewide: {entry['news']} news, {entry['scheme']} schemes, {entry['log']} logs")
@@ -0,0 +1,426 @@
+"""
+Couchbase storage layer for the combined agriculture data
+
+- One cluster connection per process (get_store), reused by every write
+- upsert instead of insert, so re-running the pipeline overwrites the same keys
+- bulk_upsert writes many documents (per district, per section, ...) concurrently,
+  bulk_remove deletes the ones that are gone
+- Durability and timeouts come from StorageConfig / environment variables
+- update_sections only sends the top-level sections (news, scheme, weather,
+  log) whose content hash changed, as sub-document mutations guarded by CAS
+- InMemoryCollection is a local stand-in with the same calls, for tests and
+  benchmarks that must not touch Capella
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+try:
+    import couchbase.subdocument as SD
+    from couchbase.exceptions import (
+        CasMismatchException, CouchbaseException, DocumentExistsException, DocumentNotFoundException
+    )
+except ImportError:  # SDK not installed: only the in-memory backend is usable
+    SD = None
+
+    class CouchbaseException(Exception):
+        # Same keywords as the SDK exceptions: raise them with message=...
+        def __init__(self, base=None, message=None, **kwargs):
+            super().__init__(message if message is not None else base)
+
+    class CasMismatchException(CouchbaseException):
+        pass
+
+    class DocumentExistsException(CouchbaseException):
+        pass
+
+    class DocumentNotFoundException(CouchbaseException):
+        pass
+
+
+DURABILITY_LEVELS = ("none", "majority", "majority_and_persist_to_active", "persist_to_majority")
+
+# Top-level sections of combined_data.json that are diffed and written independently
+SECTIONS = ("news", "scheme", "weather", "alerts", "log", "recommendations")
+META_PATH = "_meta.section_hashes"
+
+
+def section_hash(value):
+    """Stable content hash of one section"""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def section_hashes(document, sections=SECTIONS):
+    """{section: hash} for the sections present in a document"""
+    return {section: section_hash(document[section]) for section in sections if section in document}
+
+
+def changed_sections(stored_hashes, document, sections=SECTIONS):
+    """Sections whose hash differs from the stored hashes (all of them when nothing is stored)"""
+    new_hashes = section_hashes(document, sections)
+    stored_hashes = stored_hashes or {}
+    return [section for section, digest in new_hashes.items() if stored_hashes.get(section) != digest]
+
+
+def with_section_meta(document, sections=SECTIONS):
+    """Copy of document carrying its section hashes under _meta"""
+    document = dict(document)
+    meta = dict(document.get("_meta") or {})
+    meta["section_hashes"] = section_hashes(document, sections)
+    document["_meta"] = meta
+    return document
+
+
+@dataclass
+class StorageConfig:
+    """Connection, durability and timeout settings"""
+    endpoint: str = field(default_factory=lambda: os.getenv(
+        "COUCHBASE_ENDPOINT", "couchbases://cb.1rsxs0hrd0ojm0pu.cloud.couchbase.com"))
+    username: str = field(default_factory=lambda: os.getenv("COUCHBASE_USERNAME", "SIH-2025"))
+    password: str = field(default_factory=lambda: os.getenv("COUCHBASE_PASSWORD", "Sih-2025"))
+    bucket_name: str = field(default_factory=lambda: os.getenv("COUCHBASE_BUCKET", "travel-sample"))
+    scope_name: str = field(default_factory=lambda: os.getenv("COUCHBASE_SCOPE", "tenant_agent_00"))
+    collection_name: str = field(default_factory=lambda: os.getenv("COUCHBASE_COLLECTION", "bookings"))
+    profile: str = field(default_factory=lambda: os.getenv("COUCHBASE_PROFILE", "wan_development"))
+    connect_timeout: float = field(default_factory=lambda: float(os.getenv("COUCHBASE_CONNECT_TIMEOUT", "10")))
+    kv_timeout: float = field(default_factory=lambda: float(os.getenv("COUCHBASE_KV_TIMEOUT", "5")))
+    durability: str = field(default_factory=lambda: os.getenv("COUCHBASE_DURABILITY", "none"))
+    max_workers: int = field(default_factory=lambda: int(os.getenv("COUCHBASE_MAX_WORKERS", "8")))
+
+    def __post_init__(self):
+        if self.durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level '{self.durability}', expected one of {DURABILITY_LEVELS}")
+
+
+class _MutationResult:
+    """Subset of the SDK MutationResult used here"""
+
+    def __init__(self, cas):
+        self.cas = cas
+
+
+class _ContentAs:
+    """Mimics result.content_as[dict]"""
+
+    def __init__(self, value):
+        self._value = value
+
+    def __getitem__(self, type_):
+        return self._value
+
+
+class _GetResult:
+    """Subset of the SDK GetResult used here"""
+
+    def __init__(self, value, cas):
+        self.cas = cas
+        self.content_as = _ContentAs(value)
+
+
+class _LookupInResult:
+    """Subset of the SDK LookupInResult used here"""
+
+    def __init__(self, values, cas):
+        self.cas = cas
+        self._values = values
+        self.content_as = _ContentAs(lambda index: self._values[index][1])
+
+    def exists(self, index):
+        return self._values[index][0]
+
+
+class _MemorySubdoc:
+    """Spec builders mirroring couchbase.subdocument for InMemoryCollection"""
+
+    @staticmethod
+    def get(path, **kwargs):
+        return ("get", path, None, False)
+
+    @staticmethod
+    def upsert(path, value, create_parents=False, **kwargs):
+        return ("upsert", path, value, create_parents)
+
+    @staticmethod
+    def remove(path, **kwargs):
+        return ("remove", path, None, False)
+
+
+def _walk(document, path, create_parents=False):
+    """Parent dict and final field name of a dotted path"""
+    parts = path.split(".")
+    node = document
+    for part in parts[:-1]:
+        if part not in node:
+            if not create_parents:
+                return None, parts[-1]
+            node[part] = {}
+        node = node[part]
+    return node, parts[-1]
+
+
+class InMemoryCollection:
+    """Thread-safe in-memory stand-in for a Couchbase collection
+
+    Documents are kept as JSON strings, so values are copied the same way a
+    real round-trip would copy them and bytes_written measures the payload.
+    Sub-document specs come from the `subdocument` attribute instead of the SDK.
+    """
+
+    subdocument = _MemorySubdoc
+
+    def __init__(self):
+        self._docs = {}
+        self._lock = threading.Lock()
+        self._next_cas = 1
+        self.bytes_written = 0
+        self.operations = 0
+
+    def _store(self, key, value):
+        payload = json.dumps(value, ensure_ascii=False)
+        cas = self._next_cas
+        self._next_cas += 1
+        self._docs[key] = (payload, cas)
+        self.bytes_written += len(payload.encode("utf-8"))
+        self.operations += 1
+        return _MutationResult(cas)
+
+    def upsert(self, key, value, *options, **kwargs):
+        with self._lock:
+            return self._store(key, value)
+
+    def insert(self, key, value, *options, **kwargs):
+        with self._lock:
+            if key in self._docs:
+                raise DocumentExistsException(message=f"Document '{key}' already exists")
+            return self._store(key, value)
+
+    def get(self, key, *options, **kwargs):
+        with self._lock:
+            if key not in self._docs:
+                raise DocumentNotFoundException(message=f"Document '{key}' not found")
+            payload, cas = self._docs[key]
+        return _GetResult(json.loads(payload), cas)
+
+    def lookup_in(self, key, specs, *options, **kwargs):
+        with self._lock:
+            if key not in self._docs:
+                raise DocumentNotFoundException(message=f"Document '{key}' not found")
+            payload, cas = self._docs[key]
+        document = json.loads(payload)
+        values = []
+        for _, path, _, _ in specs:
+            parent, name = _walk(document, path)
+            found = parent is not None and name in parent
+            values.append((found, parent[name] if found else None))
+        return _LookupInResult(values, cas)
+
+    def mutate_in(self, key, specs, *options, cas=None, **kwargs):
+        with self._lock:
+            if key not in self._docs:
+                raise DocumentNotFoundException(message=f"Document '{key}' not found")
+            payload, current_cas = self._docs[key]
+            if cas is not None and cas != current_cas:
+                raise CasMismatchException(message=f"CAS mismatch for '{key}'")
+            document = json.loads(payload)
+            for op, path, value, create_parents in specs:
+                parent, name = _walk(document, path, create_parents)
+                if parent is None or (op == "remove" and name not in parent):
+                    raise CouchbaseException(message=f"Path '{path}' not found in '{key}'")
+                if op == "remove":
+                    del parent[name]
+                    continue
+                parent[name] = value
+                self.bytes_written += len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+            new_cas = self._next_cas
+            self._next_cas += 1
+            self._docs[key] = (json.dumps(document, ensure_ascii=False), new_cas)
+            self.operations += 1
+            return _MutationResult(new_cas)
+
+    def remove(self, key, *options, **kwargs):
+        with self._lock:
+            if self._docs.pop(key, None) is None:
+                raise DocumentNotFoundException(message=f"Document '{key}' not found")
+            self.operations += 1
+            return _MutationResult(0)
+
+    def keys(self):
+        with self._lock:
+            return list(self._docs)
+
+
+class CouchbaseStore:
+    """Write/read documents through one collection with shared options"""
+
+    def __init__(self, collection, config=None, cluster=None):
+        self.collection = collection
+        self.config = config or StorageConfig()
+        self.cluster = cluster
+
+    def _op_kwargs(self):
+        """Per-operation timeout and durability keyword arguments"""
+        kwargs = {"timeout": timedelta(seconds=self.config.kv_timeout)}
+        if self.config.durability != "none" and self.cluster is not None:
+            from couchbase.durability import DurabilityLevel, ServerDurability
+            level = getattr(DurabilityLevel, self.config.durability.upper())
+            kwargs["durability"] = ServerDurability(level=level)
+        return kwargs
+
+    def upsert(self, key, document):
+        """Create or replace one document, returns its CAS"""
+        return self.collection.upsert(key, document, **self._op_kwargs()).cas
+
+    def insert(self, key, document):
+        """Create one document, raises DocumentExistsException when the key exists; returns its CAS"""
+        return self.collection.insert(key, document, **self._op_kwargs()).cas
+
+    def bulk_upsert(self, documents):
+        """Upsert {key: document} concurrently
+
+        Returns (cas_by_key, errors_by_key); one failing key does not stop
+        the others.
+        """
+        results, errors = {}, {}
+        if not documents:
+            return results, errors
+
+        workers = max(1, min(self.config.max_workers, len(documents)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {key: executor.submit(self.upsert, key, doc) for key, doc in documents.items()}
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except CouchbaseException as e:
+                    errors[key] = e
+        return results, errors
+
+    def remove(self, key):
+        """Delete one document; a key that is already gone is not an error"""
+        try:
+            self.collection.remove(key, **self._op_kwargs())
+        except DocumentNotFoundException:
+            pass
+
+    def bulk_remove(self, keys):
+        """Delete keys concurrently; returns errors_by_key"""
+        errors = {}
+        keys = list(keys)
+        if not keys:
+            return errors
+
+        workers = max(1, min(self.config.max_workers, len(keys)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {key: executor.submit(self.remove, key) for key in keys}
+            for key, future in futures.items():
+                try:
+                    future.result()
+                except CouchbaseException as e:
+                    errors[key] = e
+        return errors
+
+    def _subdoc(self):
+        """Spec builders: the collection's own (in-memory) or the SDK's"""
+        return getattr(self.collection, "subdocument", None) or SD
+
+    def update_sections(self, key, document, sections=SECTIONS, max_retries=5):
+        """Write only the sections of document that changed since the last write
+
+        Reads the stored section hashes with a sub-document lookup, then
+        upserts the changed sections, removes the stored sections document
+        no longer has and writes the new hashes in one mutate_in guarded by
+        the CAS from that lookup. A concurrent writer makes the CAS check
+        fail and the whole read/diff/write is retried. A missing document is
+        inserted in full; when another writer created it first, the update
+        is retried against that document. Returns the sections written or
+        removed.
+        """
+        sd = self._subdoc()
+        for _ in range(max_retries):
+            try:
+                lookup = self.collection.lookup_in(
+                    key, [sd.get(META_PATH)], timeout=timedelta(seconds=self.config.kv_timeout))
+            except DocumentNotFoundException:
+                try:
+                    self.insert(key, with_section_meta(document, sections))
+                except DocumentExistsException:
+                    continue
+                return [section for section in sections if section in document]
+
+            stored_hashes = lookup.content_as[dict](0) if lookup.exists(0) else {}
+            changed = changed_sections(stored_hashes, document, sections)
+            removed = [section for section in sections if section in stored_hashes and section not in document]
+            if not changed and not removed:
+                return []
+
+            specs = [sd.upsert(section, document[section]) for section in changed]
+            specs.extend(sd.remove(section) for section in removed)
+            specs.append(sd.upsert(META_PATH, section_hashes(document, sections), create_parents=True))
+            try:
+                self.collection.mutate_in(key, specs, cas=lookup.cas, **self._op_kwargs())
+                return changed + removed
+            except (CasMismatchException, DocumentNotFoundException):
+                continue
+
+        raise CasMismatchException(message=f"Gave up updating '{key}' after {max_retries} CAS conflicts")
+
+    def get(self, key, default=None):
+        """Fetch one document, or default when the key does not exist"""
+        try:
+            return self.collection.get(key, timeout=timedelta(seconds=self.config.kv_timeout)).content_as[dict]
+        except DocumentNotFoundException:
+            return default
+
+    def close(self):
+        """Close the underlying cluster connection (no-op for in-memory)"""
+        if self.cluster is not None:
+            self.cluster.close()
+            self.cluster = None
+
+
+def connect(config=None):
+    """Open a new cluster connection and return a store for the configured collection"""
+    from couchbase.auth import PasswordAuthenticator
+    from couchbase.cluster import Cluster
+    from couchbase.options import ClusterOptions
+
+    config = config or StorageConfig()
+    options = ClusterOptions(PasswordAuthenticator(config.username, config.password))
+    if config.profile:
+        options.apply_profile(config.profile)
+
+    cluster = Cluster(config.endpoint, options)
+    cluster.wait_until_ready(timedelta(seconds=config.connect_timeout))
+    collection = cluster.bucket(config.bucket_name).scope(config.scope_name).collection(config.collection_name)
+    return CouchbaseStore(collection, config, cluster)
+
+
+def memory_store(config=None):
+    """Store backed by a fresh InMemoryCollection"""
+    return CouchbaseStore(InMemoryCollection(), config)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store(config=None):
+    """Process-wide store; the cluster is connected on first use and then reused"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = connect(config)
+        return _store
+
+
+def close_store():
+    """Close the process-wide store"""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None